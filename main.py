@@ -1,28 +1,13 @@
-from skyjosimulator.game import SkyjoGame
-from skyjosimulator.strategy import create_strategy
+from skyjosimulator.simulation.runner import run_simulation
 
 ROUND_COUNT = 10000
 
-player_stat = {
-    'player1': 0,
-    'player2': 0,
-    'player3': 0,
-}
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+    ('player3', 'local'),
+]
 
-for game_round in range(ROUND_COUNT):
-    game = SkyjoGame([
-        create_strategy('player1', 'local'),
-        create_strategy('player2', 'random'),
-        create_strategy('player3', 'local'),
-    ])
-
-    game.prepare_game()
-    result = game.start()
-
-    for player in result:
-        player_stat[player] += result[player]
-
-for player in player_stat:
-    player_stat[player] /= ROUND_COUNT
-
-print(player_stat)
+if __name__ == '__main__':
+    result = run_simulation(PLAYER_CONFIGS, ROUND_COUNT)
+    print(result.average_scores())
@@ -1,5 +1,9 @@
 from enum import Enum
 
+# must be increased with every change of the rules, the engine or a built-in strategy that changes the results of
+# seeded games, so cached results of earlier versions are not reused (see simulation.result_cache)
+RULES_VERSION = 2
+
 CARD_FREQUENCIES = {
     -2: 5,
     -1: 15,
@@ -0,0 +1,5 @@
+import sys
+
+from skyjosimulator.cli import main
+
+sys.exit(main())
@@ -0,0 +1 @@
+from skyjosimulator.benchmark.suite import BENCHMARKS, compare_with_baseline, run_benchmarks
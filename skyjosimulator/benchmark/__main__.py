@@ -0,0 +1,53 @@
+import argparse
+import json
+import sys
+
+from skyjosimulator.benchmark.suite import BENCHMARKS, DEFAULT_MIN_TIME, DEFAULT_THRESHOLD, compare_with_baseline, \
+    run_benchmarks
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(prog='python -m skyjosimulator.benchmark',
+                                     description='Benchmarks the engine and strategy hot paths.')
+    parser.add_argument('-k', '--filter', default=None, help='only run benchmarks whose name contains this')
+    parser.add_argument('-o', '--output', default=None, help='json file to write the results to')
+    parser.add_argument('-b', '--baseline', default=None, help='json file of a previous run to compare with')
+    parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative slowdown that is flagged as regression (default: 0.1)')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                        help='minimum number of seconds per repetition')
+    return parser
+
+
+def main(argv=None):
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    names = [name for name in BENCHMARKS if args.filter is None or args.filter in name]
+    if not names:
+        parser.error('no benchmark name contains {}'.format(args.filter))
+
+    report = run_benchmarks(names, min_time=args.min_time)
+
+    for name, result in report['results'].items():
+        print('{:<50} {:>14.3f} us {:>14.1f} /s'.format(name, result['seconds_per_call'] * 1e6,
+                                                        result['calls_per_second']))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_with_baseline(report, json.load(baseline_file), args.threshold)
+
+        for name, baseline_time, current_time, change in regressions:
+            print('REGRESSION {}: {:.3f} us -> {:.3f} us (+{:.1%})'.format(name, baseline_time * 1e6,
+                                                                           current_time * 1e6, change))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
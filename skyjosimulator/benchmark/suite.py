@@ -0,0 +1,242 @@
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.game.interleaved import InterleavedGames
+from skyjosimulator.game.logic import SkyjoGame, SkyjoGameMove
+from skyjosimulator.game.model import MoveRecord
+from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.mcts import MonteCarloTreeSearchStrategy
+from skyjosimulator.strategy.strategies import calculate_expected_card_value
+
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.1
+
+MIDGAME_TURNS = 12
+MCTS_BENCHMARK_ROLLOUTS = 50
+INTERLEAVED_BENCHMARK_GAMES = 64
+STARTUP_BENCHMARK_COMMAND = ('simulate', 'local', 'random', '-n', '1', '-w', '1')
+
+
+def create_game(strategy_keys, seed=0):
+    game = SkyjoGame([create_strategy('player{}'.format(index + 1), strategy_key)
+                      for index, strategy_key in enumerate(strategy_keys)])
+    game.reset(seed=seed)
+    return game
+
+
+def create_midgame(strategy_keys=('local', 'random', 'local'), seed=0):
+    """
+    Creates a game in which every player has made a few moves, so grids and discard stack look like in a real game.
+    """
+    game = create_game(strategy_keys, seed)
+    game.flip_starting_cards()
+    game.state.initialize_discard_stack()
+    game.set_next_player_as_current()
+
+    for _ in range(MIDGAME_TURNS):
+        game.execute_current_players_move()
+        game.state.remove_columns_with_identical_cards(game.current_player.name)
+        game.set_next_player_as_current()
+
+    return game
+
+
+def benchmark_apply_move():
+    """
+    Applies a move and reverts it, so every call measures the same midgame state.
+    """
+    state = create_midgame().state
+    move = SkyjoGameMove(0, 0, True)
+
+    def run():
+        record = MoveRecord()
+        state.apply_move('player1', DRAW_LOCATION.DRAW_STACK, move, record)
+        state.undo_move(record)
+
+    return run
+
+
+def benchmark_calculate_scores():
+    return create_midgame().state.calculate_scores
+
+
+def benchmark_remove_columns_with_identical_cards():
+    state = create_midgame().state
+    return lambda: state.remove_columns_with_identical_cards('player1')
+
+
+def benchmark_expected_card_value():
+    return create_midgame().state.card_statistic.calculate_expected_card_value
+
+
+def benchmark_expected_card_value_from_scratch():
+    state = create_midgame().state
+    return lambda: calculate_expected_card_value(state.player_grids, state.discard_stack)
+
+
+def create_decision_benchmark(strategy_key, decision):
+    def benchmark():
+        game = create_midgame((strategy_key, strategy_key, strategy_key))
+        strategy = game.current_player
+        observation = game.create_observation()
+
+        if decision == 'draw':
+            return lambda: strategy.decide_draw_location(observation)
+        return lambda: strategy.get_target_location(observation, 5)
+
+    return benchmark
+
+
+def create_mcts_decision_benchmark(decision):
+    """
+    Measures a single decision of MonteCarloTreeSearchStrategy with MCTS_BENCHMARK_ROLLOUTS rollouts, so calls per
+    second are decisions per second.
+    """
+    def benchmark():
+        game = create_midgame()
+        strategy = MonteCarloTreeSearchStrategy(game.current_player.name, rollouts=MCTS_BENCHMARK_ROLLOUTS)
+        observation = game.create_observation()
+
+        if decision == 'draw':
+            return lambda: strategy.decide_draw_location(observation)
+        return lambda: strategy.get_target_location(observation, 5)
+
+    return benchmark
+
+
+def create_game_benchmark(strategy_keys):
+    def benchmark():
+        game = create_game(strategy_keys)
+        seeds = iter(range(1, 2 ** 31))
+
+        def run():
+            game.reset(seed=next(seeds))
+            game.start()
+
+        return run
+
+    return benchmark
+
+
+def create_interleaved_game_benchmark(strategy_keys):
+    """
+    One call plays INTERLEAVED_BENCHMARK_GAMES games side by side through the batch methods of the strategies.
+    """
+    def benchmark():
+        strategies = [create_strategy('player{}'.format(index + 1), strategy_key)
+                      for index, strategy_key in enumerate(strategy_keys)]
+        games = InterleavedGames(strategies, INTERLEAVED_BENCHMARK_GAMES)
+        seeds = iter(range(1, 2 ** 31))
+
+        def run():
+            games.play(next(seeds) for _ in range(INTERLEAVED_BENCHMARK_GAMES))
+
+        return run
+
+    return benchmark
+
+
+def benchmark_time_to_first_game():
+    """
+    One call starts a new interpreter that plays a single game through the command line interface, which is dominated
+    by the imports.
+    """
+    command = [sys.executable, '-m', 'skyjosimulator'] + list(STARTUP_BENCHMARK_COMMAND)
+
+    def run():
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+    return run
+
+
+BENCHMARKS = {
+    'micro.apply_move': benchmark_apply_move,
+    'micro.calculate_scores': benchmark_calculate_scores,
+    'micro.remove_columns_with_identical_cards': benchmark_remove_columns_with_identical_cards,
+    'micro.expected_card_value': benchmark_expected_card_value,
+    'micro.expected_card_value_from_scratch': benchmark_expected_card_value_from_scratch,
+    'micro.random.decide_draw_location': create_decision_benchmark('random', 'draw'),
+    'micro.random.get_target_location': create_decision_benchmark('random', 'target'),
+    'micro.local.decide_draw_location': create_decision_benchmark('local', 'draw'),
+    'micro.local.get_target_location': create_decision_benchmark('local', 'target'),
+    'micro.mcts.decide_draw_location': create_mcts_decision_benchmark('draw'),
+    'micro.mcts.get_target_location': create_mcts_decision_benchmark('target'),
+    'macro.games.local-local': create_game_benchmark(('local', 'local')),
+    'macro.games.local-random': create_game_benchmark(('local', 'random')),
+    'macro.games.random-random': create_game_benchmark(('random', 'random')),
+    'macro.games.local-random-local': create_game_benchmark(('local', 'random', 'local')),
+    'macro.games.local-local-local-local': create_game_benchmark(('local', 'local', 'local', 'local')),
+    'macro.games.random-random-random-random': create_game_benchmark(('random', 'random', 'random', 'random')),
+    'macro.interleaved_games.local-local': create_interleaved_game_benchmark(('local', 'local')),
+    'startup.time_to_first_game': benchmark_time_to_first_game,
+}
+
+
+def measure(function, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Measures the best time of a single call of function over a number of repetitions.
+
+    Every repetition runs the function as often as needed to take at least min_time seconds.
+
+    :return: seconds per call
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(names=None, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Runs the given benchmarks (all by default).
+
+    :return: json serializable dict with the environment and the time of every benchmark
+    """
+    results = dict()
+
+    for name in BENCHMARKS if names is None else names:
+        random.seed(0)
+        seconds_per_call = measure(BENCHMARKS[name](), min_time, repeat)
+        results[name] = {
+            'seconds_per_call': seconds_per_call,
+            'calls_per_second': 1.0 / seconds_per_call,
+        }
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+
+def compare_with_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the benchmark results with a stored baseline report.
+
+    :param threshold: relative slowdown (0.1 = 10% slower) at which a benchmark is flagged as regression
+    :return: list of (name, baseline seconds per call, current seconds per call, relative change) of the regressed
+             benchmarks
+    """
+    regressions = []
+
+    for name, result in report['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            continue
+
+        change = result['seconds_per_call'] / baseline_result['seconds_per_call'] - 1
+        if change > threshold:
+            regressions.append((name, baseline_result['seconds_per_call'], result['seconds_per_call'], change))
+
+    return regressions
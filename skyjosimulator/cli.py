@@ -0,0 +1,330 @@
+import argparse
+import sys
+
+from skyjosimulator.strategy import EXTERNAL_STRATEGY_PREFIX, STRATEGIES
+
+# every command imports the modules it needs when it is run, so starting a short simulation only imports the game,
+# the strategies it plays and the runner (see the startup benchmarks)
+COMMANDS = ('simulate', 'tournament', 'sweep', 'duplicate', 'benchmark', 'worker', 'strategies', 'replay', 'export')
+
+
+def strategy_key(value):
+    if value.startswith(EXTERNAL_STRATEGY_PREFIX) or value in STRATEGIES:
+        return value
+    raise argparse.ArgumentTypeError('invalid strategy: {} (choose from {} or {}COMMAND)'.format(
+        value, ', '.join(sorted(STRATEGIES)), EXTERNAL_STRATEGY_PREFIX))
+
+
+def parameter_values(value):
+    """
+    Parses 'name=value1,value2,...' into (name, values), the values are ints or floats.
+    """
+    name, separator, values = value.partition('=')
+    if not separator or not values:
+        raise argparse.ArgumentTypeError('expected NAME=VALUE,...: {}'.format(value))
+    try:
+        return name, [int(number) if number.lstrip('-').isdigit() else float(number) for number in values.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid number in {}'.format(value))
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('expected a number of at least 1: {}'.format(value))
+    return number
+
+
+def add_common_arguments(parser, games_help):
+    parser.add_argument('-n', '--games', type=positive_int, default=10000, help=games_help)
+    parser.add_argument('-s', '--seed', type=int, default=0, help='master seed of the simulation')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: number of cpus)')
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(prog='skyjo-sim', description='Simulates skyjo games between strategies.')
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    strategies_help = ('strategy of each player in seat order (see the strategies command, or {}COMMAND for a bot '
+                       'program that speaks the ExternalBot protocol)'.format(EXTERNAL_STRATEGY_PREFIX))
+
+    simulate = subparsers.add_parser('simulate', help='play games between strategies (the default command)')
+    simulate.add_argument('strategies', nargs='+', type=strategy_key, help=strategies_help)
+    add_common_arguments(simulate, 'number of games to play')
+    simulate.add_argument('-e', '--engine', choices=['object', 'batch'], default='object',
+                          help='engine to play the games with (batch requires numpy)')
+    simulate.add_argument('-c', '--checkpoint', default=None,
+                          help='json file to save finished shards to and to resume an interrupted run from')
+    simulate.add_argument('--shard-size', type=int, default=None,
+                          help='number of games per checkpointed or distributed shard (default: 1000)')
+    simulate.add_argument('--result-cache', action='store_true',
+                          help='reuse the shards earlier runs played with the same players, seeds and rules from the '
+                               'result cache in SKYJO_CACHE_DIR (default: ~/.cache/skyjosimulator) and add the new ones')
+    simulate.add_argument('--result-cache-size', type=float, default=256,
+                          help='maximum size of the result cache in megabytes, the least recently used shards are '
+                               'removed beyond it')
+    simulate.add_argument('--coordinator', metavar='HOST:PORT', default=None,
+                          help='hand out the shards to workers connecting to this address instead of playing them '
+                               '(start the workers with the worker command, both sides read the shared key from '
+                               'SKYJO_AUTHKEY)')
+    simulate.add_argument('--concurrent-games', type=int, default=None,
+                          help='play this many games side by side in this process, so the strategies get the '
+                               'decisions of all of them in one call')
+    simulate.add_argument('--stop-early', choices=['score', 'win_rate'], default=None,
+                          help='play batches only until player1 and player2 are separated in this metric '
+                               '(--games is the maximum budget)')
+    simulate.add_argument('--alpha', type=float, default=0.05, help='significance level for --stop-early')
+    simulate.add_argument('--precision', type=float, default=None,
+                          help='stop once the confidence interval half width is at most this (for --stop-early)')
+    simulate.add_argument('--batch-size', type=int, default=1000, help='games per batch for --stop-early')
+    simulate.add_argument('--profile', action='store_true',
+                          help='report the time spent per player and phase of the games')
+    simulate.add_argument('--cache-size', type=int, default=None,
+                          help='cache up to this many decisions of deterministic strategies per worker and strategy')
+    simulate.add_argument('--cross-check', action='store_true',
+                          help='compare the score distributions of the batch engine with the object engine')
+    simulate.add_argument('--record', metavar='LOG', default=None,
+                          help='play in this process and append every decision of the games to this trajectory log '
+                               '(see the replay command)')
+
+    tournament = subparsers.add_parser('tournament',
+                                       help='round-robin tournament of strategies at every table size and seating')
+    tournament.add_argument('strategies', nargs='*', type=strategy_key,
+                            help='strategies to play (default: all strategies that need no user input, except '
+                                 'expensive search strategies like mcts)')
+    add_common_arguments(tournament, 'number of games per seating')
+    tournament.add_argument('-t', '--table-sizes', type=int, nargs='+', default=None, metavar='TABLE_SIZE',
+                            help='numbers of players per table (default: 2 3 4)')
+
+    sweep = subparsers.add_parser('sweep', help='evaluate parameter values of a strategy on the same games')
+    sweep.add_argument('strategy', type=strategy_key, help='strategy to tune, it plays in the first seat')
+    sweep.add_argument('opponents', nargs='+', type=strategy_key, help='strategies of the other seats')
+    sweep.add_argument('-p', '--parameter', type=parameter_values, action='append', required=True,
+                       metavar='NAME=VALUE,...', help='values of a parameter, every combination is evaluated')
+    add_common_arguments(sweep, 'number of games per candidate')
+    sweep.add_argument('--alpha', type=float, default=0.05, help='significance level of the confidence intervals')
+    sweep.add_argument('--top', type=int, default=20, help='number of the best candidates to report')
+
+    duplicate = subparsers.add_parser('duplicate',
+                                      help='play every deck in every rotation of the seats and compare per deal')
+    duplicate.add_argument('strategies', nargs='+', type=strategy_key, help=strategies_help)
+    add_common_arguments(duplicate, 'number of deals')
+    duplicate.add_argument('--alpha', type=float, default=0.05, help='significance level of the confidence intervals')
+
+    # the benchmark arguments are parsed by python -m skyjosimulator.benchmark
+    subparsers.add_parser('benchmark', add_help=False,
+                          help='benchmark the engine and strategy hot paths (see python -m skyjosimulator.benchmark -h)')
+
+    worker = subparsers.add_parser('worker', help='play the shards of a simulate --coordinator on this host')
+    worker.add_argument('address', help='HOST:PORT of the coordinator')
+    worker.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: number of cpus)')
+    worker.add_argument('--connect-timeout', type=float, default=30.0,
+                        help='seconds to keep retrying to connect to the coordinator')
+
+    subparsers.add_parser('strategies', help='list the registered strategies and their parameters')
+
+    export = subparsers.add_parser('export', help='write the samples of all decisions of games to .npz shards for '
+                                                  'training (requires numpy)')
+    export.add_argument('strategies', nargs='+', type=strategy_key, help=strategies_help)
+    add_common_arguments(export, 'number of games to play')
+    export.add_argument('-o', '--output', required=True, help='directory of the shards and their manifest.json')
+    export.add_argument('--shard-size', type=int, default=None, help='number of samples per shard (default: 65536)')
+
+    replay = subparsers.add_parser('replay', help='replay a game of a trajectory log move by move (requires numpy)')
+    replay.add_argument('log', help='trajectory log written by simulate --record')
+    replay.add_argument('game', type=int, nargs='?', default=0, help='index of the game in the log')
+    return parser
+
+
+def simulate(args):
+    from skyjosimulator.simulation.runner import create_player_configs
+
+    player_configs = create_player_configs(args.strategies)
+
+    if args.engine == 'batch' or args.cross_check:
+        # numpy is only imported if one of the vectorized modes is requested
+        from skyjosimulator.simulation.batch import aggregate_batch_simulation, cross_check
+
+        if args.cross_check:
+            for player, comparison in cross_check(args.strategies, args.games, args.seed).items():
+                print(player, comparison)
+            return
+
+        result = aggregate_batch_simulation(args.strategies, args.games, seed=args.seed)
+    elif args.stop_early:
+        from skyjosimulator.simulation.early_stopping import compare_until_separated
+
+        comparison = compare_until_separated(player_configs, 'player1', 'player2', metric=args.stop_early,
+                                             alpha=args.alpha, precision=args.precision,
+                                             batch_size=args.batch_size, max_games=args.games,
+                                             master_seed=args.seed, workers=args.workers)
+        print('games played:', comparison.game_count, 'stop reason:', comparison.stop_reason)
+        print('difference player1 - player2:', comparison.difference,
+              'confidence interval:', comparison.confidence_interval)
+        result = comparison.aggregate
+    elif args.record:
+        from skyjosimulator.game.trajectory import TrajectoryRecorder
+        from skyjosimulator.simulation.runner import play_games
+
+        with TrajectoryRecorder(args.record) as recorder:
+            result = play_games(player_configs, 0, args.games, args.seed, recorder=recorder)
+    elif args.concurrent_games:
+        from skyjosimulator.simulation.runner import play_interleaved_games
+
+        result = play_interleaved_games(player_configs, 0, args.games, args.seed, args.concurrent_games)
+    elif args.coordinator or args.checkpoint or args.result_cache:
+        from skyjosimulator.simulation.checkpoint import DEFAULT_SHARD_SIZE, run_sharded_simulation
+
+        shard_size = args.shard_size or DEFAULT_SHARD_SIZE
+        if args.coordinator:
+            from skyjosimulator.simulation.distributed import Coordinator, parse_address
+
+            coordinator = Coordinator(player_configs, args.games, master_seed=args.seed, shard_size=shard_size,
+                                      address=parse_address(args.coordinator), checkpoint_path=args.checkpoint)
+            result = coordinator.run()
+        else:
+            from skyjosimulator.simulation.result_cache import ResultCache
+
+            result_cache = ResultCache(max_size=int(args.result_cache_size * 2 ** 20)) if args.result_cache else None
+            result = run_sharded_simulation(player_configs, args.games, master_seed=args.seed, shard_size=shard_size,
+                                            checkpoint_path=args.checkpoint, workers=args.workers,
+                                            result_cache=result_cache)
+            if result_cache is not None:
+                print(result_cache.create_report())
+    else:
+        from skyjosimulator.game.profiling import GameProfiler
+        from skyjosimulator.simulation.runner import run_simulation
+        from skyjosimulator.strategy.cache import CacheStatistics
+
+        profiler = GameProfiler() if args.profile else None
+        cache_statistics = CacheStatistics() if args.cache_size is not None else None
+        result = run_simulation(player_configs, args.games, master_seed=args.seed, workers=args.workers,
+                                profiler=profiler, cache_size=args.cache_size, cache_statistics=cache_statistics)
+        if profiler is not None:
+            print(profiler.create_report())
+        if cache_statistics is not None:
+            print(cache_statistics.create_report())
+
+    print(result.average_scores())
+    for player, summary in result.summarize().items():
+        print(player, summary)
+
+
+def tournament(args):
+    from skyjosimulator.simulation.tournament import DEFAULT_TABLE_SIZES, run_tournament
+
+    result = run_tournament(sorted(set(args.strategies)), table_sizes=args.table_sizes or DEFAULT_TABLE_SIZES,
+                            games_per_table=args.games, master_seed=args.seed, workers=args.workers)
+    print(result.create_report())
+
+
+def sweep(args):
+    from skyjosimulator.simulation.sweep import run_sweep
+
+    result = run_sweep(args.strategy, dict(args.parameter), args.opponents, games_per_candidate=args.games,
+                       master_seed=args.seed, workers=args.workers, alpha=args.alpha)
+    print(result.create_report(args.top))
+
+
+def duplicate(args):
+    from skyjosimulator.simulation.duplicate import run_duplicate_simulation
+    from skyjosimulator.simulation.runner import create_player_configs
+
+    result = run_duplicate_simulation(create_player_configs(args.strategies), args.games, master_seed=args.seed,
+                                      workers=args.workers)
+    print(result.create_report(args.alpha))
+
+
+def worker(args):
+    import os
+
+    from skyjosimulator.simulation.distributed import parse_address, start_workers
+
+    processes = start_workers(parse_address(args.address), args.workers or os.cpu_count(),
+                              connect_timeout=args.connect_timeout)
+    for process in processes:
+        process.join()
+
+
+def list_strategies(args):
+    for key in sorted(STRATEGIES):
+        print('{:<10} {}'.format(key, ', '.join(STRATEGIES[key].parameters)))
+
+
+def replay(args):
+    from skyjosimulator import DRAW_LOCATION
+    from skyjosimulator.game.trajectory import GameReplay, TrajectoryLog
+
+    log = TrajectoryLog(args.log)
+    game_replay = GameReplay(log.get_game(args.game))
+    print('game {} of {}, seed {}'.format(args.game, log.game_count, log.seeds[args.game]))
+
+    for move, game in game_replay.steps():
+        if move is not None:
+            draw_location = 'draw stack' if game_replay.strategies[move['seat']].draw_location == \
+                DRAW_LOCATION.DRAW_STACK else 'discard stack'
+            action = 'replaces' if move['flag'] else 'discards it and reveals'
+            print('turn {}: {} draws {} from the {}, {} ({}, {})'.format(
+                move['value'], game_replay.strategies[move['seat']].name, move['card'], draw_location, action,
+                move['column'], move['row']))
+        for player, grid in game.state.player_grids.items():
+            print('  {}: {}'.format(player, grid.to_list()))
+
+    print(game_replay.scores)
+
+
+def export(args):
+    from skyjosimulator.simulation.export import DEFAULT_SHARD_SIZE, export_samples
+    from skyjosimulator.simulation.runner import create_player_configs
+
+    manifest = export_samples(create_player_configs(args.strategies), args.games, args.output, master_seed=args.seed,
+                              shard_size=args.shard_size or DEFAULT_SHARD_SIZE, workers=args.workers)
+    print('{} samples of {} games in {} shards'.format(manifest['sample_count'], manifest['game_count'],
+                                                       len(manifest['shards'])))
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # without a command the arguments are the ones of simulate, like before there were commands
+    if argv and argv[0] not in COMMANDS and not argv[0].startswith('-'):
+        argv.insert(0, 'simulate')
+
+    parser = create_parser()
+    args, extra_arguments = parser.parse_known_args(argv)
+
+    if args.command == 'benchmark':
+        from skyjosimulator.benchmark.__main__ import main as run_benchmark_command
+        return run_benchmark_command(extra_arguments)
+
+    if extra_arguments:
+        parser.error('unrecognized arguments: {}'.format(' '.join(extra_arguments)))
+    if args.command is None:
+        parser.print_help()
+        return 2
+    if args.command == 'simulate' and args.record:
+        from skyjosimulator.game.trajectory import TrajectoryError, check_seed
+        from skyjosimulator.simulation.runner import derive_game_seed
+
+        # checked before the log is opened, so a run that cannot be recorded leaves no partial log
+        try:
+            check_seed(derive_game_seed(args.seed, 0))
+            check_seed(derive_game_seed(args.seed, args.games - 1))
+        except TrajectoryError as error:
+            parser.error('--seed {} cannot be recorded: {}'.format(args.seed, error))
+
+    commands = {
+        'simulate': simulate,
+        'tournament': tournament,
+        'sweep': sweep,
+        'duplicate': duplicate,
+        'worker': worker,
+        'strategies': list_strategies,
+        'replay': replay,
+        'export': export,
+    }
+    return commands[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from skyjosimulator.game.model import CardColumn, Card, CardGrid
+from skyjosimulator.game.model import CardColumn, Card, CardGrid, CompactCardGrid
 
 
 class CardGridFactory:
@@ -15,3 +15,20 @@ class CardGridFactory:
         column4 = CardColumn([Card(value) for value in values_column4])
 
         return CardGrid([column1, column2, column3, column4])
+
+    @staticmethod
+    def reset_grid(grid, values, first_card):
+        return CardGridFactory.create_grid(values[first_card:first_card + 12])
+
+
+class CompactCardGridFactory:
+    @staticmethod
+    def create_grid(values):
+        return CompactCardGrid(values)
+
+    @staticmethod
+    def reset_grid(grid, values, first_card):
+        if grid is None:
+            return CompactCardGrid(values[first_card:first_card + 12])
+        grid.reset(values, first_card)
+        return grid
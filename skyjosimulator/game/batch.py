@@ -0,0 +1,222 @@
+import numpy as np
+
+from skyjosimulator import CARD_FREQUENCIES
+
+CARD_VALUES = np.array(sorted(CARD_FREQUENCIES), dtype=np.int64)
+CARD_VALUE_OFFSET = -int(CARD_VALUES[0])
+DECK = np.repeat(CARD_VALUES, [CARD_FREQUENCIES[value] for value in sorted(CARD_FREQUENCIES)]).astype(np.int8)
+DECK_SIZE = len(DECK)
+DECK_VALUE_SUM = int(DECK.sum(dtype=np.int64))
+
+COLUMN_COUNT = 4
+ROW_COUNT = 3
+GRID_SIZE = COLUMN_COUNT * ROW_COUNT
+
+
+def count_card_values(values, mask):
+    """
+    Counts the card values of every row of a 2d array, only considering the cards where mask is set.
+
+    :return: array of shape (rows, number of distinct card values)
+    """
+    row_count = values.shape[0]
+    value_count = len(CARD_VALUES)
+    flat_indices = np.arange(row_count)[:, None] * value_count + values.astype(np.int64) + CARD_VALUE_OFFSET
+    counts = np.bincount(flat_indices[mask], minlength=row_count * value_count)
+    return counts.reshape(row_count, value_count)
+
+
+class BatchSkyjoGame:
+    def __init__(self, player_strategies, game_count, rng=None):
+        """
+        Plays a whole batch of skyjo games in lockstep.
+
+        The state of all games is kept in arrays with a leading game dimension and every rule of SkyjoGame and
+        SkyjoGameState is applied to all games at once. Grids are stored column-major like CompactCardGrid, a card
+        is addressed by its cell index column * 3 + row. Removed columns stay in the arrays and are masked out.
+
+        :param player_strategies: one BatchStrategy per seat
+        :param game_count: number of games in the batch
+        :param rng: numpy random generator used for shuffling and by the strategies
+        """
+        self.player_strategies = player_strategies
+        self.player_count = len(player_strategies)
+        self.game_count = game_count
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        shape = (game_count, self.player_count, GRID_SIZE)
+        self.values = np.zeros(shape, dtype=np.int8)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.removed = np.zeros(shape, dtype=bool)
+
+        self.draw_stack = np.zeros((game_count, DECK_SIZE), dtype=np.int8)
+        self.draw_size = np.zeros(game_count, dtype=np.int64)
+        self.discard_stack = np.zeros((game_count, DECK_SIZE), dtype=np.int8)
+        self.discard_size = np.zeros(game_count, dtype=np.int64)
+        self.seen_card_counts = np.zeros((game_count, len(CARD_VALUES)), dtype=np.int64)
+
+        self.current_player = np.zeros(game_count, dtype=np.int64)
+        self.finishing_player = np.full(game_count, -1, dtype=np.int64)
+        self.remaining_turns = np.zeros(game_count, dtype=np.int64)
+        self.active = np.ones(game_count, dtype=bool)
+        self.doubled_player = np.full(game_count, -1, dtype=np.int64)
+        self.step_count = 0
+
+    def prepare_game(self):
+        order = np.argsort(self.rng.random((self.game_count, DECK_SIZE)), axis=1)
+        self.draw_stack[:] = DECK[order]
+        self.draw_size[:] = DECK_SIZE
+
+        for seat in range(self.player_count):
+            self.values[:, seat] = self.draw_stack[:, DECK_SIZE - GRID_SIZE * (seat + 1):DECK_SIZE - GRID_SIZE * seat]
+        self.draw_size -= GRID_SIZE * self.player_count
+
+    def start(self):
+        all_games = np.arange(self.game_count)
+
+        self.flip_starting_cards(all_games)
+        self.initialize_discard_stack(all_games)
+        self.set_starting_player(all_games)
+
+        while self.active.any():
+            self.execute_turn()
+
+        return self.evaluate_scores()
+
+    def flip_starting_cards(self, games):
+        for seat, strategy in enumerate(self.player_strategies):
+            cells = strategy.get_position_of_initial_card_flips(self, games, seat)
+            for flip in range(cells.shape[1]):
+                self.revealed[games, seat, cells[:, flip]] = True
+
+    def initialize_discard_stack(self, games):
+        self.draw_size[games] -= 1
+        self.discard_stack[games, 0] = self.draw_stack[games, self.draw_size[games]]
+        self.discard_size[games] = 1
+
+        visible = (self.revealed[games] & ~self.removed[games]).reshape(len(games), -1)
+        self.seen_card_counts[games] = count_card_values(self.values[games].reshape(len(games), -1), visible)
+        self.seen_card_counts[games, self.discard_stack[games, 0] + CARD_VALUE_OFFSET] += 1
+
+    def set_starting_player(self, games):
+        scores = np.where(self.revealed[games], self.values[games], 0).sum(axis=2)
+        # like SkyjoGame.set_next_player_as_current, the last player with the highest score starts
+        self.current_player[games] = self.player_count - 1 - np.argmax(scores[:, ::-1], axis=1)
+
+    def execute_turn(self):
+        active_games = np.flatnonzero(self.active)
+
+        for seat, strategy in enumerate(self.player_strategies):
+            games = active_games[self.current_player[active_games] == seat]
+            if len(games) == 0:
+                continue
+
+            from_discard = strategy.decide_draw_location(self, games, seat)
+            new_cards = np.where(from_discard, self.get_discard_top(games), self.get_draw_top(games))
+            cells, replace_card = strategy.get_target_location(self, games, seat, new_cards)
+
+            self.apply_move(games, seat, from_discard, new_cards, cells, replace_card)
+            self.remove_columns_with_identical_cards(games, seat)
+            self.reshuffle_cards(games[self.draw_size[games] == 0])
+            self.update_last_round(games, seat)
+
+        self.current_player[active_games] = (self.current_player[active_games] + 1) % self.player_count
+        self.step_count += 1
+
+    def get_discard_top(self, games):
+        return self.discard_stack[games, self.discard_size[games] - 1]
+
+    def get_draw_top(self, games):
+        return self.draw_stack[games, self.draw_size[games] - 1]
+
+    def calculate_expected_card_values(self, games, extra_cards=None):
+        """
+        Calculates the expected value of a hidden card for each of the given games.
+
+        :param extra_cards: optional card per game that is treated as seen in addition to the seen card counts
+        """
+        counts = self.seen_card_counts[games]
+        seen_count = counts.sum(axis=1)
+        seen_value_sum = counts @ CARD_VALUES
+
+        if extra_cards is not None:
+            seen_count = seen_count + 1
+            seen_value_sum = seen_value_sum + extra_cards
+
+        return (DECK_VALUE_SUM - seen_value_sum) / (DECK_SIZE - seen_count)
+
+    def apply_move(self, games, seat, from_discard, new_cards, cells, replace_card):
+        from_draw = ~from_discard
+        self.discard_size[games] -= from_discard
+        self.draw_size[games] -= from_draw
+        self.seen_card_counts[games[from_discard], new_cards[from_discard] + CARD_VALUE_OFFSET] -= 1
+
+        old_values = self.values[games, seat, cells]
+        was_hidden = ~self.revealed[games, seat, cells]
+
+        self.values[games[replace_card], seat, cells[replace_card]] = new_cards[replace_card]
+        self.revealed[games, seat, cells] = True
+
+        # the drawn card ends up either in the grid or on the discard stack, a hidden target card is seen either way
+        self.seen_card_counts[games, new_cards + CARD_VALUE_OFFSET] += 1
+        self.seen_card_counts[games[was_hidden], old_values[was_hidden] + CARD_VALUE_OFFSET] += 1
+
+        self.discard_stack[games, self.discard_size[games]] = np.where(replace_card, old_values, new_cards)
+        self.discard_size[games] += 1
+
+    def remove_columns_with_identical_cards(self, games, seat):
+        values = self.values[games, seat].reshape(-1, COLUMN_COUNT, ROW_COUNT)
+        visible = (self.revealed[games, seat] & ~self.removed[games, seat]).reshape(-1, COLUMN_COUNT, ROW_COUNT)
+
+        removable = visible.all(axis=2) & (values == values[:, :, :1]).all(axis=2)
+        if not removable.any():
+            return
+
+        self.removed[games, seat] |= np.repeat(removable, ROW_COUNT, axis=1)
+
+        rows, columns = np.nonzero(removable)
+        removed_values = values[rows, columns, 0].astype(np.int64) + CARD_VALUE_OFFSET
+        np.subtract.at(self.seen_card_counts, (games[rows], removed_values), ROW_COUNT)
+
+    def reshuffle_cards(self, games):
+        if len(games) == 0:
+            return
+
+        sizes = self.discard_size[games]
+        in_stack = np.arange(DECK_SIZE) < sizes[:, None]
+
+        self.seen_card_counts[games] -= count_card_values(self.discard_stack[games], in_stack)
+
+        keys = np.where(in_stack, self.rng.random((len(games), DECK_SIZE)), 2.0)
+        order = np.argsort(keys, axis=1)
+        self.draw_stack[games] = np.take_along_axis(self.discard_stack[games], order, axis=1)
+        self.draw_size[games] = sizes - 1
+
+        top = self.draw_stack[games, sizes - 1]
+        self.discard_stack[games, 0] = top
+        self.discard_size[games] = 1
+        self.seen_card_counts[games, top + CARD_VALUE_OFFSET] += 1
+
+    def update_last_round(self, games, seat):
+        finished = self.revealed[games, seat].all(axis=1) & (self.finishing_player[games] < 0)
+        self.finishing_player[games[finished]] = seat
+        # every other player has one more turn, the finisher's turn is counted down below
+        self.remaining_turns[games[finished]] = self.player_count
+
+        last_round_games = games[self.finishing_player[games] >= 0]
+        self.remaining_turns[last_round_games] -= 1
+        self.active[last_round_games[self.remaining_turns[last_round_games] == 0]] = False
+
+    def evaluate_scores(self):
+        """
+        :return: array of shape (games, players) with the final score of every player
+        """
+        scores = np.where(self.removed, 0, self.values).sum(axis=2, dtype=np.int64)
+
+        all_games = np.arange(self.game_count)
+        finisher_scores = scores[all_games, self.finishing_player]
+        doubled = (finisher_scores != scores.min(axis=1)) & (finisher_scores > 0)
+        scores[all_games[doubled], self.finishing_player[doubled]] *= 2
+        self.doubled_player = np.where(doubled, self.finishing_player, -1)
+
+        return scores
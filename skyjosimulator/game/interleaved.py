@@ -0,0 +1,95 @@
+from skyjosimulator.game.logic import SkyjoGame
+
+DEFAULT_CONCURRENCY = 64
+
+
+class InterleavedGames:
+    def __init__(self, player_strategies, concurrency=DEFAULT_CONCURRENCY, aggregate=None):
+        """
+        Plays several games side by side turn by turn, so a strategy can make its decisions of all games at once.
+
+        The games share one strategy object per seat. Every strategy is asked for the decisions of all games in which
+        it is the current player with one call of its batch methods (get_positions_of_initial_card_flips,
+        decide_draw_locations and get_target_locations), which strategies without an own batch implementation
+        answer game by game.
+
+        :param player_strategies: strategies of the players in seat order
+        :param concurrency: number of games played at the same time
+        :param aggregate: optional ScoreAggregate every finished game is added to
+        """
+        self.player_strategies = player_strategies
+        self.games = [SkyjoGame(player_strategies, aggregate=aggregate) for _ in range(concurrency)]
+
+    def play(self, seeds):
+        """
+        Plays one game per seed. A finished game is reset with the next seed right away.
+
+        The deck and the reshuffles of a game only depend on its seed. The seeds do not reseed the random module, since
+        the other games are still being played, so the random decisions of the strategies draw from one stream of the
+        random module in the order the games are interleaved.
+
+        :return: number of games played
+        """
+        seeds = iter(seeds)
+        idle_games = list(self.games)
+        active_games = []
+        played_games = 0
+
+        while True:
+            # zip stops at the last idle game without taking another seed
+            new_games = []
+            for game, seed in zip(idle_games, seeds):
+                game.reset(seed, seed_random_module=False)
+                new_games.append(game)
+            del idle_games[:len(new_games)]
+            self.start_games(new_games)
+            active_games += new_games
+
+            if not active_games:
+                return played_games
+
+            self.play_turns(active_games)
+
+            finished_games = [game for game in active_games if game.remaining_turns == 0]
+            if finished_games:
+                for game in finished_games:
+                    game.evaluate_scores()
+                active_games = [game for game in active_games if game.remaining_turns != 0]
+                idle_games += finished_games
+                played_games += len(finished_games)
+
+    def start_games(self, games):
+        if not games:
+            return
+
+        for strategy in self.player_strategies:
+            positions = strategy.get_positions_of_initial_card_flips(len(games))
+            for game, game_positions in zip(games, positions):
+                game.state.flip_cards(strategy.name, game_positions)
+
+        for game in games:
+            game.state.initialize_discard_stack()
+            game.set_next_player_as_current()
+
+    def play_turns(self, games):
+        """
+        Plays the turn of the current player in each of the games.
+        """
+        # the games are grouped before any turn is played, so a game never plays two turns in one call
+        games_by_seat = [[] for _ in self.player_strategies]
+        for game in games:
+            games_by_seat[game.current_player_index].append(game)
+
+        for strategy, seat_games in zip(self.player_strategies, games_by_seat):
+            if not seat_games:
+                continue
+
+            observations = [game.create_observation() for game in seat_games]
+            draw_locations = strategy.decide_draw_locations(observations)
+            new_cards = [game.get_drawn_card(draw_location)
+                         for game, draw_location in zip(seat_games, draw_locations)]
+            target_locations = strategy.get_target_locations(observations, new_cards)
+
+            for game, draw_location, target_location in zip(seat_games, draw_locations, target_locations):
+                game.play_decided_turn(draw_location, target_location)
+                game.end_turn()
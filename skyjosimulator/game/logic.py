@@ -1,73 +1,255 @@
-from random import shuffle
+import random
+from time import perf_counter
 
 from skyjosimulator import CARD_FREQUENCIES, DRAW_LOCATION
-from skyjosimulator.game import CardGridFactory
-from skyjosimulator.game.model import SkyjoGameState
+from skyjosimulator.game import CompactCardGridFactory
+from skyjosimulator.game.model import MoveRecord, SkyjoGameState
+from skyjosimulator.game.observation import GridView, Observation
+from skyjosimulator.game.profiling import GAME
 
+GRID_SIZE = 12
 
-def generate_draw_stack():
-    draw_stack = []
+
+def create_deck_template():
+    deck = []
     for card in CARD_FREQUENCIES:
-        draw_stack += [card] * CARD_FREQUENCIES[card]
-    shuffle(draw_stack)
+        deck += [card] * CARD_FREQUENCIES[card]
+    return tuple(deck)
+
+
+DECK_TEMPLATE = create_deck_template()
+
+
+def generate_draw_stack():
+    draw_stack = list(DECK_TEMPLATE)
+    random.shuffle(draw_stack)
     return draw_stack
 
 
+def double_finisher_score(scores, finisher):
+    """
+    Doubles the score of the finisher in place, if it is positive and not the lowest score.
+
+    :return: name of the doubled player or None
+    """
+    if scores[finisher] != min(scores.values()) and scores[finisher] > 0:
+        scores[finisher] *= 2
+        return finisher
+    return None
+
+
 class SkyjoGame:
-    def __init__(self, player_strategies):
+    def __init__(self, player_strategies, grid_factory=CompactCardGridFactory, aggregate=None, profiler=None,
+                 recorder=None):
+        """
+        :param player_strategies: strategies of the players in seat order
+        :param grid_factory: factory for the player grids
+        :param aggregate: optional ScoreAggregate every finished game is added to
+        :param profiler: optional GameProfiler that records the time of every phase of every turn
+        :param recorder: optional TrajectoryRecorder that records every decision and event of the games played with
+                         start
+        """
         draw_stack = generate_draw_stack()
         self.state = SkyjoGameState(draw_stack, {})
+        # reshuffles use their own random generator, so they only depend on the seed of the game and not on the
+        # random decisions of the strategies
+        self.deck_random = random.Random(random.getrandbits(64))
+        # deals seeded games without touching the random module, see reset
+        self.deal_random = random.Random()
         self.player_strategies = player_strategies
+        self.player_names = [player.name for player in player_strategies]
+        self.grid_factory = grid_factory
+        self.aggregate = aggregate
+        self.profiler = profiler
+        self.recorder = recorder
+        self.seed = None
+        self.grid_views = dict()
+        self.observations = dict()
+
+        self.current_player_index = 0
+        self.current_player = None
+        self.finishing_player = None
+        self.last_round = False
+        self.remaining_turns = None
+
+    def reset(self, seed=None, seed_random_module=True):
+        """
+        Prepares a new game with the same players, reusing the storage of the previous game.
+
+        The draw stack is refilled from the deck template and shuffled in place, and the cards are dealt into the
+        existing grids. After a reset the game is in the same state as a new game after prepare_game.
+
+        :param seed: if given, the deck and the reshuffles only depend on it
+        :param seed_random_module: if a seed is given, the random module continues as if it had been seeded with it
+                                   before the deck was shuffled, so the random decisions of the strategies depend on
+                                   the seed, too. games played side by side turn this off, so a reset does not reseed
+                                   the random module under the other games
+        """
+        self.seed = seed
+        if seed is None:
+            deal_random = random
+        else:
+            deal_random = self.deal_random
+            deal_random.seed(seed)
+
+        draw_stack = self.state.draw_stack
+        draw_stack[:] = DECK_TEMPLATE
+        deal_random.shuffle(draw_stack)
+        self.deck_random.seed(deal_random.getrandbits(64))
+        if seed is not None and seed_random_module:
+            random.setstate(deal_random.getstate())
+        del self.state.discard_stack[:]
 
+        for player in self.player_strategies:
+            first_card = len(draw_stack) - GRID_SIZE
+            grid = self.state.player_grids.get(player.name)
+            self.state.player_grids[player.name] = self.grid_factory.reset_grid(grid, draw_stack, first_card)
+            del draw_stack[first_card:]
+
+        self.update_grid_views()
+        self.state.card_statistic.reset()
         self.current_player_index = 0
         self.current_player = None
+        self.finishing_player = None
         self.last_round = False
+        self.remaining_turns = None
 
     def prepare_game(self):
         player_grids = dict()
         for player in self.player_strategies:
             cards = self.state.draw_n_cards(12)
-            player_grids[player.name] = CardGridFactory.create_grid(cards)
+            player_grids[player.name] = self.grid_factory.create_grid(cards)
         self.state.player_grids = player_grids
+        self.update_grid_views()
 
-    def start(self):
-        remaining_turns = None
+    def update_grid_views(self):
+        """
+        Creates the views on the player grids and the observations of the players once per set of grids.
+
+        The observations are backed by the game state, so the same observation is passed to a player in every turn.
+        """
+        for player, grid in self.state.player_grids.items():
+            self.grid_views[player] = GridView(grid)
+
+        for player in self.player_names:
+            self.observations[player] = Observation(self.state, player, self.player_names, grid_views=self.grid_views)
 
+    def start(self):
+        if self.recorder is not None:
+            self.recorder.record_game(self.seed, len(self.player_strategies))
         self.flip_starting_cards()
         self.state.initialize_discard_stack()
         self.set_next_player_as_current()
+        return self.play_until_end()
+
+    def play_until_end(self):
+        """
+        Plays the turns from the current player on until the game has ended.
+
+        :return: final scores of the players
+        """
+        # the recorded turn is chosen once per game, so recording costs nothing while turned off
+        play_turn = self.play_recorded_turn if self.recorder is not None else self.play_turn
+
+        while self.remaining_turns is None or self.remaining_turns > 0:
+            play_turn()
+            self.end_turn()
+
+        if self.profiler is None:
+            return self.evaluate_scores()
+
+        start_time = perf_counter()
+        scores = self.evaluate_scores()
+        self.profiler.record(GAME, 'scoring', perf_counter() - start_time)
+        return scores
+
+    def end_turn(self):
+        if not self.last_round and self.state.player_has_finished(self.current_player.name):
+            self.last_round = True
+            self.finishing_player = self.current_player
+            # every other player has one more turn, the finisher's turn is counted down below
+            self.remaining_turns = len(self.player_strategies)
+
+        if self.last_round:
+            self.remaining_turns -= 1
+
+        self.set_next_player_as_current()
+
+    def play_turn(self, record=None):
+        """
+        :param record: optional MoveRecord that is filled, so the turn can be reverted with SkyjoGameState.undo_move
+        """
+        self.execute_current_players_move(record)
+        self.complete_move(record)
 
-        while remaining_turns is None or remaining_turns > 0:
-            self.execute_current_players_move()
-            self.state.remove_columns_with_identical_cards(self.current_player.name)
+    def play_decided_turn(self, draw_location, target_location, record=None):
+        """
+        Same as play_turn with decisions of the current player that were made outside of the game, like the batch
+        decisions of InterleavedGames.
+        """
+        self.state.apply_move(self.current_player.name, draw_location, target_location, record)
+        self.complete_move(record)
 
-            if len(self.state.draw_stack) == 0:
-                self.reshuffle_cards()
+    def complete_move(self, record=None):
+        """
+        Removes the columns completed by the move of the current player and reshuffles an empty draw stack.
+        """
+        player = self.current_player.name
+        profiler = self.profiler
+        start_time = perf_counter() if profiler is not None else None
 
-            if not self.last_round and self.state.player_has_finished(self.current_player.name):
-                self.last_round = True
-                remaining_turns = len(self.player_strategies) - 1
+        self.state.remove_columns_with_identical_cards(player, record)
+        if profiler is not None:
+            start_time = profiler.lap(player, 'column_removal', start_time)
 
-            if self.last_round:
-                remaining_turns -= 1
+        if len(self.state.draw_stack) == 0:
+            self.reshuffle_cards(record)
+            if profiler is not None:
+                profiler.lap(player, 'reshuffle', start_time)
 
-            self.set_next_player_as_current()
+    def play_recorded_turn(self):
+        record = MoveRecord()
+        self.play_turn(record)
+        self.recorder.record_turn(self.current_player_index, record)
 
-        return self.evaluate_scores()
+    def create_observation(self):
+        observation = self.observations[self.current_player.name]
+        observation.last_round = self.last_round
+        if self.finishing_player is not None:
+            observation.finishing_player = self.finishing_player.name
+        else:
+            observation.finishing_player = None
+        return observation
+
+    def execute_current_players_move(self, record=None):
+        """
+        Asks the current player for its move and applies it. The phases are timed if the game has a profiler.
+        """
+        player = self.current_player
+        profiler = self.profiler
+        start_time = perf_counter() if profiler is not None else None
+
+        observation = self.create_observation()
+        draw_location = player.decide_draw_location(observation)
+        if profiler is not None:
+            start_time = profiler.lap(player.name, 'draw_decision', start_time)
 
-    def execute_current_players_move(self):
-        draw_location = self.current_player.decide_draw_location(self.state.player_grids,
-                                                                 self.state.discard_stack)
         new_card = self.get_drawn_card(draw_location)
-        target_location = self.current_player.get_target_location(self.state.player_grids,
-                                                                  self.state.discard_stack,
-                                                                  new_card)
-        self.state.apply_move(self.current_player.name, draw_location, target_location)
+        target_location = player.get_target_location(observation, new_card)
+        if profiler is not None:
+            start_time = profiler.lap(player.name, 'target_decision', start_time)
 
-    def reshuffle_cards(self):
-        self.state.draw_stack += self.state.discard_stack
-        shuffle(self.state.draw_stack)
-        self.state.discard_stack = [self.state.draw_stack.pop()]
+        self.state.apply_move(player.name, draw_location, target_location, record)
+        if profiler is not None:
+            profiler.lap(player.name, 'apply_move', start_time)
+
+    def reshuffle_cards(self, record=None):
+        """
+        :param record: optional MoveRecord of the move before, so the reshuffle can be undone with it
+        """
+        self.state.move_discard_stack_to_draw_stack(record)
+        self.deck_random.shuffle(self.state.draw_stack)
+        self.state.initialize_discard_stack()
 
     def get_drawn_card(self, draw_location):
         if draw_location == DRAW_LOCATION.DRAW_STACK:
@@ -77,9 +259,11 @@ class SkyjoGame:
         return new_card
 
     def flip_starting_cards(self):
-        for strategy in self.player_strategies:
+        for seat, strategy in enumerate(self.player_strategies):
             positions = strategy.get_position_of_initial_card_flips()
             self.state.flip_cards(strategy.name, positions)
+            if self.recorder is not None:
+                self.recorder.record_flips(seat, self.state.player_grids[strategy.name], positions)
 
     def set_next_player_as_current(self):
         if self.current_player is None:
@@ -103,8 +287,12 @@ class SkyjoGame:
         self.state.reveal_all_cards()
         scores = self.state.calculate_scores()
 
-        if scores[self.current_player.name] != min(scores.values()) and scores[self.current_player.name] > 0:
-            scores[self.current_player.name] *= 2
+        doubled_player = double_finisher_score(scores, self.finishing_player.name)
+
+        if self.aggregate is not None:
+            self.aggregate.add_game(scores, doubled_player)
+        if self.recorder is not None:
+            self.recorder.record_scores(scores, self.player_names, doubled_player)
 
         return scores
 
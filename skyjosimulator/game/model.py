@@ -1,14 +1,50 @@
-from skyjosimulator import DRAW_LOCATION
+from array import array
+
+from skyjosimulator import CARD_FREQUENCIES, DRAW_LOCATION
+
+ROW_COUNT = 3
+
+MIN_CARD_VALUE = min(CARD_FREQUENCIES)
+DECK_SIZE = sum(CARD_FREQUENCIES.values())
+DECK_VALUE_SUM = sum(value * frequency for value, frequency in CARD_FREQUENCIES.items())
+# number of cards of every value, ordered by card value starting at the lowest value
+CARD_COUNTS = tuple(CARD_FREQUENCIES[value] for value in sorted(CARD_FREQUENCIES))
 
 
 class SkyjoGameState:
-    def __init__(self, draw_stack, player_grids):
+    def __init__(self, draw_stack, player_grids, discard_stack=None, card_statistic=None):
+        """
+        :param discard_stack: optional discard stack, empty by default
+        :param card_statistic: optional CardStatistic matching the cards, it is calculated if not given
+        """
         self.draw_stack = draw_stack
-        self.discard_stack = []
+        self.discard_stack = discard_stack if discard_stack is not None else []
         self.player_grids = player_grids
+        if card_statistic is not None:
+            self.card_statistic = card_statistic
+        else:
+            self.card_statistic = CardStatistic()
+            self.recalculate_card_statistic()
+
+    def clone(self):
+        """
+        :return: independent copy of the state that shares no mutable objects with it
+        """
+        return SkyjoGameState(list(self.draw_stack),
+                              {player: grid.clone() for player, grid in self.player_grids.items()},
+                              list(self.discard_stack), self.card_statistic.clone())
+
+    def recalculate_card_statistic(self):
+        self.card_statistic.reset()
+        self.card_statistic.add_cards(self.discard_stack)
+        for grid in self.player_grids.values():
+            for column in grid.to_list():
+                self.card_statistic.add_cards(value for value in column if value is not None)
 
     def initialize_discard_stack(self):
-        self.discard_stack.append(self.draw_stack.pop())
+        card = self.draw_stack.pop()
+        self.discard_stack.append(card)
+        self.card_statistic.add_card(card)
 
     def get_current_state(self):
         revealed_values = dict()
@@ -18,20 +54,77 @@ class SkyjoGameState:
 
         return revealed_values
 
-    def apply_move(self, player, draw_location, target_location):
+    def apply_move(self, player, draw_location, target_location, record=None):
+        """
+        :param record: optional MoveRecord that is filled, so the move can be reverted with undo_move
+        """
         grid = self.player_grids[player]
 
         if draw_location == DRAW_LOCATION.DRAW_STACK:
             drawn_card = self.draw_stack.pop()
         else:
             drawn_card = self.discard_stack.pop()
+            self.card_statistic.remove_card(drawn_card)
+
+        # the drawn card ends up either in the grid or on the discard stack
+        self.card_statistic.add_card(drawn_card)
+        target_was_hidden = grid.get_value(target_location.column, target_location.row) is None
 
         if target_location.replace_card:
             value_to_discard = grid.replace_card((target_location.column, target_location.row), drawn_card)
             self.discard_stack.append(value_to_discard)
+            if target_was_hidden:
+                self.card_statistic.add_card(value_to_discard)
         else:
+            value_to_discard = drawn_card
             self.discard_stack.append(drawn_card)
-            grid.reveal_card(target_location.column, target_location.row)
+            self.reveal_card(grid, target_location.column, target_location.row)
+
+        if record is not None:
+            record.set_move(player, draw_location, drawn_card, target_location, target_was_hidden, value_to_discard)
+
+    def undo_move(self, record):
+        """
+        Reverts a move and the column removal and reshuffle that followed it, as recorded in the MoveRecord.
+
+        Moves have to be undone in the reverse order they were applied in.
+        """
+        if record.reshuffled_cards is not None:
+            self.card_statistic.remove_card(self.discard_stack[-1])
+            del self.draw_stack[:]
+            self.discard_stack[:] = record.reshuffled_cards
+            self.card_statistic.add_cards(record.reshuffled_cards)
+
+        grid = self.player_grids[record.player]
+
+        if record.removed_columns is not None:
+            grid.restore_columns(record.removed_columns)
+            for value in record.removed_values:
+                self.card_statistic.add_card(value, ROW_COUNT)
+                self.card_statistic.add_removed_card(value, -ROW_COUNT)
+
+        self.discard_stack.pop()
+        self.card_statistic.remove_card(record.drawn_card)
+
+        if record.replace_card:
+            grid.set_card(record.column, record.row, record.discarded_card, not record.target_was_hidden)
+            if record.target_was_hidden:
+                self.card_statistic.remove_card(record.discarded_card)
+        elif record.target_was_hidden:
+            revealed_value = grid.get_value(record.column, record.row)
+            grid.set_card(record.column, record.row, revealed_value, False)
+            self.card_statistic.remove_card(revealed_value)
+
+        if record.draw_location == DRAW_LOCATION.DRAW_STACK:
+            self.draw_stack.append(record.drawn_card)
+        else:
+            self.discard_stack.append(record.drawn_card)
+            self.card_statistic.add_card(record.drawn_card)
+
+    def reveal_card(self, grid, column_index, row_index):
+        if grid.get_value(column_index, row_index) is None:
+            grid.reveal_card(column_index, row_index)
+            self.card_statistic.add_card(grid.get_value(column_index, row_index))
 
     def player_has_finished(self, player):
         grid = self.player_grids[player]
@@ -44,19 +137,44 @@ class SkyjoGameState:
 
     def reveal_all_cards(self):
         for player_grid in self.player_grids.values():
+            hidden_before = [value is None for column in player_grid.to_list() for value in column]
             player_grid.reveal_all_cards()
+            values = [value for column in player_grid.to_list() for value in column]
+            self.card_statistic.add_cards(value for value, hidden in zip(values, hidden_before) if hidden)
 
     def flip_cards(self, player, positions):
         grid = self.player_grids[player]
         for position in positions:
-            grid.reveal_card(position[0], position[1])
+            self.reveal_card(grid, position[0], position[1])
 
-    def remove_columns_with_identical_cards(self, player):
+    def remove_columns_with_identical_cards(self, player, record=None):
+        """
+        :param record: optional MoveRecord of the move before, the removed columns are added to it
+        """
         grid = self.player_grids[player]
-
-        for column in grid.columns:
-            if column.is_removeable():
-                grid.columns.remove(column)
+        columns = grid.save_columns() if record is not None else None
+
+        removed_values = grid.remove_columns_with_identical_cards()
+        for value in removed_values:
+            self.card_statistic.remove_card(value, ROW_COUNT)
+            self.card_statistic.add_removed_card(value, ROW_COUNT)
+
+        if record is not None and removed_values:
+            record.removed_columns = columns
+            record.removed_values = removed_values
+
+    def move_discard_stack_to_draw_stack(self, record=None):
+        """
+        :param record: optional MoveRecord of the move before, it is only able to undo a reshuffle of an empty draw
+                       stack
+        """
+        if record is not None:
+            record.reshuffled_cards = list(self.discard_stack)
+
+        for value in self.discard_stack:
+            self.card_statistic.remove_card(value)
+        self.draw_stack += self.discard_stack
+        del self.discard_stack[:]
 
     def calculate_scores(self):
         scores = dict()
@@ -65,16 +183,129 @@ class SkyjoGameState:
         return scores
 
 
+class MoveRecord:
+    __slots__ = ('player', 'draw_location', 'drawn_card', 'column', 'row', 'replace_card', 'target_was_hidden',
+                 'discarded_card', 'removed_columns', 'removed_values', 'reshuffled_cards')
+
+    def __init__(self):
+        """
+        Everything SkyjoGameState.undo_move needs to revert a move, the column removal and the reshuffle after it.
+        """
+        self.player = None
+        self.draw_location = None
+        self.drawn_card = None
+        self.column = None
+        self.row = None
+        self.replace_card = False
+        self.target_was_hidden = False
+        self.discarded_card = None
+        self.removed_columns = None
+        self.removed_values = None
+        self.reshuffled_cards = None
+
+    def set_move(self, player, draw_location, drawn_card, target_location, target_was_hidden, discarded_card):
+        self.player = player
+        self.draw_location = draw_location
+        self.drawn_card = drawn_card
+        self.column = target_location.column
+        self.row = target_location.row
+        self.replace_card = target_location.replace_card
+        self.target_was_hidden = target_was_hidden
+        self.discarded_card = discarded_card
+
+
+class CardStatistic:
+    def __init__(self):
+        """
+        Running count of the publicly seen cards, i.e. the revealed cards of all grids and the cards of the discard
+        stack. It is updated by SkyjoGameState on every change, so strategies can look up the expected value of a
+        hidden card without walking the grids.
+
+        The cards of removed columns are no longer counted as seen, but they are counted in removed_counts, so the
+        cards that are really unknown can be told apart (see get_unseen_counts).
+        """
+        self.counts = [0] * len(CARD_FREQUENCIES)
+        self.removed_counts = [0] * len(CARD_FREQUENCIES)
+        self.seen_count = 0
+        self.seen_value_sum = 0
+
+    def clone(self):
+        statistic = CardStatistic()
+        statistic.counts[:] = self.counts
+        statistic.removed_counts[:] = self.removed_counts
+        statistic.seen_count = self.seen_count
+        statistic.seen_value_sum = self.seen_value_sum
+        return statistic
+
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+            self.removed_counts[index] = 0
+        self.seen_count = 0
+        self.seen_value_sum = 0
+
+    def add_card(self, value, count=1):
+        self.counts[value - MIN_CARD_VALUE] += count
+        self.seen_count += count
+        self.seen_value_sum += value * count
+
+    def add_cards(self, values):
+        for value in values:
+            self.add_card(value)
+
+    def remove_card(self, value, count=1):
+        self.add_card(value, -count)
+
+    def add_removed_card(self, value, count=1):
+        self.removed_counts[value - MIN_CARD_VALUE] += count
+
+    def get_count(self, value):
+        return self.counts[value - MIN_CARD_VALUE]
+
+    def get_unseen_counts(self):
+        """
+        :return: tuple of the number of cards of every value (ordered by card value starting at the lowest value)
+                 that are neither seen nor removed, i.e. hidden in a grid or in the draw stack
+        """
+        return tuple(frequency - count - removed_count for frequency, count, removed_count
+                     in zip(CARD_COUNTS, self.counts, self.removed_counts))
+
+    def calculate_expected_card_value(self, extra_card=None):
+        """
+        Calculates the expected value of a card that has not been seen yet.
+
+        :param extra_card: optional card that is treated as seen in addition to the counted cards
+        """
+        hidden_cards_no = DECK_SIZE - self.seen_count
+        hidden_cards_value_sum = DECK_VALUE_SUM - self.seen_value_sum
+
+        if extra_card is not None:
+            hidden_cards_no -= 1
+            hidden_cards_value_sum -= extra_card
+
+        return float(hidden_cards_value_sum) / float(hidden_cards_no)
+
+
 class CardGrid:
     def __init__(self, columns: list):
         self.columns = columns
 
+    def clone(self):
+        return CardGrid([CardColumn([Card(card.value, card.is_revealed) for card in column.cards])
+                         for column in self.columns])
+
     def all_cards_revealed(self):
         for column in self.columns:
             if not column.all_cards_revealed():
                 return False
         return True
 
+    def get_column_count(self):
+        return len(self.columns)
+
+    def get_value(self, column_index, row_index):
+        return self.columns[column_index].cards[row_index].get_value()
+
     def reveal_card(self, column_index, row_index):
         column = self.columns[column_index]
         column.reveal_card(row_index)
@@ -88,6 +319,31 @@ class CardGrid:
         value_to_discard = column.replace_card(position[1], value)
         return value_to_discard
 
+    def set_card(self, column_index, row_index, value, revealed):
+        card = self.columns[column_index].cards[row_index]
+        card.value = value
+        card.is_revealed = revealed
+
+    def save_columns(self):
+        return list(self.columns)
+
+    def restore_columns(self, columns):
+        self.columns[:] = columns
+
+    def calculate_final_score(self):
+        """
+        :return: score of the grid with all cards revealed
+        """
+        return sum(card.value for column in self.columns for card in column.cards)
+
+    def remove_columns_with_identical_cards(self):
+        removed_values = []
+        for column in list(self.columns):
+            if column.is_removeable():
+                self.columns.remove(column)
+                removed_values.append(column.cards[0].value)
+        return removed_values
+
     def calculate_current_score(self):
         score = 0
         for column in self.columns:
@@ -108,12 +364,10 @@ class CardColumn:
         self.cards = cards
 
     def is_removeable(self):
-        value_of_first_card = None
+        value_of_first_card = self.cards[0].value
 
         for card in self.cards:
-            if not value_of_first_card:
-                value_of_first_card = card.value
-            elif card.value != value_of_first_card or not card.is_revealed:
+            if card.value != value_of_first_card or not card.is_revealed:
                 return False
         return True
 
@@ -158,3 +412,198 @@ class Card:
         if not self.is_revealed:
             return None
         return self.value
+
+
+class CompactCardGrid:
+    def __init__(self, values, revealed_mask=0, removed_mask=0):
+        """
+        Array-backed alternative to CardGrid with the same interface.
+
+        The card values are stored column by column in a fixed-size array. Revealed cards and removed columns are
+        tracked as bitmasks. The values visible to the players and the score of the revealed cards are kept up to
+        date on every change, so queries do not have to walk the grid.
+
+        :param values: card values in column-major order (three cards per column)
+        :param revealed_mask: bit i is set if the card at index i is revealed
+        :param removed_mask: bit c is set if the column c has been removed
+        """
+        self.values = array('b', values)
+        self.revealed_mask = revealed_mask
+        self.removed_mask = removed_mask
+        self.full_mask = (1 << len(self.values)) - 1
+        self.column_indices = [column for column in range(len(self.values) // ROW_COUNT)
+                               if not removed_mask & (1 << column)]
+        self.visible_values = [value if revealed_mask >> index & 1 else None for index, value in enumerate(values)]
+        self.score = self._sum_values(revealed_only=True)
+
+    def clone(self):
+        grid = CompactCardGrid.__new__(CompactCardGrid)
+        grid.values = array('b', self.values)
+        grid.revealed_mask = self.revealed_mask
+        grid.removed_mask = self.removed_mask
+        grid.full_mask = self.full_mask
+        grid.column_indices = list(self.column_indices)
+        grid.visible_values = list(self.visible_values)
+        grid.score = self.score
+        return grid
+
+    def reset(self, values, first_card=0):
+        """
+        Refills the grid in place with hidden cards.
+
+        :param values: sequence the card values are taken from
+        :param first_card: index of the first card value in values
+        """
+        for index in range(len(self.values)):
+            self.values[index] = values[first_card + index]
+            self.visible_values[index] = None
+
+        self.revealed_mask = 0
+        self.removed_mask = 0
+        self.column_indices[:] = range(len(self.values) // ROW_COUNT)
+        self.score = 0
+
+    def _sum_values(self, revealed_only):
+        score = 0
+        for column in self.column_indices:
+            for index in range(column * ROW_COUNT, (column + 1) * ROW_COUNT):
+                if not revealed_only or self.revealed_mask >> index & 1:
+                    score += self.values[index]
+        return score
+
+    @property
+    def columns(self):
+        return tuple(CardColumnView(self, column) for column in self.column_indices)
+
+    def get_column_count(self):
+        return len(self.column_indices)
+
+    def get_value(self, column_index, row_index):
+        return self.visible_values[self.column_indices[column_index] * ROW_COUNT + row_index]
+
+    def all_cards_revealed(self):
+        # removed columns were fully revealed before their removal
+        return self.revealed_mask == self.full_mask
+
+    def reveal_card(self, column_index, row_index):
+        index = self.column_indices[column_index] * ROW_COUNT + row_index
+        if not self.revealed_mask >> index & 1:
+            self.revealed_mask |= 1 << index
+            self.visible_values[index] = self.values[index]
+            self.score += self.values[index]
+
+    def reveal_all_cards(self):
+        self.revealed_mask = self.full_mask
+        self.visible_values[:] = self.values
+        self.score = self._sum_values(revealed_only=False)
+
+    def replace_card(self, position, value):
+        index = self.column_indices[position[0]] * ROW_COUNT + position[1]
+        value_to_discard = self.values[index]
+
+        if self.revealed_mask >> index & 1:
+            self.score -= value_to_discard
+        else:
+            self.revealed_mask |= 1 << index
+
+        self.values[index] = value
+        self.visible_values[index] = value
+        self.score += value
+        return value_to_discard
+
+    def set_card(self, column_index, row_index, value, revealed):
+        index = self.column_indices[column_index] * ROW_COUNT + row_index
+        if self.revealed_mask >> index & 1:
+            self.score -= self.values[index]
+
+        self.values[index] = value
+        if revealed:
+            self.revealed_mask |= 1 << index
+            self.visible_values[index] = value
+            self.score += value
+        else:
+            self.revealed_mask &= ~(1 << index)
+            self.visible_values[index] = None
+
+    def save_columns(self):
+        return self.removed_mask, list(self.column_indices), self.score
+
+    def restore_columns(self, columns):
+        self.removed_mask, column_indices, self.score = columns
+        self.column_indices[:] = column_indices
+
+    def calculate_final_score(self):
+        """
+        :return: score of the grid with all cards revealed
+        """
+        return self._sum_values(revealed_only=False)
+
+    def remove_columns_with_identical_cards(self):
+        removed_values = []
+        visible_values = self.visible_values
+        for column in list(self.column_indices):
+            first_index = column * ROW_COUNT
+            value = visible_values[first_index]
+            if value is not None and visible_values[first_index + 1] == value \
+                    and visible_values[first_index + 2] == value:
+                self.column_indices.remove(column)
+                self.removed_mask |= 1 << column
+                self.score -= value * ROW_COUNT
+                removed_values.append(value)
+        return removed_values
+
+    def calculate_current_score(self):
+        return self.score
+
+    def to_list(self):
+        visible_values = self.visible_values
+        return [visible_values[column * ROW_COUNT:(column + 1) * ROW_COUNT] for column in self.column_indices]
+
+
+class CardColumnView:
+    def __init__(self, grid, column):
+        """
+        Read-only view on a single column of a CompactCardGrid.
+        """
+        self.grid = grid
+        self.column = column
+
+    @property
+    def cards(self):
+        first_index = self.column * ROW_COUNT
+        return tuple(CardView(self.grid, index) for index in range(first_index, first_index + ROW_COUNT))
+
+    def is_removeable(self):
+        cards = self.cards
+        return all(card.is_revealed and card.value == cards[0].value for card in cards)
+
+    def all_cards_revealed(self):
+        return all(card.is_revealed for card in self.cards)
+
+    def calculate_current_score(self):
+        return sum(card.value for card in self.cards if card.is_revealed)
+
+    def to_list(self):
+        return [card.get_value() for card in self.cards]
+
+
+class CardView:
+    def __init__(self, grid, index):
+        """
+        Read-only view on a single card of a CompactCardGrid.
+        """
+        self.grid = grid
+        self.index = index
+
+    @property
+    def value(self):
+        return self.grid.values[self.index]
+
+    @property
+    def is_revealed(self):
+        return bool(self.grid.revealed_mask & (1 << self.index))
+
+    def get_value(self):
+        if not self.is_revealed:
+            return None
+        return self.value
@@ -0,0 +1,115 @@
+class GridView:
+    __slots__ = ('get_column_count', 'get_value', 'all_cards_revealed', 'get_revealed_score', 'to_list')
+
+    def __init__(self, grid):
+        """
+        Read-only view on the grid of a player, only exposing the revealed cards.
+
+        The view reads directly from the grid, so it always shows its current state and never copies it. The reading
+        methods of the grid are bound once, so a call through the view costs the same as a call on the grid.
+        """
+        # get_column_count(), get_value(column_index, row_index) (None for hidden cards), all_cards_revealed(),
+        # get_revealed_score() and to_list() (new list of the columns with the visible card values)
+        self.get_column_count = grid.get_column_count
+        self.get_value = grid.get_value
+        self.all_cards_revealed = grid.all_cards_revealed
+        self.get_revealed_score = grid.calculate_current_score
+        self.to_list = grid.to_list
+
+    def get_hidden_card_count(self):
+        return sum(value is None for column in self.to_list() for value in column)
+
+
+class OpponentSummary:
+    __slots__ = ('name', 'revealed_score', 'hidden_card_count', 'column_count', 'has_finished')
+
+    def __init__(self, name, revealed_score, hidden_card_count, column_count, has_finished):
+        self.name = name
+        self.revealed_score = revealed_score
+        self.hidden_card_count = hidden_card_count
+        self.column_count = column_count
+        self.has_finished = has_finished
+
+
+class Observation:
+    __slots__ = ('_state', '_grid_views', 'player', 'player_names', 'own_grid', 'last_round', 'finishing_player')
+
+    def __init__(self, state, player, player_names, last_round=False, grid_views=None, finishing_player=None):
+        """
+        Read-only view on everything a player can see at the start of its turn.
+
+        SkyjoGame passes it to the strategy of the current player at the start of every turn. It is backed directly by
+        the game state, so nothing is copied and a strategy can not change the game through it.
+
+        :param state: SkyjoGameState of the game
+        :param player: name of the player the observation is made for
+        :param player_names: names of all players in seat order
+        :param last_round: True if another player has already revealed all cards
+        :param grid_views: optional GridView of every player, if they are kept for the whole game
+        :param finishing_player: name of the player who has revealed all cards first, if any
+        """
+        self._state = state
+        self._grid_views = grid_views
+        self.player = player
+        self.player_names = player_names
+        self.own_grid = self.get_grid(player)
+        self.last_round = last_round
+        self.finishing_player = finishing_player
+
+    def get_grid(self, player):
+        if self._grid_views is not None:
+            return self._grid_views[player]
+        return GridView(self._state.player_grids[player])
+
+    def get_discard_top(self):
+        return self._state.discard_stack[-1]
+
+    def get_discard_stack_size(self):
+        return len(self._state.discard_stack)
+
+    def get_draw_stack_size(self):
+        return len(self._state.draw_stack)
+
+    def get_seen_count(self, value):
+        """
+        :return: number of cards of the given value in the discard stack or revealed in a grid
+        """
+        return self._state.card_statistic.get_count(value)
+
+    def get_seen_counts(self):
+        """
+        :return: tuple of the seen card counts, ordered by card value starting at the lowest value
+        """
+        return tuple(self._state.card_statistic.counts)
+
+    def get_unseen_counts(self):
+        """
+        :return: tuple of the counts of the cards that are hidden in a grid or in the draw stack, ordered like
+                 get_seen_counts. the cards of removed columns are neither seen nor unseen
+        """
+        return self._state.card_statistic.get_unseen_counts()
+
+    def get_seen_card_count(self):
+        return self._state.card_statistic.seen_count
+
+    def calculate_expected_card_value(self, extra_card=None):
+        """
+        Expected value of a card that has not been seen yet.
+
+        :param extra_card: optional card that is treated as seen in addition to the seen cards, e.g. the drawn card
+        """
+        return self._state.card_statistic.calculate_expected_card_value(extra_card)
+
+    def get_opponents(self):
+        """
+        :return: OpponentSummary of every other player in seat order
+        """
+        summaries = []
+        for name in self.player_names:
+            if name == self.player:
+                continue
+            grid = self._state.player_grids[name]
+            hidden_card_count = sum(value is None for column in grid.to_list() for value in column)
+            summaries.append(OpponentSummary(name, grid.calculate_current_score(), hidden_card_count,
+                                             grid.get_column_count(), hidden_card_count == 0))
+        return summaries
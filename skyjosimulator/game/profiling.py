@@ -0,0 +1,75 @@
+from time import perf_counter
+
+PHASES = ('draw_decision', 'target_decision', 'apply_move', 'column_removal', 'reshuffle', 'scoring')
+
+# scoring is done for the whole game and is attributed to this pseudo player
+GAME = '*'
+
+
+class GameProfiler:
+    def __init__(self):
+        """
+        Wall time and number of calls per player and phase of a number of games.
+
+        Profilers of different games or worker processes can be merged into one report.
+        """
+        self.timings = dict()
+
+    def record(self, player, phase, seconds):
+        timing = self.timings.get((player, phase))
+        if timing is None:
+            self.timings[(player, phase)] = [1, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+
+    def lap(self, player, phase, start_time):
+        """
+        Records the time since start_time.
+
+        :return: the current time, the start time of the next phase
+        """
+        end_time = perf_counter()
+        self.record(player, phase, end_time - start_time)
+        return end_time
+
+    def merge(self, other):
+        for (player, phase), (calls, seconds) in other.timings.items():
+            timing = self.timings.setdefault((player, phase), [0, 0.0])
+            timing[0] += calls
+            timing[1] += seconds
+
+    def get_calls(self, player, phase):
+        return self.timings.get((player, phase), [0, 0.0])[0]
+
+    def get_seconds(self, player, phase):
+        return self.timings.get((player, phase), [0, 0.0])[1]
+
+    def get_total_seconds(self):
+        return sum(seconds for _, seconds in self.timings.values())
+
+    def to_dict(self):
+        return {'{}|{}'.format(player, phase): timing for (player, phase), timing in self.timings.items()}
+
+    @staticmethod
+    def from_dict(data):
+        profiler = GameProfiler()
+        for key, (calls, seconds) in data.items():
+            player, phase = key.rsplit('|', 1)
+            profiler.timings[(player, phase)] = [calls, seconds]
+        return profiler
+
+    def create_report(self):
+        """
+        :return: table of all players and phases ordered by their share of the total time
+        """
+        total_seconds = self.get_total_seconds()
+        lines = ['{:<16} {:<16} {:>12} {:>12} {:>12} {:>8}'.format('player', 'phase', 'calls', 'seconds',
+                                                                    'us/call', 'share')]
+
+        ordered_timings = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+        for (player, phase), (calls, seconds) in ordered_timings:
+            lines.append('{:<16} {:<16} {:>12} {:>12.4f} {:>12.3f} {:>7.1%}'.format(
+                player, phase, calls, seconds, seconds / calls * 1e6, seconds / total_seconds if total_seconds else 0))
+
+        return '\n'.join(lines)
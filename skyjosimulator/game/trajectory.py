@@ -0,0 +1,281 @@
+import os
+import struct
+
+from skyjosimulator import DRAW_LOCATION, RULES_VERSION
+from skyjosimulator.game.logic import SkyjoGame, SkyjoGameMove
+from skyjosimulator.game.model import MoveRecord
+from skyjosimulator.strategy.strategies import Strategy
+
+# the log starts with a header of the width of one record, followed by the records
+MAGIC = b'SKYJOTRJ'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHI')
+# kind, seat, column, row, draw location, flag, card, discarded card, value
+RECORD = struct.Struct('<BBbbBBbbq')
+RECORD_SIZE = RECORD.size
+RECORD_FIELDS = (('kind', 'u1'), ('seat', 'u1'), ('column', 'i1'), ('row', 'i1'), ('draw_location', 'u1'),
+                 ('flag', 'u1'), ('card', 'i1'), ('discarded', 'i1'), ('value', '<i8'))
+DEFAULT_BUFFER_SIZE = 2 ** 16
+# largest seed of the signed 64 bit value field, negative values mark games without seed
+MAX_SEED = 2 ** 63 - 1
+
+# record kinds, the fields not listed are 0
+# seat: number of players, value: seed of the game (-1 if the game was not seeded)
+GAME = 1
+# seat, column, row: flipped card, card: its value
+FLIP = 2
+# seat, column, row: target, draw_location, flag: 1 if the card is replaced, card: drawn card,
+# discarded: discarded card, value: number of the turn in the game
+MOVE = 3
+# seat, card: value of a column removed after the move before
+REMOVAL = 4
+# value: number of cards moved from the discard stack to the draw stack after the move before
+RESHUFFLE = 5
+# seat, value: final score, flag: 1 if the score was doubled
+SCORE = 6
+
+DRAW_LOCATION_CODES = {DRAW_LOCATION.DRAW_STACK: 1, DRAW_LOCATION.DISCARD_STACK: 2}
+DRAW_LOCATIONS = {code: draw_location for draw_location, code in DRAW_LOCATION_CODES.items()}
+
+
+class TrajectoryError(ValueError):
+    pass
+
+
+def check_seed(seed):
+    """
+    :raise TrajectoryError: if the seed of a game cannot be recorded
+    """
+    if seed is not None and not 0 <= seed <= MAX_SEED:
+        raise TrajectoryError('seed {} of a game is outside of the recordable range 0 to {}'.format(seed, MAX_SEED))
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Writes every decision and event of the games of a SkyjoGame (see its recorder argument) as fixed-width binary
+        records to an append-only log, which is read with TrajectoryLog.
+
+        The records are buffered and appended to the file in blocks of buffer_size bytes, so recording costs about
+        one struct.pack per event. An existing log is continued, if it was written under the same rules.
+        """
+        self.path = path
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.turn = 0
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, RULES_VERSION)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as log_file:
+                if log_file.read(HEADER.size) != header:
+                    raise TrajectoryError('{} is not a trajectory log of this version'.format(path))
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(header)
+
+    def append(self, kind, seat=0, column=0, row=0, draw_location=0, flag=0, card=0, discarded=0, value=0):
+        self.buffer += RECORD.pack(kind, seat, column, row, draw_location, flag, card, discarded, value)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def record_game(self, seed, player_count):
+        check_seed(seed)
+        self.turn = 0
+        self.append(GAME, seat=player_count, value=-1 if seed is None else seed)
+
+    def record_flips(self, seat, grid, positions):
+        for column, row in positions:
+            self.append(FLIP, seat, column, row, card=grid.get_value(column, row))
+
+    def record_turn(self, seat, record):
+        """
+        :param record: MoveRecord of the turn filled by SkyjoGame.play_turn
+        """
+        self.append(MOVE, seat, record.column, record.row, DRAW_LOCATION_CODES[record.draw_location],
+                    record.replace_card, record.drawn_card, record.discarded_card, self.turn)
+        self.turn += 1
+
+        for value in record.removed_values or ():
+            self.append(REMOVAL, seat, card=value)
+        if record.reshuffled_cards is not None:
+            self.append(RESHUFFLE, value=len(record.reshuffled_cards))
+
+    def record_scores(self, scores, player_names, doubled_player):
+        for seat, player in enumerate(player_names):
+            self.append(SCORE, seat, flag=player == doubled_player, value=scores[player])
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.file.flush()
+        del self.buffer[:]
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TrajectoryLog:
+    def __init__(self, path):
+        """
+        Read-only view of a trajectory log as NumPy structured array of its records.
+
+        The file is memory-mapped, so records and their fields (records['card'], records['value'], ...) are views on
+        the file without copying. A record cut off by an interrupted write at the end of the log is ignored.
+        """
+        # numpy is only needed to read a log, not to record one
+        import numpy as np
+
+        with open(path, 'rb') as log_file:
+            magic, format_version, record_size, rules_version = HEADER.unpack(log_file.read(HEADER.size))
+        if magic != MAGIC or format_version != FORMAT_VERSION or record_size != RECORD_SIZE:
+            raise TrajectoryError('{} is not a trajectory log of this version'.format(path))
+
+        self.path = path
+        self.rules_version = rules_version
+        record_count = (os.path.getsize(path) - HEADER.size) // RECORD_SIZE
+        if record_count > 0:
+            self.records = np.memmap(path, dtype=np.dtype(list(RECORD_FIELDS)), mode='r', offset=HEADER.size,
+                                     shape=(record_count,))
+        else:
+            self.records = np.zeros(0, dtype=np.dtype(list(RECORD_FIELDS)))
+        self.game_starts = np.flatnonzero(self.records['kind'] == GAME)
+
+    @property
+    def game_count(self):
+        return len(self.game_starts)
+
+    @property
+    def seeds(self):
+        return self.records['value'][self.game_starts]
+
+    def get_game(self, game_index):
+        """
+        :return: view of the records of the game, starting with its GAME record
+        """
+        start = self.game_starts[game_index]
+        end = self.game_starts[game_index + 1] if game_index + 1 < self.game_count else len(self.records)
+        return self.records[start:end]
+
+    def get_game_indices(self):
+        """
+        :return: array with the index of the game of every record
+        """
+        return (self.records['kind'] == GAME).cumsum() - 1
+
+
+class ReplayStrategy(Strategy):
+    def __init__(self, name):
+        """
+        Makes the decisions that GameReplay sets before every call.
+        """
+        super(ReplayStrategy, self).__init__(name)
+        self.flips = []
+        self.draw_location = None
+        self.target_location = None
+
+    def get_position_of_initial_card_flips(self):
+        return self.flips
+
+    def decide_draw_location(self, observation):
+        return self.draw_location
+
+    def get_target_location(self, observation, new_card):
+        return self.target_location
+
+
+class GameReplay:
+    def __init__(self, records):
+        """
+        Replays a recorded game move by move with the engine.
+
+        The deck and the reshuffles are recreated from the seed of the game and the recorded decisions are played by
+        ReplayStrategy players. Every recorded card, column removal, reshuffle and score is compared with the one of
+        the replay, so a game recorded under other rules raises a TrajectoryError instead of replaying differently.
+
+        :param records: records of one game, see TrajectoryLog.get_game
+        """
+        if len(records) == 0 or records[0]['kind'] != GAME:
+            raise TrajectoryError('the records do not start with a game')
+        seed = int(records[0]['value'])
+        if seed < 0:
+            raise TrajectoryError('only seeded games can be replayed')
+
+        self.records = records
+        self.strategies = [ReplayStrategy('player{}'.format(seat + 1)) for seat in range(int(records[0]['seat']))]
+        self.game = SkyjoGame(self.strategies)
+        self.game.reset(seed)
+        self.scores = None
+
+    def check(self, description, recorded, replayed):
+        if recorded != replayed:
+            raise TrajectoryError('{} differs: recorded {}, replayed {}'.format(description, recorded, replayed))
+
+    def steps(self):
+        """
+        Plays the game and yields after the initial flips and after every turn.
+
+        The final scores are checked and stored in scores after the last turn.
+
+        :return: generator of (MOVE record or None for the initial flips, SkyjoGame after the step)
+        """
+        game = self.game
+        records = self.records[1:]
+        kinds = records['kind']
+
+        flips = records[kinds == FLIP]
+        for seat, strategy in enumerate(self.strategies):
+            strategy.flips = [(int(flip['column']), int(flip['row'])) for flip in flips if flip['seat'] == seat]
+        game.flip_starting_cards()
+        for flip in flips:
+            self.check('flipped card', int(flip['card']), game.state.player_grids[self.strategies[flip['seat']].name]
+                       .get_value(int(flip['column']), int(flip['row'])))
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+        yield None, game
+
+        for index in (kinds == MOVE).nonzero()[0]:
+            move = records[index]
+            self.check('player', int(move['seat']), game.current_player_index)
+            strategy = game.current_player
+            strategy.draw_location = DRAW_LOCATIONS[int(move['draw_location'])]
+            strategy.target_location = SkyjoGameMove(int(move['column']), int(move['row']), bool(move['flag']))
+
+            record = MoveRecord()
+            game.play_turn(record)
+            self.check('drawn card', int(move['card']), record.drawn_card)
+            self.check('discarded card', int(move['discarded']), record.discarded_card)
+
+            events = []
+            for event in records[index + 1:]:
+                if event['kind'] not in (REMOVAL, RESHUFFLE):
+                    break
+                events.append(event)
+            self.check('removed columns', [int(event['card']) for event in events if event['kind'] == REMOVAL],
+                       list(record.removed_values or ()))
+            self.check('reshuffled cards', [int(event['value']) for event in events if event['kind'] == RESHUFFLE],
+                       [len(record.reshuffled_cards)] if record.reshuffled_cards is not None else [])
+
+            game.end_turn()
+            yield move, game
+
+        self.scores = game.evaluate_scores()
+        for score in records[kinds == SCORE]:
+            self.check('score', int(score['value']), self.scores[self.strategies[score['seat']].name])
+
+    def play(self):
+        """
+        Replays the whole game.
+
+        :return: final scores of the players
+        """
+        for _ in self.steps():
+            pass
+        return self.scores
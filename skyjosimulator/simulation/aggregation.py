@@ -0,0 +1,250 @@
+import math
+
+HISTOGRAM_MIN_SCORE = -30
+HISTOGRAM_BIN_WIDTH = 5
+HISTOGRAM_BIN_COUNT = 70
+
+
+class OnlineStatistic:
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        """
+        Running mean and variance of a stream of values (Welford's algorithm).
+
+        :param count: number of values
+        :param mean: mean of the values
+        :param m2: sum of the squared differences between the values and their mean
+        """
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def standard_deviation(self):
+        return math.sqrt(self.variance())
+
+    def standard_error(self):
+        if self.count == 0:
+            return 0.0
+        return math.sqrt(self.variance() / self.count)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2}
+
+    @staticmethod
+    def from_dict(data):
+        return OnlineStatistic(data['count'], data['mean'], data['m2'])
+
+
+class ScoreHistogram:
+    def __init__(self, bins=None):
+        """
+        Score counts in fixed bins of HISTOGRAM_BIN_WIDTH points starting at HISTOGRAM_MIN_SCORE.
+
+        Scores below or above the covered range are counted in the first or last bin.
+        """
+        self.bins = bins if bins is not None else [0] * HISTOGRAM_BIN_COUNT
+
+    @staticmethod
+    def get_bin_index(score):
+        bin_index = (score - HISTOGRAM_MIN_SCORE) // HISTOGRAM_BIN_WIDTH
+        return min(max(bin_index, 0), HISTOGRAM_BIN_COUNT - 1)
+
+    @staticmethod
+    def get_bin_range(bin_index):
+        lower_bound = HISTOGRAM_MIN_SCORE + bin_index * HISTOGRAM_BIN_WIDTH
+        return lower_bound, lower_bound + HISTOGRAM_BIN_WIDTH
+
+    def add(self, score):
+        self.bins[self.get_bin_index(score)] += 1
+
+    def merge(self, other):
+        for bin_index, count in enumerate(other.bins):
+            self.bins[bin_index] += count
+
+    def to_dict(self):
+        return {'bins': self.bins}
+
+    @staticmethod
+    def from_dict(data):
+        return ScoreHistogram(list(data['bins']))
+
+
+class ScoreAggregate:
+    def __init__(self, player_names):
+        """
+        Mergeable per-player statistics of a number of games that use constant memory.
+
+        Besides the exact score sums it keeps the online mean and variance of the scores, the number of sole wins and
+        of ties for the lowest score, a score histogram and how often the finisher's score was doubled. For every pair
+        of players it also keeps the online statistics of the per-game score and win differences, which are needed
+        to compare two players on the same games.
+
+        :param player_names: names of the players in seat order
+        """
+        self.player_names = list(player_names)
+        self.game_count = 0
+        self.score_sums = {player: 0 for player in self.player_names}
+        self.score_statistics = {player: OnlineStatistic() for player in self.player_names}
+        self.win_counts = {player: 0 for player in self.player_names}
+        self.tie_counts = {player: 0 for player in self.player_names}
+        self.doubled_counts = {player: 0 for player in self.player_names}
+        self.histograms = {player: ScoreHistogram() for player in self.player_names}
+        self.score_differences = self._create_pair_statistics()
+        self.win_differences = self._create_pair_statistics()
+
+    def _create_pair_statistics(self):
+        return {player: {opponent: OnlineStatistic() for opponent in self.player_names[seat + 1:]}
+                for seat, player in enumerate(self.player_names)}
+
+    def add_game(self, scores, doubled_player=None):
+        """
+        :param scores: final score of every player
+        :param doubled_player: name of the player whose score was doubled (if any)
+        """
+        self.game_count += 1
+
+        for player in scores:
+            score = scores[player]
+            self.score_sums[player] += score
+            self.score_statistics[player].add(score)
+            self.histograms[player].add(score)
+
+        lowest_score = min(scores.values())
+        winners = [player for player in scores if scores[player] == lowest_score]
+        sole_winner = None
+        if len(winners) == 1:
+            sole_winner = winners[0]
+            self.win_counts[sole_winner] += 1
+        else:
+            for player in winners:
+                self.tie_counts[player] += 1
+
+        for player, opponent_statistics in self.score_differences.items():
+            for opponent, statistic in opponent_statistics.items():
+                statistic.add(scores[player] - scores[opponent])
+                self.win_differences[player][opponent].add((player == sole_winner) - (opponent == sole_winner))
+
+        if doubled_player is not None:
+            self.doubled_counts[doubled_player] += 1
+
+    def merge(self, other):
+        self.game_count += other.game_count
+
+        for player in self.player_names:
+            self.score_sums[player] += other.score_sums[player]
+            self.score_statistics[player].merge(other.score_statistics[player])
+            self.win_counts[player] += other.win_counts[player]
+            self.tie_counts[player] += other.tie_counts[player]
+            self.doubled_counts[player] += other.doubled_counts[player]
+            self.histograms[player].merge(other.histograms[player])
+
+            for opponent in self.score_differences[player]:
+                self.score_differences[player][opponent].merge(other.score_differences[player][opponent])
+                self.win_differences[player][opponent].merge(other.win_differences[player][opponent])
+
+    def get_score_difference(self, player, opponent):
+        """
+        :return: OnlineStatistic of the per-game score of player minus the score of opponent
+        """
+        return self._get_pair_statistic(self.score_differences, player, opponent)
+
+    def get_win_difference(self, player, opponent):
+        """
+        :return: OnlineStatistic of the per-game win indicator of player minus the one of opponent
+        """
+        return self._get_pair_statistic(self.win_differences, player, opponent)
+
+    @staticmethod
+    def _get_pair_statistic(pair_statistics, player, opponent):
+        if opponent in pair_statistics[player]:
+            return pair_statistics[player][opponent]
+
+        statistic = pair_statistics[opponent][player]
+        return OnlineStatistic(statistic.count, -statistic.mean, statistic.m2)
+
+    def _per_game(self, value):
+        # the statistics of an empty aggregate are undefined
+        return value / self.game_count if self.game_count else math.nan
+
+    def average_scores(self):
+        return {player: self._per_game(self.score_sums[player]) for player in self.player_names}
+
+    def summarize(self):
+        """
+        :return: dict mapping each player name to the main statistics of its scores
+        """
+        summary = dict()
+        for player in self.player_names:
+            statistic = self.score_statistics[player]
+            summary[player] = {
+                'mean': self._per_game(self.score_sums[player]),
+                'standard_deviation': statistic.standard_deviation(),
+                'standard_error': statistic.standard_error(),
+                'win_rate': self._per_game(self.win_counts[player]),
+                'tie_rate': self._per_game(self.tie_counts[player]),
+                'doubled_rate': self._per_game(self.doubled_counts[player]),
+            }
+        return summary
+
+    def to_dict(self):
+        return {
+            'player_names': self.player_names,
+            'game_count': self.game_count,
+            'score_sums': self.score_sums,
+            'score_statistics': {player: statistic.to_dict()
+                                 for player, statistic in self.score_statistics.items()},
+            'win_counts': self.win_counts,
+            'tie_counts': self.tie_counts,
+            'doubled_counts': self.doubled_counts,
+            'histograms': {player: histogram.to_dict() for player, histogram in self.histograms.items()},
+            'score_differences': self._pair_statistics_to_dict(self.score_differences),
+            'win_differences': self._pair_statistics_to_dict(self.win_differences),
+        }
+
+    @staticmethod
+    def _pair_statistics_to_dict(pair_statistics):
+        return {player: {opponent: statistic.to_dict() for opponent, statistic in opponent_statistics.items()}
+                for player, opponent_statistics in pair_statistics.items()}
+
+    @staticmethod
+    def _pair_statistics_from_dict(data):
+        return {player: {opponent: OnlineStatistic.from_dict(statistic)
+                         for opponent, statistic in opponent_statistics.items()}
+                for player, opponent_statistics in data.items()}
+
+    @staticmethod
+    def from_dict(data):
+        aggregate = ScoreAggregate(data['player_names'])
+        aggregate.game_count = data['game_count']
+        aggregate.score_sums.update(data['score_sums'])
+        aggregate.win_counts.update(data['win_counts'])
+        aggregate.tie_counts.update(data['tie_counts'])
+        aggregate.doubled_counts.update(data['doubled_counts'])
+
+        for player in aggregate.player_names:
+            aggregate.score_statistics[player] = OnlineStatistic.from_dict(data['score_statistics'][player])
+            aggregate.histograms[player] = ScoreHistogram.from_dict(data['histograms'][player])
+
+        aggregate.score_differences = ScoreAggregate._pair_statistics_from_dict(data['score_differences'])
+        aggregate.win_differences = ScoreAggregate._pair_statistics_from_dict(data['win_differences'])
+        return aggregate
@@ -0,0 +1,155 @@
+import random
+
+import numpy as np
+
+from skyjosimulator.game.batch import BatchSkyjoGame
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.simulation.aggregation import HISTOGRAM_BIN_COUNT, HISTOGRAM_BIN_WIDTH, HISTOGRAM_MIN_SCORE, \
+    OnlineStatistic, ScoreAggregate, ScoreHistogram
+from skyjosimulator.simulation.runner import create_player_configs, derive_game_seed, get_player_names
+from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.batch import BATCH_STRATEGIES
+
+DEFAULT_BATCH_SIZE = 50000
+
+# coefficient of the two-sample Kolmogorov-Smirnov critical value for a significance level of 0.001
+KS_CRITICAL_COEFFICIENT = 1.95
+
+
+def play_batches(strategy_keys, game_count, seed=0, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Plays game_count games with the vectorized engine, batch_size games at a time.
+
+    :param strategy_keys: keys of BATCH_STRATEGIES in seat order
+    :return: generator of the finished BatchSkyjoGame of every batch and its scores
+    """
+    rng = np.random.default_rng(seed)
+
+    for first_game in range(0, game_count, batch_size):
+        game = BatchSkyjoGame([BATCH_STRATEGIES[strategy_key]() for strategy_key in strategy_keys],
+                              min(batch_size, game_count - first_game), rng)
+        game.prepare_game()
+        yield game, game.start()
+
+
+def run_batch_simulation(strategy_keys, game_count, seed=0, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    :return: array of shape (game_count, players) with the final scores
+    """
+    return np.concatenate([scores for _, scores in play_batches(strategy_keys, game_count, seed, batch_size)])
+
+
+def aggregate_batch_simulation(strategy_keys, game_count, seed=0, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Plays games with the vectorized engine and only keeps the aggregate, so the memory does not grow with
+    game_count.
+
+    :return: ScoreAggregate of all games
+    """
+    player_names = get_player_names(create_player_configs(strategy_keys))
+    aggregate = ScoreAggregate(player_names)
+
+    for game, scores in play_batches(strategy_keys, game_count, seed, batch_size):
+        aggregate.merge(create_score_aggregate(player_names, scores, game.doubled_player))
+
+    return aggregate
+
+
+def create_score_aggregate(player_names, scores, doubled_player=None):
+    """
+    Creates the ScoreAggregate of a table of scores with vectorized operations.
+
+    :param scores: array of shape (games, players)
+    :param doubled_player: optional array with the seat of the player whose score was doubled (-1 for none)
+    """
+    aggregate = ScoreAggregate(player_names)
+    aggregate.game_count = len(scores)
+
+    is_lowest = scores == scores.min(axis=1, keepdims=True)
+    is_sole_lowest = is_lowest.sum(axis=1, keepdims=True) == 1
+    histogram_bins = np.clip((scores - HISTOGRAM_MIN_SCORE) // HISTOGRAM_BIN_WIDTH, 0, HISTOGRAM_BIN_COUNT - 1)
+
+    for seat, player in enumerate(player_names):
+        aggregate.score_sums[player] = int(scores[:, seat].sum())
+        aggregate.score_statistics[player] = create_online_statistic(scores[:, seat])
+        aggregate.win_counts[player] = int((is_lowest[:, seat] & is_sole_lowest[:, 0]).sum())
+        aggregate.tie_counts[player] = int((is_lowest[:, seat] & ~is_sole_lowest[:, 0]).sum())
+        aggregate.histograms[player] = ScoreHistogram(
+            np.bincount(histogram_bins[:, seat], minlength=HISTOGRAM_BIN_COUNT).tolist())
+
+        if doubled_player is not None:
+            aggregate.doubled_counts[player] = int((doubled_player == seat).sum())
+
+    sole_wins = (is_lowest & is_sole_lowest).astype(np.int64)
+    for seat, player in enumerate(player_names):
+        for opponent_seat in range(seat + 1, len(player_names)):
+            opponent = player_names[opponent_seat]
+            aggregate.score_differences[player][opponent] = create_online_statistic(
+                scores[:, seat] - scores[:, opponent_seat])
+            aggregate.win_differences[player][opponent] = create_online_statistic(
+                sole_wins[:, seat] - sole_wins[:, opponent_seat])
+
+    return aggregate
+
+
+def create_online_statistic(values):
+    if len(values) == 0:
+        return OnlineStatistic()
+
+    mean = float(values.mean())
+    return OnlineStatistic(len(values), mean, float(((values - mean) ** 2).sum()))
+
+
+def play_object_engine_games(strategy_keys, game_count, seed=0):
+    """
+    Plays games with SkyjoGame and returns the scores in the same layout as run_batch_simulation.
+    """
+    player_configs = create_player_configs(strategy_keys)
+    scores = np.zeros((game_count, len(player_configs)), dtype=np.int64)
+
+    for game_index in range(game_count):
+        random.seed(derive_game_seed(seed, game_index))
+        game = SkyjoGame([create_strategy(player_name, strategy_key)
+                          for player_name, strategy_key in player_configs])
+        game.prepare_game()
+        result = game.start()
+        scores[game_index] = [result[player_name] for player_name in get_player_names(player_configs)]
+
+    return scores
+
+
+def calculate_ks_statistic(sample1, sample2):
+    values = np.union1d(sample1, sample2)
+    cdf1 = np.searchsorted(np.sort(sample1), values, side='right') / len(sample1)
+    cdf2 = np.searchsorted(np.sort(sample2), values, side='right') / len(sample2)
+    return float(np.abs(cdf1 - cdf2).max())
+
+
+def cross_check(strategy_keys, game_count, seed=0):
+    """
+    Compares the score distributions of the vectorized engine with the ones of SkyjoGame.
+
+    Both engines play game_count games with the given strategies. For every player the means, the standard
+    deviations and the two-sample Kolmogorov-Smirnov statistic of the scores are reported. The distributions are
+    considered consistent if the statistic stays below the critical value for a significance level of 0.001.
+
+    :return: dict mapping each player name to a dict with the comparison
+    """
+    batch_scores = run_batch_simulation(strategy_keys, game_count, seed)
+    object_scores = play_object_engine_games(strategy_keys, game_count, seed)
+    critical_value = KS_CRITICAL_COEFFICIENT * np.sqrt(2.0 / game_count)
+
+    report = dict()
+    for seat, player in enumerate(get_player_names(create_player_configs(strategy_keys))):
+        ks_statistic = calculate_ks_statistic(batch_scores[:, seat], object_scores[:, seat])
+        report[player] = {
+            'batch_mean': float(batch_scores[:, seat].mean()),
+            'object_mean': float(object_scores[:, seat].mean()),
+            'batch_std': float(batch_scores[:, seat].std()),
+            'object_std': float(object_scores[:, seat].std()),
+            'ks_statistic': ks_statistic,
+            'ks_critical_value': float(critical_value),
+            'consistent': bool(ks_statistic < critical_value),
+        }
+
+    return report
@@ -0,0 +1,162 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from skyjosimulator import RULES_VERSION
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.runner import describe_players, get_player_names, play_games
+
+DEFAULT_SHARD_SIZE = 1000
+DEFAULT_CHECKPOINT_INTERVAL = 30.0
+
+
+def get_shard_range(shard_index, shard_size, game_count):
+    """
+    :return: (first_game, game_count) of the shard, shards are addressed by the indices of their games
+    """
+    first_game = shard_index * shard_size
+    return first_game, min(shard_size, game_count - first_game)
+
+
+def get_shard_count(shard_size, game_count):
+    return (game_count + shard_size - 1) // shard_size
+
+
+class Checkpoint:
+    def __init__(self, path, player_configs, master_seed, shard_size, game_count):
+        """
+        Completed shard aggregates of a sharded simulation, persisted in a json file.
+
+        A checkpoint only belongs to a simulation with the same rules, players, master seed and shard size. Since the
+        games of a shard only depend on these, finished shards can be reused by a run of that simulation with at least
+        as many games, so an interrupted or shorter run can be continued. A checkpoint of a run with more games is
+        rejected.
+        """
+        self.path = path
+        self.game_count = game_count
+        self.header = {
+            'rules_version': RULES_VERSION,
+            'player_configs': [list(player_config) for player_config in player_configs],
+            'master_seed': master_seed,
+            'shard_size': shard_size,
+        }
+        self.shards = dict()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+
+        with open(self.path) as checkpoint_file:
+            data = json.load(checkpoint_file)
+
+        if data['header'] != self.header:
+            raise ValueError('checkpoint {} belongs to a different simulation'.format(self.path))
+
+        shards = {int(shard_index): ScoreAggregate.from_dict(aggregate)
+                  for shard_index, aggregate in data['shards'].items()}
+        shard_size = self.header['shard_size']
+        for shard_index, aggregate in shards.items():
+            if (shard_index >= get_shard_count(shard_size, self.game_count)
+                    or aggregate.game_count > get_shard_range(shard_index, shard_size, self.game_count)[1]):
+                raise ValueError('checkpoint {} belongs to a simulation with more than {} games'.format(
+                    self.path, self.game_count))
+        self.shards = shards
+
+    def save(self):
+        if self.path is None:
+            return
+
+        data = {
+            'header': self.header,
+            'shards': {str(shard_index): aggregate.to_dict() for shard_index, aggregate in self.shards.items()},
+        }
+
+        # write to a temporary file first, so an interrupted write never destroys the previous checkpoint
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(data, checkpoint_file)
+        os.replace(temporary_path, self.path)
+
+    def is_complete(self, shard_index, game_count):
+        shard = self.shards.get(shard_index)
+        return shard is not None and shard.game_count == game_count
+
+
+def run_sharded_simulation(player_configs, game_count, master_seed=0, shard_size=DEFAULT_SHARD_SIZE,
+                           checkpoint_path=None, workers=None, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+                           result_cache=None):
+    """
+    Plays game_count games in shards of shard_size games and periodically saves the finished shards.
+
+    Shards that are already complete in the checkpoint or the result cache are skipped. The shard aggregates are
+    merged in shard order, so a resumed run gives the same result as an uninterrupted one.
+
+    :param checkpoint_path: json file the finished shards are written to (None disables checkpointing)
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :param checkpoint_interval: minimum number of seconds between two checkpoint writes
+    :param result_cache: optional ResultCache to take finished shards from and to add the played shards to
+    :return: ScoreAggregate of all games
+    """
+    checkpoint = Checkpoint(checkpoint_path, player_configs, master_seed, shard_size, game_count)
+    checkpoint.load()
+
+    shard_count = get_shard_count(shard_size, game_count)
+    missing_shards = [shard_index for shard_index in range(shard_count)
+                      if not checkpoint.is_complete(shard_index, get_shard_range(shard_index, shard_size,
+                                                                                 game_count)[1])]
+
+    players = describe_players(player_configs) if result_cache is not None else None
+    if players is not None:
+        for shard_index in list(missing_shards):
+            aggregate = result_cache.get(players, master_seed, *get_shard_range(shard_index, shard_size, game_count))
+            if aggregate is not None:
+                checkpoint.shards[shard_index] = aggregate
+                missing_shards.remove(shard_index)
+
+    workers = workers or os.cpu_count()
+    last_save = time.monotonic()
+
+    try:
+        for shard_index, aggregate in play_shards(player_configs, missing_shards, shard_size, game_count,
+                                                  master_seed, workers):
+            checkpoint.shards[shard_index] = aggregate
+            if players is not None:
+                result_cache.put(players, master_seed, *get_shard_range(shard_index, shard_size, game_count),
+                                 aggregate=aggregate)
+
+            if time.monotonic() - last_save >= checkpoint_interval:
+                checkpoint.save()
+                last_save = time.monotonic()
+    finally:
+        checkpoint.save()
+
+    result = ScoreAggregate(get_player_names(player_configs))
+    for shard_index in range(shard_count):
+        result.merge(checkpoint.shards[shard_index])
+    return result
+
+
+def play_shards(player_configs, shard_indices, shard_size, game_count, master_seed, workers):
+    """
+    Generates (shard_index, aggregate) tuples in the order the shards are finished.
+    """
+    if workers == 1:
+        for shard_index in shard_indices:
+            first_game, shard_game_count = get_shard_range(shard_index, shard_size, game_count)
+            yield shard_index, play_games(player_configs, first_game, shard_game_count, master_seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = dict()
+        for shard_index in shard_indices:
+            first_game, shard_game_count = get_shard_range(shard_index, shard_size, game_count)
+            future = executor.submit(play_games, player_configs, first_game, shard_game_count, master_seed)
+            futures[future] = shard_index
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
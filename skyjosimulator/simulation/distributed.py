@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.checkpoint import (DEFAULT_CHECKPOINT_INTERVAL, DEFAULT_SHARD_SIZE, Checkpoint,
+                                                  get_shard_count, get_shard_range)
+from skyjosimulator.simulation.runner import get_player_names, play_games
+
+DEFAULT_PORT = 6017
+DEFAULT_LEASE_TIMEOUT = 600.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_CONNECT_TIMEOUT = 30.0
+AUTHKEY_VARIABLE = 'SKYJO_AUTHKEY'
+
+
+def get_authkey(authkey=None):
+    """
+    The connections exchange pickled messages, so both sides have to authenticate with a shared key.
+
+    :param authkey: key as str or bytes, read from the environment variable SKYJO_AUTHKEY if None
+    """
+    if authkey is None:
+        authkey = os.environ.get(AUTHKEY_VARIABLE)
+    if not authkey:
+        raise ValueError('an authentication key is required, set {}'.format(AUTHKEY_VARIABLE))
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def parse_address(address):
+    """
+    :param address: 'host:port' string
+    :return: (host, port) tuple
+    """
+    host, _, port = address.rpartition(':')
+    return host or 'localhost', int(port)
+
+
+class Coordinator:
+    def __init__(self, player_configs, game_count, master_seed=0, shard_size=DEFAULT_SHARD_SIZE,
+                 address=('localhost', DEFAULT_PORT), authkey=None, lease_timeout=DEFAULT_LEASE_TIMEOUT,
+                 poll_interval=DEFAULT_POLL_INTERVAL, checkpoint_path=None,
+                 checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Hands out the shards of a sharded simulation to workers that connect over a socket.
+
+        A worker leases one shard at a time. The shard is handed out again if the connection to the worker is lost
+        or the worker does not send the aggregate within lease_timeout seconds. Since the games of a shard only
+        depend on the players, the master seed and the shard range, a shard gives the same aggregate on every worker,
+        and the first aggregate of a shard that arrives is kept.
+
+        The listener is opened right away, so workers can connect before run is called.
+
+        :param address: (host, port) to listen on, port 0 picks a free port (see self.address)
+        :param authkey: shared key of the coordinator and the workers (see get_authkey)
+        :param checkpoint_path: optional json file for finished shards, compatible with run_sharded_simulation
+        """
+        self.player_configs = [tuple(player_config) for player_config in player_configs]
+        self.game_count = game_count
+        self.master_seed = master_seed
+        self.shard_size = shard_size
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.checkpoint_interval = checkpoint_interval
+
+        self.checkpoint = Checkpoint(checkpoint_path, player_configs, master_seed, shard_size, game_count)
+        self.checkpoint.load()
+        self.shard_count = get_shard_count(shard_size, game_count)
+        self.pending_shards = deque(shard_index for shard_index in range(self.shard_count)
+                                    if not self.is_shard_complete(shard_index))
+        # shard index -> (connection of the worker, deadline of the lease)
+        self.leases = dict()
+        self.reassigned_count = 0
+        self.last_save = time.monotonic()
+        self.condition = threading.Condition()
+
+        self.listener = Listener(address, authkey=get_authkey(authkey))
+        self.address = self.listener.address
+        self.closed = False
+
+    def get_game_count(self, shard_index):
+        return get_shard_range(shard_index, self.shard_size, self.game_count)[1]
+
+    def is_shard_complete(self, shard_index):
+        return self.checkpoint.is_complete(shard_index, self.get_game_count(shard_index))
+
+    def is_finished(self):
+        return all(self.is_shard_complete(shard_index) for shard_index in range(self.shard_count))
+
+    def run(self):
+        """
+        Serves the shards until all of them are finished.
+
+        :return: ScoreAggregate of all games, merged in shard order like run_sharded_simulation
+        """
+        threading.Thread(target=self.accept_workers, daemon=True).start()
+
+        try:
+            with self.condition:
+                while not self.is_finished():
+                    self.condition.wait(self.poll_interval)
+                    self.expire_leases()
+        finally:
+            self.close()
+            self.checkpoint.save()
+
+        result = ScoreAggregate(get_player_names(self.player_configs))
+        for shard_index in range(self.shard_count):
+            result.merge(self.checkpoint.shards[shard_index])
+        return result
+
+    def close(self):
+        self.closed = True
+        self.listener.close()
+
+    def accept_workers(self):
+        while not self.closed:
+            try:
+                connection = self.listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                # the listener has been closed
+                break
+            threading.Thread(target=self.serve_worker, args=(connection,), daemon=True).start()
+
+    def serve_worker(self, connection):
+        """
+        Answers the messages of a worker: ('request',) asks for a shard, ('result', shard_index, aggregate) returns
+        the aggregate of a shard as dict and asks for the next one.
+        """
+        try:
+            while True:
+                message = connection.recv()
+                if message[0] == 'result':
+                    self.complete_shard(message[1], ScoreAggregate.from_dict(message[2]))
+                connection.send(self.assign_shard(connection))
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.release_shards(connection)
+            connection.close()
+
+    def assign_shard(self, connection):
+        """
+        :return: ('shard', shard_index, player_configs, first_game, game_count, master_seed) if a shard is pending,
+                 ('wait', seconds) if all unfinished shards are leased and ('done',) if all shards are finished
+        """
+        with self.condition:
+            if self.pending_shards:
+                shard_index = self.pending_shards.popleft()
+                self.leases[shard_index] = (connection, time.monotonic() + self.lease_timeout)
+                first_game, game_count = get_shard_range(shard_index, self.shard_size, self.game_count)
+                return 'shard', shard_index, self.player_configs, first_game, game_count, self.master_seed
+
+            if self.is_finished():
+                return 'done',
+            return 'wait', self.poll_interval
+
+    def complete_shard(self, shard_index, aggregate):
+        with self.condition:
+            self.leases.pop(shard_index, None)
+            if self.is_shard_complete(shard_index):
+                return
+
+            # replaces a partial shard of a shorter run from the checkpoint
+            self.checkpoint.shards[shard_index] = aggregate
+            if shard_index in self.pending_shards:
+                # the lease had expired, but the aggregate arrived before the shard was handed out again
+                self.pending_shards.remove(shard_index)
+
+            if time.monotonic() - self.last_save >= self.checkpoint_interval:
+                self.checkpoint.save()
+                self.last_save = time.monotonic()
+
+            self.condition.notify_all()
+
+    def release_shards(self, connection):
+        """
+        Hands out the shards leased by a worker again, once its connection is lost.
+        """
+        with self.condition:
+            for shard_index, (owner, _) in list(self.leases.items()):
+                if owner is connection:
+                    self._requeue(shard_index)
+
+    def expire_leases(self):
+        now = time.monotonic()
+        for shard_index, (_, deadline) in list(self.leases.items()):
+            if deadline <= now:
+                self._requeue(shard_index)
+
+    def _requeue(self, shard_index):
+        del self.leases[shard_index]
+        self.pending_shards.appendleft(shard_index)
+        self.reassigned_count += 1
+
+
+def connect(address, authkey=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """
+    Connects to a coordinator, retrying until connect_timeout seconds have passed.
+    """
+    authkey = get_authkey(authkey)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(DEFAULT_POLL_INTERVAL)
+
+
+def run_worker(address, authkey=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """
+    Plays the shards a coordinator hands out until the coordinator is done or disappears.
+
+    :return: number of shards played
+    """
+    played_shards = 0
+    with connect(address, authkey, connect_timeout) as connection:
+        try:
+            connection.send(('request',))
+            while True:
+                message = connection.recv()
+                if message[0] == 'done':
+                    break
+                if message[0] == 'wait':
+                    time.sleep(message[1])
+                    connection.send(('request',))
+                    continue
+
+                _, shard_index, player_configs, first_game, game_count, master_seed = message
+                aggregate = play_games(player_configs, first_game, game_count, master_seed)
+                connection.send(('result', shard_index, aggregate.to_dict()))
+                played_shards += 1
+        except (EOFError, OSError):
+            pass
+    return played_shards
+
+
+def start_workers(address, worker_count, authkey=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """
+    Starts worker_count worker processes on this host.
+
+    :return: list of the started processes
+    """
+    authkey = get_authkey(authkey)
+    processes = [Process(target=run_worker, args=(address, authkey, connect_timeout), daemon=True)
+                 for _ in range(worker_count)]
+    for process in processes:
+        process.start()
+    return processes
+
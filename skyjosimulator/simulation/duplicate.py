@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.runner import derive_game_seed, get_player_names, split_into_chunks
+from skyjosimulator.strategy import create_strategy
+
+
+def create_rotations(player_configs):
+    """
+    :return: list of the seatings of the players, in which every player takes every seat once
+    """
+    player_configs = list(player_configs)
+    return [player_configs[rotation:] + player_configs[:rotation] for rotation in range(len(player_configs))]
+
+
+class DuplicateResult:
+    def __init__(self, player_names):
+        """
+        Results of duplicate deals, where every deck is played once for every rotation of the seats.
+
+        games aggregates every single game. deals aggregates one entry per deal with the total score of every player
+        over all rotations of the deal, so its score differences are the paired per-deal differences of the
+        players, in which the luck of the deal cancels out.
+        """
+        self.player_names = list(player_names)
+        self.rotation_count = len(self.player_names)
+        self.games = ScoreAggregate(self.player_names)
+        self.deals = ScoreAggregate(self.player_names)
+
+    @property
+    def deal_count(self):
+        return self.deals.game_count
+
+    def merge(self, other):
+        self.games.merge(other.games)
+        self.deals.merge(other.deals)
+
+    def get_difference(self, player, opponent, alpha=0.05):
+        """
+        :return: (mean score difference per game player minus opponent, half width of its confidence interval), both
+                 based on the per-deal differences
+        """
+        statistic = self.deals.get_score_difference(player, opponent)
+        critical_value = NormalDist().inv_cdf(1 - alpha / 2)
+        return (statistic.mean / self.rotation_count,
+                critical_value * statistic.standard_error() / self.rotation_count)
+
+    def get_variance_reduction(self, player, opponent):
+        """
+        :return: factor by which comparing the players on independent games, where the scores of the two players come
+                 from different deals, needs more games than the duplicate deals for a confidence interval of the same
+                 width, None if the per-deal differences do not vary. It can be below 1, since the scores of the
+                 players within a game are negatively correlated.
+        """
+        # the scores of unpaired games are independent, so the variance of their difference is the sum of the variances
+        unpaired_variance = (self.games.score_statistics[player].variance()
+                             + self.games.score_statistics[opponent].variance())
+        deal_variance = self.deals.get_score_difference(player, opponent).variance()
+        if deal_variance == 0:
+            return None
+        # a deal consists of rotation_count games and its difference is rotation_count times the per-game difference
+        return unpaired_variance * self.rotation_count / deal_variance
+
+    def create_report(self, alpha=0.05):
+        lines = ['{} deals, {} games'.format(self.deal_count, self.games.game_count)]
+        average_scores = self.games.average_scores()
+        for player in self.player_names:
+            lines.append('{}: mean score {:.2f}, deal win rate {:.1%}'.format(
+                player, average_scores[player], self.deals.win_counts[player] / self.deal_count))
+
+        for seat, player in enumerate(self.player_names):
+            for opponent in self.player_names[seat + 1:]:
+                difference, half_width = self.get_difference(player, opponent, alpha)
+                variance_reduction = self.get_variance_reduction(player, opponent)
+                lines.append('{} - {}: {:+.2f} +- {:.2f} per game, unpaired games need {} the games'.format(
+                    player, opponent, difference, half_width,
+                    '{:.2f}x'.format(variance_reduction) if variance_reduction is not None else 'any number of'))
+
+        return '\n'.join(lines)
+
+
+def play_duplicate_deals(player_configs, first_deal, deal_count, master_seed):
+    """
+    Plays the deals with the indices first_deal, ..., first_deal + deal_count - 1 in every rotation of the seats.
+
+    All rotations of a deal are seeded with the same seed, so they play the same deck and the same reshuffles, and
+    the cards of every seat are the same in all rotations.
+
+    :param player_configs: list of (player_name, strategy_key) tuples in the seat order of the first rotation
+    :return: DuplicateResult
+    """
+    result = DuplicateResult(get_player_names(player_configs))
+    games = [SkyjoGame([create_strategy(player_name, strategy_key) for player_name, strategy_key in seating],
+                       aggregate=result.games)
+             for seating in create_rotations(player_configs)]
+
+    try:
+        for deal_index in range(first_deal, first_deal + deal_count):
+            seed = derive_game_seed(master_seed, deal_index)
+            total_scores = dict.fromkeys(result.player_names, 0)
+            for game in games:
+                game.reset(seed=seed)
+                for player, score in game.start().items():
+                    total_scores[player] += score
+            result.deals.add_game(total_scores)
+    finally:
+        for game in games:
+            for strategy in game.player_strategies:
+                strategy.close()
+
+    return result
+
+
+def run_duplicate_simulation(player_configs, deal_count, master_seed=0, workers=None):
+    """
+    Plays deal_count duplicate deals spread across a pool of worker processes.
+
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :return: DuplicateResult, which does not depend on the number of workers
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return play_duplicate_deals(player_configs, 0, deal_count, master_seed)
+
+    result = DuplicateResult(get_player_names(player_configs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_duplicate_deals, player_configs, chunk_start, chunk_size, master_seed)
+                   for chunk_start, chunk_size in split_into_chunks(0, deal_count, workers)]
+        for future in futures:
+            result.merge(future.result())
+
+    return result
@@ -0,0 +1,104 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.runner import get_player_names, run_simulation
+
+METRICS = ('score', 'win_rate')
+MIN_GAMES = 30
+
+
+class ComparisonResult:
+    def __init__(self, player, opponent, metric, aggregate, difference, half_width, stop_reason):
+        """
+        Result of a sequential comparison of two players.
+
+        :param difference: mean per-game difference of the metric (player minus opponent)
+        :param half_width: half width of the confidence interval of the difference
+        :param stop_reason: 'significant', 'precision' or 'budget'
+        """
+        self.player = player
+        self.opponent = opponent
+        self.metric = metric
+        self.aggregate = aggregate
+        self.difference = difference
+        self.half_width = half_width
+        self.stop_reason = stop_reason
+
+    @property
+    def game_count(self):
+        return self.aggregate.game_count
+
+    @property
+    def confidence_interval(self):
+        return self.difference - self.half_width, self.difference + self.half_width
+
+    def is_significant(self):
+        return abs(self.difference) > self.half_width
+
+
+def get_critical_value(alpha, look_count):
+    """
+    Two-sided critical value of the normal distribution, Bonferroni corrected for the number of interim looks, so
+    the overall error rate stays below alpha although the interval is checked after every batch.
+    """
+    return NormalDist().inv_cdf(1 - alpha / (2 * look_count))
+
+
+def compare_until_separated(player_configs, player, opponent, metric='score', alpha=0.05, precision=None,
+                            batch_size=1000, max_games=100000, master_seed=0, workers=None):
+    """
+    Plays batches of games until the difference between two players is statistically clear.
+
+    After every batch a confidence interval of the mean per-game difference (player minus opponent) of the score or
+    of the win indicator is computed. Without a precision the comparison stops as soon as the interval excludes
+    zero, with a precision it stops once the half width of the interval is at most precision. It always stops after
+    max_games games.
+
+    :param player_configs: list of (player_name, strategy_key) tuples in seat order
+    :param metric: 'score' or 'win_rate'
+    :param alpha: significance level of the whole sequential test
+    :param precision: optional target half width of the confidence interval
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :return: ComparisonResult
+    """
+    if metric not in METRICS:
+        raise ValueError('unknown metric {}'.format(metric))
+
+    look_count = math.ceil(max_games / batch_size)
+    critical_value = get_critical_value(alpha, look_count)
+    aggregate = ScoreAggregate(get_player_names(player_configs))
+    workers = workers or os.cpu_count()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        while True:
+            game_count = min(batch_size, max_games - aggregate.game_count)
+            aggregate.merge(run_simulation(player_configs, game_count, master_seed, workers,
+                                           first_game=aggregate.game_count, executor=executor))
+
+            if metric == 'score':
+                statistic = aggregate.get_score_difference(player, opponent)
+            else:
+                statistic = aggregate.get_win_difference(player, opponent)
+
+            half_width = critical_value * statistic.standard_error()
+            enough_games = aggregate.game_count >= MIN_GAMES
+            stop_reason = None
+
+            if enough_games and precision is None and abs(statistic.mean) > half_width:
+                stop_reason = 'significant'
+            elif enough_games and precision is not None and half_width <= precision:
+                stop_reason = 'precision'
+            elif aggregate.game_count >= max_games:
+                stop_reason = 'budget'
+
+            if stop_reason is not None:
+                return ComparisonResult(player, opponent, metric, aggregate, statistic.mean, half_width,
+                                        stop_reason)
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,261 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from skyjosimulator import CARD_FREQUENCIES, DRAW_LOCATION, RULES_VERSION
+from skyjosimulator.game.logic import GRID_SIZE, SkyjoGame
+from skyjosimulator.simulation.runner import derive_game_seed
+from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.strategies import Strategy
+
+DEFAULT_SHARD_SIZE = 2 ** 16
+DEFAULT_GAMES_PER_JOB = 100
+# results of at most this many jobs per worker are waiting to be written, so the workers only run ahead of the
+# writer by this much
+JOBS_IN_FLIGHT_PER_WORKER = 2
+MANIFEST_NAME = 'manifest.json'
+
+# feature values of grid slots without a visible card and of the drawn card of draw decisions, they are outside of
+# the card values
+HIDDEN_CARD = max(CARD_FREQUENCIES) + 1
+REMOVED_CARD = max(CARD_FREQUENCIES) + 2
+NO_CARD = max(CARD_FREQUENCIES) + 3
+
+DRAW_DECISION = 0
+TARGET_DECISION = 1
+# fields of the action of a sample, -1 if the field does not belong to the decision
+ACTION_FIELDS = ('draw_location', 'column', 'row', 'replace_card')
+DRAW_LOCATION_CODES = {DRAW_LOCATION.DRAW_STACK: 0, DRAW_LOCATION.DISCARD_STACK: 1}
+
+
+def get_feature_names(player_count):
+    """
+    :return: names of the features of an encoded observation, see encode_observation
+    """
+    names = []
+    for seat in range(player_count):
+        names += ['grid{}_{}_{}'.format(seat, slot // 3, slot % 3) for slot in range(GRID_SIZE)]
+    names += ['discard_top', 'drawn_card']
+    names += ['seen_count_{}'.format(value) for value in sorted(CARD_FREQUENCIES)]
+    names += ['draw_stack_size', 'last_round', 'finishing_seat']
+    return names
+
+
+def encode_observation(observation, new_card=None):
+    """
+    Encodes the observation a strategy receives into a list of ints.
+
+    The grids start with the own grid, followed by the grids of the other players in turn order. Every grid takes
+    GRID_SIZE slots in column-major order of its remaining columns (the columns addressed by SkyjoGameMove), hidden
+    cards are HIDDEN_CARD and the slots of removed columns at the end REMOVED_CARD. The finishing seat is relative to
+    the player like the grids, -1 before the last round.
+
+    :param new_card: drawn card for target decisions, None for draw decisions
+    """
+    player_names = observation.player_names
+    seat = player_names.index(observation.player)
+    ordered_players = player_names[seat:] + player_names[:seat]
+
+    features = []
+    for player in ordered_players:
+        columns = observation.get_grid(player).to_list()
+        for column in columns:
+            for value in column:
+                features.append(HIDDEN_CARD if value is None else value)
+        features += [REMOVED_CARD] * (GRID_SIZE - 3 * len(columns))
+
+    features.append(observation.get_discard_top())
+    features.append(NO_CARD if new_card is None else new_card)
+    features += observation.get_seen_counts()
+    features.append(observation.get_draw_stack_size())
+    features.append(observation.last_round)
+    features.append(-1 if observation.finishing_player is None
+                    else ordered_players.index(observation.finishing_player))
+    return features
+
+
+class SampleCollector(Strategy):
+    def __init__(self, strategy, seat, samples):
+        """
+        Wraps a strategy and appends a sample (encoded observation, decision, action, seat) of every decision it makes
+        to samples. The initial flips are not sampled.
+        """
+        super(SampleCollector, self).__init__(strategy.name)
+        self.strategy = strategy
+        self.seat = seat
+        self.samples = samples
+
+    def get_position_of_initial_card_flips(self):
+        return self.strategy.get_position_of_initial_card_flips()
+
+    def decide_draw_location(self, observation):
+        draw_location = self.strategy.decide_draw_location(observation)
+        self.samples.append((encode_observation(observation), DRAW_DECISION,
+                             (DRAW_LOCATION_CODES[draw_location], -1, -1, -1), self.seat))
+        return draw_location
+
+    def get_target_location(self, observation, new_card):
+        target_location = self.strategy.get_target_location(observation, new_card)
+        self.samples.append((encode_observation(observation, new_card), TARGET_DECISION,
+                             (-1, target_location.column, target_location.row, int(target_location.replace_card)),
+                             self.seat))
+        return target_location
+
+    def close(self):
+        self.strategy.close()
+
+
+def collect_samples(player_configs, first_game, game_count, master_seed):
+    """
+    Plays the games like play_games and returns the samples of all decisions.
+
+    :return: dict of the sample arrays: observations (encoded observation per sample), decisions (DRAW_DECISION or
+             TARGET_DECISION), actions (ACTION_FIELDS), seats (seat of the deciding player), scores (final scores of
+             all players, ordered like the grids of the observation) and games (index of the game)
+    """
+    player_count = len(player_configs)
+    samples = []
+    strategies = [SampleCollector(create_strategy(player_name, strategy_key), seat, samples)
+                  for seat, (player_name, strategy_key) in enumerate(player_configs)]
+    game = SkyjoGame(strategies)
+
+    observations = []
+    decisions = []
+    actions = []
+    seats = []
+    scores = []
+    games = []
+    try:
+        for game_index in range(first_game, first_game + game_count):
+            game.reset(seed=derive_game_seed(master_seed, game_index))
+            final_scores = game.start()
+            seat_scores = [final_scores[player_name] for player_name, _ in player_configs]
+
+            for features, decision, action, seat in samples:
+                observations.append(features)
+                decisions.append(decision)
+                actions.append(action)
+                seats.append(seat)
+                scores.append(seat_scores[seat:] + seat_scores[:seat])
+            games += [game_index] * len(samples)
+            del samples[:]
+    finally:
+        for strategy in strategies:
+            strategy.close()
+
+    return {
+        'observations': np.array(observations, dtype=np.int16).reshape(-1, len(get_feature_names(player_count))),
+        'decisions': np.array(decisions, dtype=np.int8),
+        'actions': np.array(actions, dtype=np.int8).reshape(-1, len(ACTION_FIELDS)),
+        'seats': np.array(seats, dtype=np.int8),
+        'scores': np.array(scores, dtype=np.int16).reshape(-1, player_count),
+        'games': np.array(games, dtype=np.int64),
+    }
+
+
+class ShardWriter:
+    def __init__(self, directory, player_count, shard_size=DEFAULT_SHARD_SIZE):
+        """
+        Buffers samples in preallocated arrays of one shard and writes every full shard to an .npz file.
+
+        :param directory: directory of the shards, it is created if necessary
+        """
+        self.directory = directory
+        self.shard_size = shard_size
+        self.buffers = {
+            'observations': np.empty((shard_size, len(get_feature_names(player_count))), dtype=np.int16),
+            'decisions': np.empty(shard_size, dtype=np.int8),
+            'actions': np.empty((shard_size, len(ACTION_FIELDS)), dtype=np.int8),
+            'seats': np.empty(shard_size, dtype=np.int8),
+            'scores': np.empty((shard_size, player_count), dtype=np.int16),
+            'games': np.empty(shard_size, dtype=np.int64),
+        }
+        self.count = 0
+        self.shards = []
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, samples):
+        """
+        :param samples: dict of sample arrays like the ones of collect_samples
+        """
+        sample_count = len(samples['decisions'])
+        start = 0
+        while start < sample_count:
+            end = min(sample_count, start + self.shard_size - self.count)
+            for name, buffer in self.buffers.items():
+                buffer[self.count:self.count + end - start] = samples[name][start:end]
+            self.count += end - start
+            start = end
+
+            if self.count == self.shard_size:
+                self.write_shard()
+
+    def write_shard(self):
+        file_name = 'shard-{:05d}.npz'.format(len(self.shards))
+        np.savez(os.path.join(self.directory, file_name),
+                 **{name: buffer[:self.count] for name, buffer in self.buffers.items()})
+        self.shards.append({'file': file_name, 'sample_count': self.count})
+        self.count = 0
+
+    def close(self):
+        """
+        Writes the last shard, which may hold fewer than shard_size samples.
+        """
+        if self.count > 0:
+            self.write_shard()
+
+
+def export_samples(player_configs, game_count, directory, master_seed=0, shard_size=DEFAULT_SHARD_SIZE,
+                   games_per_job=DEFAULT_GAMES_PER_JOB, workers=None):
+    """
+    Plays game_count games across a pool of worker processes and streams the samples of their decisions (see
+    collect_samples) into shards of shard_size samples in the directory, together with a manifest.json that
+    describes the features and the shards.
+
+    The workers play jobs of games_per_job games. New jobs are only submitted while at most JOBS_IN_FLIGHT_PER_WORKER
+    jobs per worker are unwritten, so the samples held in memory stay bounded by the shard being filled and the
+    results of these jobs, however many games are exported. The jobs are written in game order, so the shards do not
+    depend on the number of workers.
+
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :return: the manifest dict
+    """
+    writer = ShardWriter(directory, len(player_configs), shard_size)
+    jobs = [(first_game, min(games_per_job, game_count - first_game))
+            for first_game in range(0, game_count, games_per_job)]
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        for first_game, job_game_count in jobs:
+            writer.add(collect_samples(player_configs, first_game, job_game_count, master_seed))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for first_game, job_game_count in jobs:
+                if len(pending) >= workers * JOBS_IN_FLIGHT_PER_WORKER:
+                    writer.add(pending.popleft().result())
+                pending.append(executor.submit(collect_samples, player_configs, first_game, job_game_count,
+                                               master_seed))
+            while pending:
+                writer.add(pending.popleft().result())
+    writer.close()
+
+    manifest = {
+        'rules_version': RULES_VERSION,
+        'player_configs': [list(player_config) for player_config in player_configs],
+        'master_seed': master_seed,
+        'game_count': game_count,
+        'sample_count': sum(shard['sample_count'] for shard in writer.shards),
+        'shard_size': shard_size,
+        'features': get_feature_names(len(player_configs)),
+        'actions': list(ACTION_FIELDS),
+        'encoding': {'hidden_card': HIDDEN_CARD, 'removed_card': REMOVED_CARD, 'no_card': NO_CARD,
+                     'draw_decision': DRAW_DECISION, 'target_decision': TARGET_DECISION},
+        'shards': writer.shards,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
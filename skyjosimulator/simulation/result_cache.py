@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import time
+
+from skyjosimulator import RULES_VERSION
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+
+CACHE_DIRECTORY_VARIABLE = 'SKYJO_CACHE_DIR'
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'skyjosimulator')
+DEFAULT_MAX_CACHE_SIZE = 256 * 2 ** 20
+# an eviction removes the least recently used entries until the cache is at most this fraction of its maximum size
+EVICTION_TARGET = 0.8
+ENTRY_SUFFIX = '.json'
+TEMPORARY_SUFFIX = '.tmp'
+# temporary files older than this many seconds were left behind by an interrupted writer
+ORPHAN_AGE = 3600
+
+
+class ResultCache:
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_CACHE_SIZE):
+        """
+        Content addressed on-disk cache of the aggregates of seeded game ranges.
+
+        An entry is stored under the sha256 hash of its header, which holds RULES_VERSION, the players in seat order
+        (see describe_players), the master seed and the range of game indices. The games of a range only depend on
+        these, so its aggregate can be reused by any later run. The stored header is compared on every lookup, so an
+        entry computed under other rules is never returned. If the entries take more than max_size bytes, the least
+        recently used ones are removed.
+
+        :param directory: directory of the entries, SKYJO_CACHE_DIR or ~/.cache/skyjosimulator by default
+        :param max_size: maximum total size of the entries in bytes
+        """
+        self.directory = directory or os.environ.get(CACHE_DIRECTORY_VARIABLE) or DEFAULT_CACHE_DIRECTORY
+        self.max_size = max_size
+        self.hit_count = 0
+        self.miss_count = 0
+        # total size of the entries, only determined once an entry is added
+        self.size = None
+
+    @staticmethod
+    def create_header(players, master_seed, first_game, game_count):
+        return {
+            'rules_version': RULES_VERSION,
+            'players': players,
+            'master_seed': master_seed,
+            'first_game': first_game,
+            'game_count': game_count,
+        }
+
+    def get_path(self, header):
+        key = hashlib.sha256(json.dumps(header, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, players, master_seed, first_game, game_count):
+        """
+        :param players: description of the players returned by describe_players
+        :return: ScoreAggregate of the games or None if they are not cached
+        """
+        header = self.create_header(players, master_seed, first_game, game_count)
+        path = self.get_path(header)
+
+        try:
+            with open(path) as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is None or entry.get('header') != header:
+            self.miss_count += 1
+            return None
+
+        try:
+            # the modification time marks the last use for the eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # the entry has been evicted by another process meanwhile, but it has already been read
+            pass
+        self.hit_count += 1
+        return ScoreAggregate.from_dict(entry['aggregate'])
+
+    def put(self, players, master_seed, first_game, game_count, aggregate):
+        header = self.create_header(players, master_seed, first_game, game_count)
+        path = self.get_path(header)
+        os.makedirs(self.directory, exist_ok=True)
+        if self.size is None:
+            self.size = sum(size for _, _, size in self.list_entries())
+
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = 0
+        # written to a temporary file first, so a reader never sees a partial entry
+        temporary_path = '{}.{}{}'.format(path, os.getpid(), TEMPORARY_SUFFIX)
+        with open(temporary_path, 'w') as entry_file:
+            json.dump({'header': header, 'aggregate': aggregate.to_dict()}, entry_file)
+        os.replace(temporary_path, path)
+
+        self.size += os.path.getsize(path) - previous_size
+        if self.size > self.max_size:
+            self.evict()
+
+    def list_entries(self):
+        """
+        :return: list of (last use, path, size) of all entries
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        return self._list_files(ENTRY_SUFFIX)
+
+    def _list_files(self, suffix):
+        files = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(suffix):
+                path = os.path.join(self.directory, file_name)
+                try:
+                    status = os.stat(path)
+                except FileNotFoundError:
+                    # removed by another process since the directory was listed
+                    continue
+                files.append((status.st_mtime, path, status.st_size))
+        return files
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache takes at most EVICTION_TARGET of its maximum size.
+
+        Temporary files older than ORPHAN_AGE seconds are removed as well.
+        """
+        orphan_time = time.time() - ORPHAN_AGE
+        for modification_time, path, _ in self._list_files(TEMPORARY_SUFFIX):
+            if modification_time < orphan_time:
+                self._remove(path)
+
+        entries = sorted(self.list_entries())
+        self.size = sum(size for _, _, size in entries)
+
+        for _, path, size in entries:
+            if self.size <= self.max_size * EVICTION_TARGET:
+                break
+            self._remove(path)
+            self.size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # removed by another process meanwhile
+            pass
+
+    def create_report(self):
+        lookup_count = self.hit_count + self.miss_count
+        return 'result cache: {} of {} shards reused ({})'.format(self.hit_count, lookup_count, self.directory)
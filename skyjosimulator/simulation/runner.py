@@ -0,0 +1,213 @@
+import os
+import random
+
+from skyjosimulator.game.interleaved import DEFAULT_CONCURRENCY, InterleavedGames
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.game.profiling import GameProfiler
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.strategy import EXTERNAL_STRATEGY_PREFIX, STRATEGIES, create_strategy
+from skyjosimulator.strategy.cache import CacheStatistics, DecisionCache
+
+GAME_SEED_STRIDE = 2 ** 32
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SIZE = 16
+MAX_CHUNK_SIZE = 2000
+
+
+def derive_game_seed(master_seed, game_index):
+    return master_seed * GAME_SEED_STRIDE + game_index
+
+
+def create_player_configs(strategy_keys):
+    return [('player{}'.format(index + 1), strategy_key) for index, strategy_key in enumerate(strategy_keys)]
+
+
+def get_player_names(player_configs):
+    return [player_name for player_name, _ in player_configs]
+
+
+def describe_players(player_configs):
+    """
+    :return: json serializable description of the players that the results of their games depend on (name, strategy
+             key, strategy class and the values of its parameters), None if their games cannot be cached because a
+             strategy asks a user or runs an external program that can change without its command
+    """
+    players = []
+    for player_name, strategy_key in player_configs:
+        if strategy_key.startswith(EXTERNAL_STRATEGY_PREFIX) or STRATEGIES[strategy_key].interactive:
+            return None
+
+        strategy = create_strategy(player_name, strategy_key)
+        strategy.close()
+        strategy_class = type(strategy)
+        players.append([player_name, strategy_key, '{}:{}'.format(strategy_class.__module__, strategy_class.__name__),
+                        {parameter: getattr(strategy, parameter) for parameter in strategy_class.parameters}])
+    return players
+
+
+def play_games(player_configs, first_game, game_count, master_seed, profiler=None, cache_size=None,
+               cache_statistics=None, recorder=None):
+    """
+    Plays the games with the indices first_game, ..., first_game + game_count - 1.
+
+    Every game seeds the random module with its own seed derived from the master seed and the game index, so the
+    result of a game does not depend on the process it runs in or on the games played before it. A single game
+    object is reset for every game, so the games do not allocate new state.
+
+    :param player_configs: list of (player_name, strategy_key) tuples in seat order
+    :param first_game: index of the first game
+    :param game_count: number of games to play
+    :param master_seed: seed of the whole simulation
+    :param profiler: optional GameProfiler to record the phases of the games in
+    :param cache_size: if given, the decisions of deterministic strategies are cached, in one DecisionCache of this
+                       size per strategy key
+    :param cache_statistics: optional CacheStatistics the hits and misses of the caches are added to
+    :param recorder: optional TrajectoryRecorder the games are recorded with
+    :return: ScoreAggregate of the played games
+    """
+    caches = dict()
+    if cache_size is not None:
+        caches = {strategy_key: DecisionCache(cache_size) for _, strategy_key in player_configs}
+
+    aggregate = ScoreAggregate(get_player_names(player_configs))
+    game = SkyjoGame([create_strategy(player_name, strategy_key, caches.get(strategy_key))
+                      for player_name, strategy_key in player_configs],
+                     aggregate=aggregate, profiler=profiler, recorder=recorder)
+
+    try:
+        for game_index in range(first_game, first_game + game_count):
+            game.reset(seed=derive_game_seed(master_seed, game_index))
+            game.start()
+    finally:
+        for strategy in game.player_strategies:
+            strategy.close()
+
+    if cache_statistics is not None:
+        for strategy_key, cache in caches.items():
+            if cache.hits + cache.misses > 0:
+                cache_statistics.add(strategy_key, cache.hits, cache.misses)
+
+    return aggregate
+
+
+def play_interleaved_games(player_configs, first_game, game_count, master_seed, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Plays the games like play_games, but concurrency games at a time with InterleavedGames, so the strategies make
+    the decisions of all these games at once with their batch methods.
+
+    The decks and reshuffles are the same as in play_games. The random module is seeded once with the seed of the
+    first game, and the random decisions of the strategies depend on the interleaving, so the results only equal the
+    ones of play_games for deterministic strategies.
+    """
+    random.seed(derive_game_seed(master_seed, first_game))
+    aggregate = ScoreAggregate(get_player_names(player_configs))
+    strategies = [create_strategy(player_name, strategy_key) for player_name, strategy_key in player_configs]
+
+    try:
+        games = InterleavedGames(strategies, min(concurrency, game_count), aggregate)
+        games.play(derive_game_seed(master_seed, game_index)
+                   for game_index in range(first_game, first_game + game_count))
+    finally:
+        for strategy in strategies:
+            strategy.close()
+
+    return aggregate
+
+
+def play_instrumented_games(player_configs, first_game, game_count, master_seed, profile, cache_size):
+    """
+    Same as play_games, but creates the GameProfiler and CacheStatistics in the worker and returns them together
+    with the ScoreAggregate, so they can be merged by the parent process.
+
+    :return: (ScoreAggregate, GameProfiler or None, CacheStatistics or None)
+    """
+    profiler = GameProfiler() if profile else None
+    cache_statistics = CacheStatistics() if cache_size is not None else None
+    aggregate = play_games(player_configs, first_game, game_count, master_seed, profiler, cache_size,
+                           cache_statistics)
+    return aggregate, profiler, cache_statistics
+
+
+def split_into_chunks(first_game, game_count, workers,
+                      min_chunk_size=MIN_CHUNK_SIZE, max_chunk_size=MAX_CHUNK_SIZE):
+    """
+    Splits a range of games into chunks that shrink with the remaining work (guided scheduling).
+
+    Large chunks at the beginning keep the IPC overhead per game low, small chunks at the end keep all workers busy
+    until the last game is played.
+
+    :return: list of (first_game, game_count) tuples
+    """
+    chunks = []
+    next_game = first_game
+    end = first_game + game_count
+
+    while next_game < end:
+        remaining = end - next_game
+        chunk_size = remaining // (workers * CHUNKS_PER_WORKER)
+        chunk_size = min(max(chunk_size, min_chunk_size), max_chunk_size, remaining)
+        chunks.append((next_game, chunk_size))
+        next_game += chunk_size
+
+    return chunks
+
+
+def run_simulation(player_configs, game_count, master_seed=0, workers=None, first_game=0, executor=None,
+                   profiler=None, cache_size=None, cache_statistics=None):
+    """
+    Plays game_count games spread across a pool of worker processes.
+
+    The result only depends on the player configuration, the game range and the master seed, not on the number of
+    workers.
+
+    :param player_configs: list of (player_name, strategy_key) tuples in seat order
+    :param game_count: number of games to play
+    :param master_seed: seed of the whole simulation
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :param first_game: index of the first game
+    :param executor: optional running executor to use instead of starting a new worker pool
+    :param profiler: optional GameProfiler the phase timings of all workers are merged into
+    :param cache_size: if given, every worker caches the decisions of deterministic strategies (see play_games)
+    :param cache_statistics: optional CacheStatistics the cache hits and misses of all workers are merged into
+    :return: ScoreAggregate of all games
+    """
+    workers = workers or os.cpu_count()
+    if executor is None:
+        # short runs are played in this process, since starting the workers would take longer than the games
+        workers = max(1, min(workers, game_count // MIN_CHUNK_SIZE))
+
+    if workers == 1 and executor is None:
+        return play_games(player_configs, first_game, game_count, master_seed, profiler, cache_size,
+                          cache_statistics)
+
+    if executor is None:
+        # imported here, so a run in a single process does not pay for importing multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return run_simulation(player_configs, game_count, master_seed, workers, first_game, executor, profiler,
+                                  cache_size, cache_statistics)
+
+    aggregate = ScoreAggregate(get_player_names(player_configs))
+    chunks = split_into_chunks(first_game, game_count, workers)
+
+    if profiler is None and cache_size is None:
+        futures = [executor.submit(play_games, player_configs, chunk_start, chunk_size, master_seed)
+                   for chunk_start, chunk_size in chunks]
+        for future in futures:
+            aggregate.merge(future.result())
+        return aggregate
+
+    futures = [executor.submit(play_instrumented_games, player_configs, chunk_start, chunk_size, master_seed,
+                               profiler is not None, cache_size)
+               for chunk_start, chunk_size in chunks]
+
+    for future in futures:
+        chunk_aggregate, chunk_profiler, chunk_cache_statistics = future.result()
+        aggregate.merge(chunk_aggregate)
+        if profiler is not None:
+            profiler.merge(chunk_profiler)
+        if cache_statistics is not None and chunk_cache_statistics is not None:
+            cache_statistics.merge(chunk_cache_statistics)
+
+    return aggregate
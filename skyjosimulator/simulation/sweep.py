@@ -0,0 +1,178 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from statistics import NormalDist
+
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.simulation.aggregation import OnlineStatistic
+from skyjosimulator.simulation.runner import derive_game_seed
+from skyjosimulator.strategy import check_parameters, create_strategy
+
+DEFAULT_GAMES_PER_CANDIDATE = 1000
+MAX_JOB_SIZE = 250
+CANDIDATE_NAME = 'candidate'
+
+
+def create_candidates(parameter_space):
+    """
+    :param parameter_space: dict mapping every parameter name to the list of its values
+    :return: list of parameter dicts, one for every combination of the values
+    """
+    names = list(parameter_space)
+    return [dict(zip(names, values)) for values in product(*(parameter_space[name] for name in names))]
+
+
+def play_candidate(strategy_key, parameters, opponent_keys, first_game, game_count, master_seed):
+    """
+    Plays games of a candidate in the first seat against the opponents.
+
+    The games are seeded like in play_games, so every candidate plays the same decks, reshuffles and opponent flips.
+
+    :return: (array of the final score of the candidate in every game, array with 1 for every game the candidate
+             won alone)
+    """
+    strategies = [create_strategy(CANDIDATE_NAME, strategy_key, parameters=parameters)]
+    strategies += [create_strategy('opponent{}'.format(seat + 1), opponent_key)
+                   for seat, opponent_key in enumerate(opponent_keys)]
+    game = SkyjoGame(strategies)
+    scores = array('i')
+    wins = array('b')
+
+    try:
+        for game_index in range(first_game, first_game + game_count):
+            game.reset(seed=derive_game_seed(master_seed, game_index))
+            final_scores = game.start()
+            score = final_scores.pop(CANDIDATE_NAME)
+            scores.append(score)
+            wins.append(score < min(final_scores.values()))
+    finally:
+        for strategy in strategies:
+            strategy.close()
+
+    return scores, wins
+
+
+def play_candidate_job(candidate_index, strategy_key, parameters, opponent_keys, first_game, game_count, master_seed):
+    return (candidate_index, first_game) + play_candidate(strategy_key, parameters, opponent_keys, first_game,
+                                                          game_count, master_seed)
+
+
+class SweepResult:
+    def __init__(self, candidates, scores, wins, alpha=0.05):
+        """
+        Per-game results of every candidate of a parameter sweep on the same games.
+
+        Since all candidates play the same games, two candidates are compared by the mean of their per-game score
+        differences. The deal luck cancels out in the differences, so their confidence interval is much narrower
+        than the one of two independent samples of the same size.
+
+        :param candidates: parameter dict of every candidate
+        :param scores: array of the per-game scores of every candidate, in game order
+        :param wins: array of the per-game wins of every candidate, in game order
+        :param alpha: significance level of the confidence intervals
+        """
+        self.candidates = candidates
+        self.scores = scores
+        self.wins = wins
+        self.critical_value = NormalDist().inv_cdf(1 - alpha / 2)
+        self.score_statistics = [self.create_statistic(candidate_scores) for candidate_scores in scores]
+
+    @staticmethod
+    def create_statistic(values):
+        statistic = OnlineStatistic()
+        for value in values:
+            statistic.add(value)
+        return statistic
+
+    def get_mean_score(self, candidate_index):
+        return self.score_statistics[candidate_index].mean
+
+    def get_win_rate(self, candidate_index):
+        wins = self.wins[candidate_index]
+        return sum(wins) / len(wins)
+
+    def get_half_width(self, candidate_index):
+        return self.critical_value * self.score_statistics[candidate_index].standard_error()
+
+    def rank(self):
+        """
+        :return: candidate indices ordered by the mean score, the best candidate first
+        """
+        return sorted(range(len(self.candidates)), key=self.get_mean_score)
+
+    def compare(self, candidate_index, other_index):
+        """
+        :return: (mean per-game score difference candidate minus other, half width of its confidence interval,
+                 variance reduction) where the variance reduction is the factor by which comparing independent
+                 samples of the two candidates would need more games for the same interval
+        """
+        difference = self.create_statistic(score - other_score for score, other_score
+                                           in zip(self.scores[candidate_index], self.scores[other_index]))
+        independent_variance = (self.score_statistics[candidate_index].variance() +
+                                self.score_statistics[other_index].variance())
+        variance_reduction = independent_variance / difference.variance() if difference.variance() > 0 else None
+        return difference.mean, self.critical_value * difference.standard_error(), variance_reduction
+
+    def create_report(self, top=None):
+        """
+        :param top: only report this many of the best candidates
+        :return: table of the candidates ordered by their mean score with the difference to the best candidate
+        """
+        ranking = self.rank()[:top]
+        best_index = ranking[0]
+        lines = ['{:>4}  {:<40} {:>18} {:>9} {:>20} {:>10}'.format('rank', 'parameters', 'mean score', 'win rate',
+                                                                 'vs best', 'reduction')]
+
+        for rank, candidate_index in enumerate(ranking):
+            parameters = ', '.join('{}={}'.format(name, value)
+                                   for name, value in self.candidates[candidate_index].items())
+            mean_score = '{:.2f} +- {:.2f}'.format(self.get_mean_score(candidate_index),
+                                                   self.get_half_width(candidate_index))
+            difference, half_width, variance_reduction = self.compare(candidate_index, best_index)
+            if candidate_index == best_index:
+                versus_best, reduction = '-', '-'
+            else:
+                versus_best = '{:+.2f} +- {:.2f}'.format(difference, half_width)
+                reduction = '{:.1f}x'.format(variance_reduction) if variance_reduction is not None else '-'
+            lines.append('{:>4}  {:<40} {:>18} {:>9.1%} {:>20} {:>10}'.format(
+                rank + 1, parameters, mean_score, self.get_win_rate(candidate_index), versus_best, reduction))
+
+        return '\n'.join(lines)
+
+
+def run_sweep(strategy_key, parameter_space, opponent_keys, games_per_candidate=DEFAULT_GAMES_PER_CANDIDATE,
+              master_seed=0, workers=None, alpha=0.05):
+    """
+    Evaluates every combination of the parameter values of a strategy on the same games (common random numbers).
+
+    :param strategy_key: key of the swept strategy, it plays in the first seat
+    :param parameter_space: dict mapping parameter names of the strategy (see Strategy.parameters) to their values
+    :param opponent_keys: strategy keys of the other seats
+    :param games_per_candidate: number of games every candidate plays
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :return: SweepResult
+    """
+    check_parameters(strategy_key, parameter_space)
+
+    candidates = create_candidates(parameter_space)
+    workers = workers or os.cpu_count()
+    jobs = [(candidate_index, strategy_key, parameters, list(opponent_keys), first_game,
+             min(MAX_JOB_SIZE, games_per_candidate - first_game), master_seed)
+            for candidate_index, parameters in enumerate(candidates)
+            for first_game in range(0, games_per_candidate, MAX_JOB_SIZE)]
+
+    if workers == 1:
+        results = [play_candidate_job(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(play_candidate_job, *job) for job in jobs]
+            results = [future.result() for future in as_completed(futures)]
+
+    scores = [array('i') for _ in candidates]
+    wins = [array('b') for _ in candidates]
+    for candidate_index, _, job_scores, job_wins in sorted(results, key=lambda result: result[:2]):
+        scores[candidate_index].extend(job_scores)
+        wins[candidate_index].extend(job_wins)
+
+    return SweepResult(candidates, scores, wins, alpha)
@@ -0,0 +1,176 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations_with_replacement, permutations
+
+from skyjosimulator.simulation.runner import create_player_configs, play_games
+from skyjosimulator.strategy import STRATEGIES
+
+DEFAULT_TABLE_SIZES = (2, 3, 4)
+DEFAULT_GAMES_PER_TABLE = 100
+MAX_JOB_SIZE = 500
+# strategies that are more expensive than this, like search strategies, only play if they are selected explicitly
+MAX_DEFAULT_RELATIVE_COST = 10
+
+
+def get_tournament_strategies():
+    """
+    :return: keys of all registered strategies that can play without user input and are cheap enough for the default
+             field (see MAX_DEFAULT_RELATIVE_COST)
+    """
+    return [strategy_key for strategy_key, strategy in STRATEGIES.items()
+            if not strategy.interactive and strategy.relative_cost <= MAX_DEFAULT_RELATIVE_COST]
+
+
+def create_tables(strategy_keys, table_size):
+    """
+    Creates every seating of the strategies at a table of the given size.
+
+    Every combination of strategies (a strategy can take several seats) is seated in every distinct order, since the
+    starting player and the turn order depend on the seats. Tables with only one strategy are left out.
+
+    :return: list of tuples with the strategy key of each seat
+    """
+    tables = []
+    for lineup in combinations_with_replacement(sorted(strategy_keys), table_size):
+        if len(set(lineup)) == 1:
+            continue
+        tables += sorted(set(permutations(lineup)))
+    return tables
+
+
+def estimate_job_cost(table, game_count):
+    return game_count * sum(STRATEGIES[strategy_key].relative_cost for strategy_key in table)
+
+
+def create_jobs(strategy_keys, table_sizes, games_per_table, max_job_size=MAX_JOB_SIZE):
+    """
+    Splits the games of all tables into jobs of at most max_job_size games, ordered by their estimated cost.
+
+    Scheduling the most expensive jobs first (longest processing time first) keeps a long job from starting when
+    all other workers are already idle.
+
+    :return: list of (table, first_game, game_count) tuples
+    """
+    jobs = []
+    for table_size in table_sizes:
+        for table in create_tables(strategy_keys, table_size):
+            for first_game in range(0, games_per_table, max_job_size):
+                jobs.append((table, first_game, min(max_job_size, games_per_table - first_game)))
+
+    jobs.sort(key=lambda job: estimate_job_cost(job[0], job[2]), reverse=True)
+    return jobs
+
+
+def play_table(table, first_game, game_count, master_seed):
+    """
+    Plays the games of a job. All seatings play the same deals, because the seeds only depend on the game indices.
+    """
+    return table, play_games(create_player_configs(table), first_game, game_count, master_seed)
+
+
+class TournamentResult:
+    def __init__(self):
+        """
+        Scores and wins of every strategy against every opponent strategy, per table size.
+
+        A cell (table_size, strategy, opponent) counts the games of every seat of the strategy at a table where the
+        opponent strategy has another seat.
+        """
+        self.cells = dict()
+        self.totals = dict()
+
+    def add_table(self, table, aggregate):
+        """
+        :param table: strategy key of each seat
+        :param aggregate: ScoreAggregate of the games at the table, with the player names of create_player_configs
+        """
+        table_size = len(table)
+        player_names = aggregate.player_names
+
+        for seat, strategy_key in enumerate(table):
+            player = player_names[seat]
+            counts = (aggregate.game_count, aggregate.score_sums[player], aggregate.win_counts[player])
+            self._add_counts(self.totals, (table_size, strategy_key), counts)
+
+            for opponent_seat, opponent_key in enumerate(table):
+                if opponent_seat != seat:
+                    self._add_counts(self.cells, (table_size, strategy_key, opponent_key), counts)
+
+    @staticmethod
+    def _add_counts(target, key, counts):
+        cell = target.setdefault(key, [0, 0, 0])
+        for index, count in enumerate(counts):
+            cell[index] += count
+
+    def get_mean_score(self, table_size, strategy_key, opponent_key=None):
+        game_count, score_sum, _ = self._get_counts(table_size, strategy_key, opponent_key)
+        return score_sum / game_count if game_count else None
+
+    def get_win_rate(self, table_size, strategy_key, opponent_key=None):
+        game_count, _, win_count = self._get_counts(table_size, strategy_key, opponent_key)
+        return win_count / game_count if game_count else None
+
+    def _get_counts(self, table_size, strategy_key, opponent_key):
+        if opponent_key is None:
+            return self.totals.get((table_size, strategy_key), (0, 0, 0))
+        return self.cells.get((table_size, strategy_key, opponent_key), (0, 0, 0))
+
+    def create_report(self):
+        """
+        :return: one cross-table per table size with the mean score and win rate of the row strategy against the
+                 column strategy, and over all opponents in the last column
+        """
+        table_sizes = sorted({table_size for table_size, _ in self.totals})
+        strategy_keys = sorted({strategy_key for _, strategy_key in self.totals})
+        lines = []
+
+        for table_size in table_sizes:
+            lines.append('{} players (mean score / win rate)'.format(table_size))
+            lines.append(''.join('{:>16}'.format(column) for column in [''] + strategy_keys + ['all']))
+            for strategy_key in strategy_keys:
+                row = ['{:>16}'.format(strategy_key)]
+                for opponent_key in strategy_keys + [None]:
+                    mean_score = self.get_mean_score(table_size, strategy_key, opponent_key)
+                    if mean_score is None:
+                        row.append('{:>16}'.format('-'))
+                    else:
+                        win_rate = self.get_win_rate(table_size, strategy_key, opponent_key)
+                        row.append('{:>16}'.format('{:.2f} / {:.1%}'.format(mean_score, win_rate)))
+                lines.append(''.join(row))
+            lines.append('')
+
+        return '\n'.join(lines)
+
+
+def run_tournament(strategy_keys=None, table_sizes=DEFAULT_TABLE_SIZES, games_per_table=DEFAULT_GAMES_PER_TABLE,
+                   master_seed=0, workers=None, executor=None):
+    """
+    Plays a round-robin tournament of the strategies at every table size and seating.
+
+    :param strategy_keys: strategies to play, get_tournament_strategies by default
+    :param games_per_table: number of games of every seating
+    :param workers: number of worker processes (defaults to the number of cpus, 1 plays in this process)
+    :param executor: optional running executor to use instead of starting a new worker pool
+    :return: TournamentResult
+    """
+    strategy_keys = strategy_keys or get_tournament_strategies()
+    workers = workers or os.cpu_count()
+    jobs = create_jobs(strategy_keys, table_sizes, games_per_table)
+    result = TournamentResult()
+
+    if workers == 1 and executor is None:
+        for table, first_game, game_count in jobs:
+            result.add_table(*play_table(table, first_game, game_count, master_seed))
+        return result
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return run_tournament(strategy_keys, table_sizes, games_per_table, master_seed, workers, executor)
+
+    # the pool starts the jobs in the order they are submitted, so the most expensive jobs run first
+    futures = [executor.submit(play_table, table, first_game, game_count, master_seed)
+               for table, first_game, game_count in jobs]
+    for future in as_completed(futures):
+        result.add_table(*future.result())
+
+    return result
@@ -1,11 +1,41 @@
-from skyjosimulator.strategy.strategies import RandomStrategy, ManualStrategy, LocalOptimumStrategy
+from skyjosimulator.strategy.cache import CachedStrategy
+from skyjosimulator.strategy.registry import StrategyRegistry
+from skyjosimulator.strategy.strategies import RandomStrategy, ManualStrategy, LocalOptimumStrategy, \
+    ColumnFirstStrategy
 
-STRATEGIES = {
+# strategies in modules with a noticeable import time are registered by name and only imported when they are played
+STRATEGIES = StrategyRegistry({
     'random': RandomStrategy,
     'manual': ManualStrategy,
     'local': LocalOptimumStrategy,
-}
+    'column': ColumnFirstStrategy,
+    'mcts': 'skyjosimulator.strategy.mcts:MonteCarloTreeSearchStrategy',
+    'endgame': 'skyjosimulator.strategy.endgame:EndgameStrategy',
+})
 
+# strategy keys of the form 'external:<command>' play with an ExternalBot started with the command
+EXTERNAL_STRATEGY_PREFIX = 'external:'
 
-def create_strategy(player_name, strategy_key):
-    return STRATEGIES[strategy_key](player_name)
+
+def check_parameters(strategy_key, parameter_names):
+    unknown_parameters = set(parameter_names) - set(STRATEGIES[strategy_key].parameters)
+    if unknown_parameters:
+        raise ValueError('unknown parameters of {}: {}'.format(strategy_key, ', '.join(sorted(unknown_parameters))))
+
+
+def create_strategy(player_name, strategy_key, cache=None, parameters=None):
+    """
+    :param cache: optional DecisionCache, deterministic strategies are wrapped in a CachedStrategy using it
+    :param parameters: optional dict of values of the parameters of the strategy (see Strategy.parameters)
+    """
+    if strategy_key.startswith(EXTERNAL_STRATEGY_PREFIX):
+        from skyjosimulator.strategy.external import ExternalStrategy
+        return ExternalStrategy(player_name, strategy_key[len(EXTERNAL_STRATEGY_PREFIX):])
+
+    parameters = parameters or dict()
+    check_parameters(strategy_key, parameters)
+
+    strategy = STRATEGIES[strategy_key](player_name, **parameters)
+    if cache is not None and strategy.deterministic:
+        return CachedStrategy(strategy, cache)
+    return strategy
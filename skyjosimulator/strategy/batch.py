@@ -0,0 +1,81 @@
+import numpy as np
+
+from skyjosimulator.game.batch import GRID_SIZE, ROW_COUNT
+
+
+class BatchStrategy:
+    """
+    Counterpart of Strategy for BatchSkyjoGame. Every method decides for all given games at once.
+
+    The games are passed as an array of game indices of the batch, seat is the index of the deciding player.
+    """
+
+    def get_position_of_initial_card_flips(self, game, games, seat):
+        """
+        :return: array of shape (games, flips) with the cell indices of the cards to reveal
+        """
+        raise NotImplementedError()
+
+    def decide_draw_location(self, game, games, seat):
+        """
+        :return: boolean array, True means drawing from the discard stack
+        """
+        raise NotImplementedError()
+
+    def get_target_location(self, game, games, seat, new_cards):
+        """
+        :return: tuple of an array of target cell indices and a boolean array that is True if the target card should
+                 be replaced by the drawn card (otherwise the drawn card is discarded and the target card revealed)
+        """
+        raise NotImplementedError()
+
+
+class BatchRandomStrategy(BatchStrategy):
+    def get_position_of_initial_card_flips(self, game, games, seat):
+        return game.rng.integers(0, GRID_SIZE, size=(len(games), 2))
+
+    def decide_draw_location(self, game, games, seat):
+        return game.rng.random(len(games)) < 0.5
+
+    def get_target_location(self, game, games, seat, new_cards):
+        remaining_columns = ~game.removed[games, seat, ::ROW_COUNT]
+        column_counts = remaining_columns.sum(axis=1)
+
+        # like RandomStrategy, pick a column among the remaining columns and map it to its position in the grid
+        column_indices = (game.rng.random(len(games)) * column_counts).astype(np.int64)
+        columns = np.argmax(np.cumsum(remaining_columns, axis=1) > column_indices[:, None], axis=1)
+        rows = game.rng.integers(0, ROW_COUNT, size=len(games))
+
+        return columns * ROW_COUNT + rows, game.rng.random(len(games)) < 0.5
+
+
+class BatchLocalOptimumStrategy(BatchStrategy):
+    def get_position_of_initial_card_flips(self, game, games, seat):
+        cells = np.array([1 * ROW_COUNT + 1, 2 * ROW_COUNT + 1])
+        return np.broadcast_to(cells, (len(games), 2))
+
+    def decide_draw_location(self, game, games, seat):
+        return game.get_discard_top(games) < game.calculate_expected_card_values(games)
+
+    def get_target_location(self, game, games, seat, new_cards):
+        expected_card_values = game.calculate_expected_card_values(games, extra_cards=new_cards)
+        revealed = game.revealed[games, seat]
+        removed = game.removed[games, seat]
+
+        gains = np.where(revealed, game.values[games, seat], expected_card_values[:, None]) - new_cards[:, None]
+        gains = np.where(removed, -np.inf, gains)
+
+        # argmax returns the first best cell, the last hidden cell is revealed if no replacement pays off
+        best_cells = np.argmax(gains, axis=1)
+        best_gains = gains[np.arange(len(games)), best_cells]
+        hidden = ~revealed & ~removed
+        last_hidden_cells = GRID_SIZE - 1 - np.argmax(hidden[:, ::-1], axis=1)
+
+        replace_card = best_gains > 0
+        return np.where(replace_card, best_cells, last_hidden_cells), replace_card
+
+
+BATCH_STRATEGIES = {
+    'random': BatchRandomStrategy,
+    'local': BatchLocalOptimumStrategy,
+}
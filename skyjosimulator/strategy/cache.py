@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+from skyjosimulator.game.model import MIN_CARD_VALUE
+from skyjosimulator.strategy.strategies import Strategy
+
+DEFAULT_CACHE_SIZE = 100000
+
+# byte of a hidden card and of a missing drawn card in the encoded observation
+HIDDEN_CARD = 0
+
+
+def encode_card(value):
+    if value is None:
+        return HIDDEN_CARD
+    return value - MIN_CARD_VALUE + 1
+
+
+def encode_observation(observation, new_card=None):
+    """
+    Encodes everything a deterministic strategy bases its decisions on into a compact canonical key.
+
+    The key contains the drawn card, the discard top, the own grid (column count and visible values) and the seen
+    card counts, one byte each. It does not contain the player name, so equal situations of different players
+    share the same key.
+
+    :param new_card: drawn card for target decisions, None for draw decisions
+    """
+    encoded = [encode_card(new_card), encode_card(observation.get_discard_top()),
+               observation.own_grid.get_column_count()]
+    for column in observation.own_grid.to_list():
+        for value in column:
+            encoded.append(encode_card(value))
+    encoded.extend(observation.get_seen_counts())
+    return bytes(encoded)
+
+
+class DecisionCache:
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        """
+        Decisions by encoded observation with least recently used eviction.
+
+        A cache is meant to be used by a single process, every worker creates its own caches.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        :return: the cached decision or None if the key is unknown
+        """
+        decision = self.entries.get(key)
+        if decision is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return decision
+
+    def put(self, key, decision):
+        self.entries[key] = decision
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class CachedStrategy(Strategy):
+    def __init__(self, strategy, cache):
+        """
+        Wraps a deterministic strategy and looks its decisions up in a DecisionCache before computing them.
+
+        :param strategy: Strategy with deterministic set to True
+        :param cache: DecisionCache, can be shared by all players with the same strategy
+        """
+        if not strategy.deterministic:
+            raise ValueError('only deterministic strategies can be cached: {}'.format(type(strategy).__name__))
+
+        super(CachedStrategy, self).__init__(strategy.name)
+        self.strategy = strategy
+        self.deterministic = True
+        self.cache = cache
+
+    def get_position_of_initial_card_flips(self):
+        return self.strategy.get_position_of_initial_card_flips()
+
+    def decide_draw_location(self, observation):
+        key = encode_observation(observation)
+        draw_location = self.cache.get(key)
+        if draw_location is None:
+            draw_location = self.strategy.decide_draw_location(observation)
+            self.cache.put(key, draw_location)
+        return draw_location
+
+    def get_target_location(self, observation, new_card):
+        key = encode_observation(observation, new_card)
+        target_location = self.cache.get(key)
+        if target_location is None:
+            target_location = self.strategy.get_target_location(observation, new_card)
+            self.cache.put(key, target_location)
+        return target_location
+
+    def close(self):
+        self.strategy.close()
+
+
+class CacheStatistics:
+    def __init__(self):
+        """
+        Mergeable hit and miss counts of the decision caches per strategy key.
+        """
+        self.counts = dict()
+
+    def add(self, strategy_key, hits, misses):
+        counts = self.counts.setdefault(strategy_key, [0, 0])
+        counts[0] += hits
+        counts[1] += misses
+
+    def merge(self, other):
+        for strategy_key, (hits, misses) in other.counts.items():
+            self.add(strategy_key, hits, misses)
+
+    def get_hit_rate(self, strategy_key):
+        hits, misses = self.counts.get(strategy_key, (0, 0))
+        if hits + misses == 0:
+            return 0.0
+        return hits / (hits + misses)
+
+    def create_report(self):
+        lines = []
+        for strategy_key, (hits, misses) in sorted(self.counts.items()):
+            lines.append('{}: {} hits, {} misses, hit rate {:.1%}'.format(strategy_key, hits, misses,
+                                                                          self.get_hit_rate(strategy_key)))
+        return '\n'.join(lines)
@@ -0,0 +1,168 @@
+from skyjosimulator import CARD_FREQUENCIES, DRAW_LOCATION
+from skyjosimulator.game.logic import SkyjoGameMove
+from skyjosimulator.game.model import MIN_CARD_VALUE
+from skyjosimulator.strategy.cache import DecisionCache
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy
+
+CARD_VALUES = tuple(sorted(CARD_FREQUENCIES))
+DEFAULT_MEMO_SIZE = 100000
+# sorts hidden cards after all card values in the canonical key
+HIDDEN_KEY = max(CARD_FREQUENCIES) + 1
+
+
+def create_position_key(columns, unseen):
+    """
+    The expected score of a grid does not depend on the order of its columns or of the cards in a column, so the
+    key sorts both.
+    """
+    return tuple(sorted(tuple(sorted(HIDDEN_KEY if value is None else value for value in column))
+                        for column in columns)), unseen
+
+
+class EndgameSolver:
+    def __init__(self, memo_size=DEFAULT_MEMO_SIZE):
+        """
+        Exact expected final scores of the last move of a player.
+
+        Once the last round has started, a player only has this move left and every card it does not see is revealed
+        at the end. The unseen cards are the deck minus the seen cards and the cards of removed columns (see
+        Observation.get_unseen_counts), and the top of the draw stack, a revealed card and every card that stays hidden
+        are equally likely to be any of them. The expected final score of a
+        grid is therefore the sum of its visible cards plus the number of hidden cards times the mean of the unseen
+        cards, minus the column that the move completes with three equal cards. The drawn card and the revealed card
+        are summed over all values, so the expectations are exact and need no sampling.
+
+        The doubling in evaluate_scores only applies to the finisher, who has no move in the last round. It never
+        makes a higher score better for another player, so the solver minimizes the expected own final score.
+
+        The expected score of drawing from the draw stack is memoized by the canonical position key (see
+        create_position_key) in a DecisionCache of memo_size entries.
+        """
+        self.memo = DecisionCache(memo_size)
+
+    @staticmethod
+    def get_best_target(columns, card, unseen, allow_reveal=True, unseen_count=None, unseen_sum=None):
+        """
+        :param columns: visible card values of the own grid by column, None for hidden cards
+        :param card: card that is placed or discarded
+        :param unseen: counts of the unseen cards by value, without the card
+        :param allow_reveal: False for a card of the discard stack, which has to be placed
+        :param unseen_count: optional sum of unseen, if it is already known
+        :param unseen_sum: optional value sum of the unseen cards, if it is already known
+        :return: (expected final score, (column, row, replace_card)) of the best target for the card
+        """
+        if unseen_count is None:
+            unseen_count = sum(unseen)
+            unseen_sum = sum(value * count for value, count in zip(CARD_VALUES, unseen))
+        mean = unseen_sum / unseen_count if unseen_count else 0.0
+
+        expected_score = 0.0
+        for column in columns:
+            for value in column:
+                expected_score += mean if value is None else value
+
+        best_score = None
+        best_target = None
+        for column_index, column in enumerate(columns):
+            for row_index, value in enumerate(column):
+                first, second = column[:row_index] + column[row_index + 1:]
+
+                score = expected_score - (mean if value is None else value) + card
+                if first == card and second == card:
+                    score -= 3 * card
+                if best_score is None or score < best_score:
+                    best_score, best_target = score, (column_index, row_index, True)
+
+                if value is not None or not allow_reveal:
+                    continue
+                # the revealed card removes the column if it equals the two other cards
+                score = expected_score
+                if first is not None and first == second and unseen_count:
+                    score -= 3 * first * unseen[first - MIN_CARD_VALUE] / unseen_count
+                if score < best_score:
+                    best_score, best_target = score, (column_index, row_index, False)
+
+        return best_score, best_target
+
+    def get_draw_stack_score(self, columns, unseen):
+        """
+        :return: expected final score if the card is drawn from the draw stack and placed at its best target
+        """
+        key = create_position_key(columns, unseen)
+        expected_score = self.memo.get(key)
+        if expected_score is not None:
+            return expected_score
+
+        unseen_count = sum(unseen)
+        unseen_sum = sum(value * count for value, count in zip(CARD_VALUES, unseen))
+        expected_score = 0.0
+        remaining = list(unseen)
+        for index, count in enumerate(unseen):
+            if count:
+                card = CARD_VALUES[index]
+                remaining[index] -= 1
+                expected_score += count * self.get_best_target(columns, card, remaining, True, unseen_count - 1,
+                                                               unseen_sum - card)[0]
+                remaining[index] += 1
+        expected_score /= unseen_count
+
+        self.memo.put(key, expected_score)
+        return expected_score
+
+    def get_draw_scores(self, observation):
+        """
+        :return: dict of the expected final score of the player for both draw locations
+        """
+        columns = observation.own_grid.to_list()
+        unseen = observation.get_unseen_counts()
+        return {
+            DRAW_LOCATION.DISCARD_STACK: self.get_best_target(columns, observation.get_discard_top(), unseen,
+                                                              allow_reveal=False)[0],
+            DRAW_LOCATION.DRAW_STACK: self.get_draw_stack_score(columns, unseen),
+        }
+
+    def get_target(self, observation, new_card, draw_location):
+        """
+        :return: (expected final score, SkyjoGameMove) of the best target of the drawn card
+        """
+        unseen = list(observation.get_unseen_counts())
+        allow_reveal = draw_location == DRAW_LOCATION.DRAW_STACK
+        if allow_reveal:
+            # a card of the discard stack is already counted as seen
+            unseen[new_card - MIN_CARD_VALUE] -= 1
+        expected_score, (column, row, replace_card) = self.get_best_target(observation.own_grid.to_list(), new_card,
+                                                                           unseen, allow_reveal)
+        return expected_score, SkyjoGameMove(column, row, replace_card)
+
+
+class EndgameStrategy(LocalOptimumStrategy):
+    # the decisions in the last round also depend on it having started
+    deterministic = False
+
+    def __init__(self, name, discard_margin=0.0, replace_threshold=0.0, memo_size=DEFAULT_MEMO_SIZE):
+        """
+        Plays like LocalOptimumStrategy until the last round and makes the last move with the EndgameSolver.
+        """
+        super(EndgameStrategy, self).__init__(name, discard_margin, replace_threshold)
+        self.solver = EndgameSolver(memo_size)
+        # draw location of every last round observation until its target decision
+        self.draw_locations = dict()
+
+    def decide_draw_location(self, observation):
+        if not observation.last_round:
+            return super(EndgameStrategy, self).decide_draw_location(observation)
+
+        scores = self.solver.get_draw_scores(observation)
+        if scores[DRAW_LOCATION.DISCARD_STACK] <= scores[DRAW_LOCATION.DRAW_STACK]:
+            draw_location = DRAW_LOCATION.DISCARD_STACK
+        else:
+            draw_location = DRAW_LOCATION.DRAW_STACK
+        self.draw_locations[observation] = draw_location
+        return draw_location
+
+    def get_target_location(self, observation, new_card):
+        if not observation.last_round:
+            return super(EndgameStrategy, self).get_target_location(observation, new_card)
+
+        draw_location = self.draw_locations.pop(observation, DRAW_LOCATION.DRAW_STACK)
+        return self.solver.get_target(observation, new_card, draw_location)[1]
@@ -0,0 +1,77 @@
+import sys
+
+# the bot only uses the standard library, so it can be copied as a starting point for bots outside of this package
+MIN_CARD_VALUE = -2
+DECK_SIZE = 155
+DECK_VALUE_SUM = 755
+
+
+def parse_grid(field):
+    return [[None if value == 'x' else int(value) for value in column.split(',')] for column in field.split('/')]
+
+
+def calculate_expected_card_value(seen_counts, extra_card=None):
+    hidden_cards_no = DECK_SIZE - sum(seen_counts)
+    hidden_cards_value_sum = DECK_VALUE_SUM - sum((MIN_CARD_VALUE + index) * count
+                                                  for index, count in enumerate(seen_counts))
+    if extra_card is not None:
+        hidden_cards_no -= 1
+        hidden_cards_value_sum -= extra_card
+    return float(hidden_cards_value_sum) / float(hidden_cards_no)
+
+
+def decide_draw_location(fields):
+    discard_top = int(fields[0])
+    seen_counts = [int(count) for count in fields[3].split(',')]
+    return '1' if discard_top < calculate_expected_card_value(seen_counts) else '0'
+
+
+def get_target_location(fields):
+    new_card = int(fields[0])
+    seen_counts = [int(count) for count in fields[4].split(',')]
+    grid = parse_grid(fields[5])
+    expected_card_value = calculate_expected_card_value(seen_counts, new_card)
+
+    best_move = (0, 0)
+    best_score = (grid[0][0] if grid[0][0] is not None else expected_card_value) - new_card
+    hidden_location = None
+
+    for column_index, column in enumerate(grid):
+        for row_index, card_value in enumerate(column):
+            if card_value is None:
+                hidden_location = (column_index, row_index)
+                card_value = expected_card_value
+            if card_value - new_card > best_score:
+                best_score = card_value - new_card
+                best_move = (column_index, row_index)
+
+    if best_score > 0:
+        return '{} {} 1'.format(*best_move)
+    return '{} {} 0'.format(*hidden_location)
+
+
+def answer(command, item):
+    if command == 'flip':
+        return '1 1 2 1'
+    if command == 'draw':
+        return decide_draw_location(item.split())
+    return get_target_location(item.split())
+
+
+def main(stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Example bot for ExternalStrategy that plays like LocalOptimumStrategy.
+    """
+    for header in stdin:
+        command, count = header.split()
+        if command == 'quit':
+            return
+
+        # all items are read before the first answer is written, as the protocol requires
+        items = [stdin.readline() for _ in range(int(count))]
+        stdout.write(''.join(answer(command, item) + '\n' for item in items))
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import shlex
+import subprocess
+import weakref
+
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.game.logic import SkyjoGameMove
+from skyjosimulator.strategy.strategies import Strategy
+
+HIDDEN_CARD = 'x'
+CLOSE_TIMEOUT = 5.0
+
+
+class ExternalBotError(RuntimeError):
+    pass
+
+
+def format_grid(grid):
+    """
+    :return: the columns separated by '/', the cards of a column separated by ',' and hidden cards as 'x'
+    """
+    return '/'.join(','.join(HIDDEN_CARD if value is None else str(value) for value in column)
+                    for column in grid.to_list())
+
+
+def format_observation(observation):
+    """
+    :return: '<discard top> <draw stack size> <last round> <seen counts> <own grid> <opponent grid> ...' with the
+             last round as 0 or 1, the seen card counts separated by ',' ordered by card value starting at the lowest
+             value and the opponent grids in seat order
+    """
+    fields = [str(observation.get_discard_top()), str(observation.get_draw_stack_size()),
+              '1' if observation.last_round else '0', ','.join(map(str, observation.get_seen_counts())),
+              format_grid(observation.own_grid)]
+    for player in observation.player_names:
+        if player != observation.player:
+            fields.append(format_grid(observation.get_grid(player)))
+    return ' '.join(fields)
+
+
+def close_process(process):
+    try:
+        process.stdin.write('quit 0\n')
+        process.stdin.close()
+    except OSError:
+        pass
+
+    try:
+        process.wait(CLOSE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+class ExternalBot:
+    def __init__(self, command):
+        """
+        Bot program that runs in a subprocess and makes decisions for any number of games over stdin and stdout.
+
+        A request is a line '<command> <count>' followed by count item lines. The bot has to read all items of a
+        request before it answers with one line per item, in the order of the items:
+
+        - flip: the item is '<columns> <rows>' of the grid, the answer 'column row column row' are the two cards to
+          reveal before the game starts
+        - draw: the item is an observation (see format_observation), the answer is 0 to draw from the draw stack
+          and 1 to take the top of the discard stack
+        - target: the item is '<new card> <observation>', the answer 'column row replace' either replaces the card by
+          the new card (replace 1) or discards the new card and reveals the card (replace 0)
+        - quit: the bot should exit, it is sent without items when the bot is closed
+
+        The bot does not need to keep any state between requests, every item contains everything the player sees.
+
+        :param command: command line of the bot as string or list of arguments
+        """
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        universal_newlines=True)
+        self.request_count = 0
+        self.item_count = 0
+        self._finalizer = weakref.finalize(self, close_process, self.process)
+
+    def request(self, command, items):
+        """
+        Sends all items in one request and reads the answers.
+
+        :return: list of the answers split into their fields
+        """
+        if not items:
+            return []
+
+        try:
+            self.process.stdin.write('{} {}\n{}\n'.format(command, len(items), '\n'.join(items)))
+            self.process.stdin.flush()
+            answers = [self.process.stdout.readline() for _ in items]
+        except OSError as error:
+            raise ExternalBotError('bot {} can not be reached: {}'.format(self.command, error))
+
+        if not answers[-1].endswith('\n'):
+            try:
+                return_code = self.process.wait(CLOSE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                return_code = None
+            raise ExternalBotError('bot {} stopped answering (exit code {})'.format(self.command, return_code))
+
+        self.request_count += 1
+        self.item_count += len(items)
+        return [answer.split() for answer in answers]
+
+    def close(self):
+        self._finalizer()
+
+
+def parse_answer(answer, field_count):
+    try:
+        values = [int(field) for field in answer]
+    except ValueError:
+        values = []
+    if len(values) != field_count:
+        raise ExternalBotError('invalid answer of the bot: {}'.format(' '.join(answer)))
+    return values
+
+
+class ExternalStrategy(Strategy):
+    def __init__(self, name, bot):
+        """
+        Strategy whose decisions are made by an ExternalBot.
+
+        The batch methods send the decisions of all games in a single request, the single game methods send a
+        request with one item. Several strategies can share a bot, since the requests contain the whole
+        observation.
+
+        :param bot: ExternalBot or the command line to start one with
+        """
+        super(ExternalStrategy, self).__init__(name)
+        self.bot = ExternalBot(bot) if isinstance(bot, (str, list, tuple)) else bot
+
+    def get_position_of_initial_card_flips(self):
+        return self.get_positions_of_initial_card_flips(1)[0]
+
+    def decide_draw_location(self, observation):
+        return self.decide_draw_locations([observation])[0]
+
+    def get_target_location(self, observation, new_card):
+        return self.get_target_locations([observation], [new_card])[0]
+
+    def get_positions_of_initial_card_flips(self, count):
+        positions = []
+        for answer in self.bot.request('flip', ['4 3'] * count):
+            first_column, first_row, second_column, second_row = parse_answer(answer, 4)
+            positions.append([(first_column, first_row), (second_column, second_row)])
+        return positions
+
+    def decide_draw_locations(self, observations):
+        answers = self.bot.request('draw', [format_observation(observation) for observation in observations])
+        return [DRAW_LOCATION.DISCARD_STACK if parse_answer(answer, 1)[0] else DRAW_LOCATION.DRAW_STACK
+                for answer in answers]
+
+    def get_target_locations(self, observations, new_cards):
+        items = ['{} {}'.format(new_card, format_observation(observation))
+                 for observation, new_card in zip(observations, new_cards)]
+        target_locations = []
+        for answer in self.bot.request('target', items):
+            column, row, replace_card = parse_answer(answer, 3)
+            target_locations.append(SkyjoGameMove(column, row, bool(replace_card)))
+        return target_locations
+
+    def close(self):
+        self.bot.close()
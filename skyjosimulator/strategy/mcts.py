@@ -0,0 +1,345 @@
+import math
+import random
+from time import perf_counter
+
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.game.logic import SkyjoGame, SkyjoGameMove, double_finisher_score
+from skyjosimulator.game.model import CARD_COUNTS, MIN_CARD_VALUE, ROW_COUNT, CompactCardGrid, MoveRecord, \
+    SkyjoGameState
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy, Strategy
+
+DEFAULT_ROLLOUTS = 100
+DEFAULT_ROLLOUT_ROUNDS = 2
+DEFAULT_EXPLORATION = 0.7
+
+# score difference that corresponds to a reward of 1
+REWARD_SCALE = 20.0
+
+DRAW_ACTIONS = (DRAW_LOCATION.DRAW_STACK, DRAW_LOCATION.DISCARD_STACK)
+
+
+class SearchNode:
+    __slots__ = ('actions', 'visits', 'action_visits', 'action_rewards', 'children')
+
+    def __init__(self, actions):
+        """
+        Decision node of the search tree with the visit count and reward sum of every tried action.
+
+        :param actions: actions that can be taken in the node
+        """
+        self.actions = actions
+        self.visits = 0
+        self.action_visits = dict()
+        self.action_rewards = dict()
+        self.children = dict()
+
+    def select(self, exploration):
+        """
+        Selects an untried action or otherwise the action with the highest upper confidence bound (UCB1).
+        """
+        actions = self.actions
+        untried_actions = [action for action in actions if action not in self.action_visits]
+        if untried_actions:
+            return random.choice(untried_actions)
+
+        log_visits = math.log(self.visits)
+        action_visits = self.action_visits
+        action_rewards = self.action_rewards
+        return max(actions, key=lambda action: action_rewards[action] / action_visits[action]
+                   + exploration * math.sqrt(log_visits / action_visits[action]))
+
+    def update(self, action, reward):
+        self.visits += 1
+        self.action_visits[action] = self.action_visits.get(action, 0) + 1
+        self.action_rewards[action] = self.action_rewards.get(action, 0.0) + reward
+
+    def get_most_visited_action(self):
+        return max(self.action_visits, key=self.action_visits.get)
+
+
+def get_unseen_cards(observation):
+    """
+    :return: list of all cards that are hidden in a grid or in the draw stack
+    """
+    unseen_cards = []
+    for value, unseen_count in enumerate(observation.get_unseen_counts(), MIN_CARD_VALUE):
+        unseen_cards += [value] * unseen_count
+    return unseen_cards
+
+
+class Determinization:
+    def __init__(self, observation, known_draw_card=None):
+        """
+        Full game state that is consistent with everything the player can see, resampled in place by sample.
+
+        The unseen cards are shuffled and dealt to the hidden grid positions, the rest forms the draw stack. The discard
+        stack below its top card is made of the seen cards that are not visible in a grid. The state is only
+        allocated once, rollouts on it have to be undone before the next sample.
+
+        :param known_draw_card: card the player has already drawn from the draw stack, it is put on top of the draw
+                                stack
+        """
+        self.unseen_cards = get_unseen_cards(observation)
+        self.known_draw_card = known_draw_card
+        if known_draw_card is not None:
+            self.unseen_cards.remove(known_draw_card)
+
+        discarded_counts = list(observation.get_seen_counts())
+        discard_top = observation.get_discard_top()
+        discarded_counts[discard_top - MIN_CARD_VALUE] -= 1
+
+        self.hidden_positions = []
+        player_grids = dict()
+        for player in observation.player_names:
+            columns = observation.get_grid(player).to_list()
+            values = []
+            revealed_mask = 0
+            for column_index, column in enumerate(columns):
+                for row_index, value in enumerate(column):
+                    if value is None:
+                        values.append(0)
+                        self.hidden_positions.append((player, column_index, row_index))
+                    else:
+                        values.append(value)
+                        revealed_mask |= 1 << (len(values) - 1)
+                        discarded_counts[value - MIN_CARD_VALUE] -= 1
+            player_grids[player] = CompactCardGrid(values, revealed_mask)
+
+        discard_stack = []
+        for value, count in enumerate(discarded_counts, MIN_CARD_VALUE):
+            discard_stack += [value] * count
+        discard_stack.append(discard_top)
+
+        self.state = SkyjoGameState([], player_grids, discard_stack)
+        # the cards of removed columns are part of neither the grids nor the stacks
+        self.state.card_statistic.removed_counts[:] = [
+            frequency - seen_count - unseen_count for frequency, seen_count, unseen_count
+            in zip(CARD_COUNTS, observation.get_seen_counts(), observation.get_unseen_counts())]
+
+    def sample(self):
+        """
+        Deals a new random permutation of the unseen cards.
+
+        :return: the SkyjoGameState
+        """
+        unseen_cards = self.unseen_cards
+        random.shuffle(unseen_cards)
+
+        player_grids = self.state.player_grids
+        for index, (player, column_index, row_index) in enumerate(self.hidden_positions):
+            player_grids[player].set_card(column_index, row_index, unseen_cards[index], False)
+
+        draw_stack = self.state.draw_stack
+        draw_stack[:] = unseen_cards[len(self.hidden_positions):]
+        if self.known_draw_card is not None:
+            draw_stack.append(self.known_draw_card)
+        return self.state
+
+
+def estimate_scores(state):
+    """
+    Estimates the final scores as the revealed scores plus the expected value of every hidden card.
+    """
+    expected_card_value = state.card_statistic.calculate_expected_card_value()
+    scores = dict()
+    for player, grid in state.player_grids.items():
+        hidden_card_count = sum(value is None for column in grid.to_list() for value in column)
+        scores[player] = grid.calculate_current_score() + hidden_card_count * expected_card_value
+    return scores
+
+
+def get_target_actions(own_grid, draw_location, new_card):
+    """
+    Lists the moves worth searching for the drawn card as (column, row, replace_card) tuples.
+
+    A revealed card is only replaced if it is higher than the new card or if the new card matches another card of
+    its column. Hidden cards of columns with the same revealed cards are interchangeable, so only the first one of
+    them is considered. A card from the discard stack is always placed in the grid.
+    """
+    actions = []
+    hidden_columns = set()
+
+    for column_index in range(own_grid.get_column_count()):
+        values = [own_grid.get_value(column_index, row_index) for row_index in range(ROW_COUNT)]
+        revealed_values = sorted(value for value in values if value is not None)
+
+        for row_index, value in enumerate(values):
+            if value is None:
+                if tuple(revealed_values) in hidden_columns:
+                    continue
+                hidden_columns.add(tuple(revealed_values))
+                actions.append((column_index, row_index, True))
+                if draw_location == DRAW_LOCATION.DRAW_STACK:
+                    actions.append((column_index, row_index, False))
+            elif value > new_card or (new_card in revealed_values and value != new_card):
+                actions.append((column_index, row_index, True))
+
+    if not actions:
+        highest_card = max(((own_grid.get_value(column_index, row_index), (column_index, row_index, True))
+                            for column_index in range(own_grid.get_column_count())
+                            for row_index in range(ROW_COUNT)))
+        actions.append(highest_card[1])
+    return actions
+
+
+class MonteCarloTreeSearchStrategy(Strategy):
+    # a decision with the default budget takes about as long as a few thousand decisions of LocalOptimumStrategy
+    relative_cost = 2000
+
+    def __init__(self, name, rollouts=DEFAULT_ROLLOUTS, time_budget_ms=None, rollout_rounds=DEFAULT_ROLLOUT_ROUNDS,
+                 exploration=DEFAULT_EXPLORATION):
+        """
+        Information set Monte Carlo tree search over the decisions of a single turn.
+
+        Every iteration samples a determinization of the hidden cards, walks down the tree (draw location, drawn
+        card, target location) with UCB1 and plays a rollout with LocalOptimumStrategy players. The reward is the
+        lead of the player over the best opponent. Rollouts are cut off after a few rounds and scored with
+        estimate_scores, because the outcome of a whole game is too noisy to tell the moves of one turn apart.
+
+        The statistics gathered for the draw decision are reused for the target decision of the same turn, only
+        the subtree of the actually drawn card is searched further. They are kept per observation, so the draw
+        decisions of several games can be made before their target decisions.
+
+        :param rollouts: number of rollouts per decision (counting the reused ones for the target decision)
+        :param time_budget_ms: if given, every decision searches for this long instead of a fixed number of rollouts
+        :param rollout_rounds: number of rounds played after the move before the scores are estimated, None plays
+                               rollouts to the end of the game
+        :param exploration: exploration constant of UCB1
+        """
+        super(MonteCarloTreeSearchStrategy, self).__init__(name)
+        self.rollouts = rollouts
+        self.time_budget_ms = time_budget_ms
+        self.rollout_rounds = rollout_rounds
+        self.exploration = exploration
+
+        # observation -> (root of the draw search, chosen draw location) until the target decision of the turn
+        self.searches = dict()
+        self.simulator = None
+        self.seat = None
+        self.last_round = False
+        self.finishing_seat = None
+
+    def get_position_of_initial_card_flips(self):
+        return [(1, 1), (2, 1)]
+
+    def decide_draw_location(self, observation):
+        root = SearchNode(DRAW_ACTIONS)
+        determinization = Determinization(observation)
+        self.prepare_simulator(observation, determinization.state)
+
+        def iterate():
+            state = determinization.sample()
+            draw_location = root.select(self.exploration)
+            new_card = state.draw_stack[-1] if draw_location == DRAW_LOCATION.DRAW_STACK else state.discard_stack[-1]
+
+            node = root.children.get((draw_location, new_card))
+            if node is None:
+                node = SearchNode(get_target_actions(observation.own_grid, draw_location, new_card))
+                root.children[(draw_location, new_card)] = node
+            action = node.select(self.exploration)
+
+            reward = self.play_rollout(state, draw_location, action)
+            node.update(action, reward)
+            root.update(draw_location, reward)
+
+        self.search(root, iterate)
+        draw_location = root.get_most_visited_action()
+        self.searches[observation] = (root, draw_location)
+        return draw_location
+
+    def get_target_location(self, observation, new_card):
+        root, draw_location = self.searches.pop(observation, (None, DRAW_LOCATION.DRAW_STACK))
+        known_draw_card = new_card if draw_location == DRAW_LOCATION.DRAW_STACK else None
+
+        node = None
+        if root is not None:
+            node = root.children.get((draw_location, new_card))
+        if node is None:
+            node = SearchNode(get_target_actions(observation.own_grid, draw_location, new_card))
+        determinization = Determinization(observation, known_draw_card)
+        self.prepare_simulator(observation, determinization.state)
+
+        def iterate():
+            state = determinization.sample()
+            action = node.select(self.exploration)
+            node.update(action, self.play_rollout(state, draw_location, action))
+
+        self.search(node, iterate)
+
+        column, row, replace_card = node.get_most_visited_action()
+        return SkyjoGameMove(column, row, replace_card)
+
+    def search(self, node, iterate):
+        if self.time_budget_ms is None:
+            while node.visits < self.rollouts:
+                iterate()
+            return
+
+        deadline = perf_counter() + self.time_budget_ms / 1000.0
+        iterate()
+        while perf_counter() < deadline:
+            iterate()
+
+    def prepare_simulator(self, observation, state):
+        """
+        Sets up the simulator on the state of a determinization, so rollouts can start at the turn of the player.
+        """
+        player_names = observation.player_names
+        if self.simulator is None or self.simulator.player_names != player_names:
+            self.simulator = SkyjoGame([LocalOptimumStrategy(player) for player in player_names])
+
+        self.simulator.state = state
+        self.simulator.update_grid_views()
+        self.seat = player_names.index(self.name)
+        self.last_round = observation.last_round
+        self.finishing_seat = None
+        if observation.finishing_player is not None:
+            self.finishing_seat = player_names.index(observation.finishing_player)
+
+    def play_rollout(self, state, draw_location, action):
+        """
+        Applies the move of the player to the determinized state, plays the following rounds and undoes all moves.
+
+        :return: reward of the player
+        """
+        simulator = self.simulator
+        player_count = len(simulator.player_strategies)
+        simulator.current_player_index = self.seat
+        simulator.current_player = simulator.player_strategies[self.seat]
+        simulator.last_round = self.last_round
+        simulator.finishing_player = None
+        simulator.remaining_turns = None
+        if self.finishing_seat is not None:
+            simulator.finishing_player = simulator.player_strategies[self.finishing_seat]
+            simulator.remaining_turns = (self.finishing_seat - self.seat) % player_count
+
+        record = MoveRecord()
+        records = [record]
+        column, row, replace_card = action
+        state.apply_move(self.name, draw_location, SkyjoGameMove(column, row, replace_card), record)
+        state.remove_columns_with_identical_cards(self.name, record)
+        if len(state.draw_stack) == 0:
+            simulator.reshuffle_cards(record)
+        simulator.end_turn()
+
+        turn_count = 0
+        while simulator.remaining_turns != 0 and (self.rollout_rounds is None
+                                                 or turn_count < self.rollout_rounds * player_count):
+            record = MoveRecord()
+            records.append(record)
+            simulator.play_turn(record)
+            simulator.end_turn()
+            turn_count += 1
+
+        if simulator.remaining_turns == 0:
+            scores = {player: grid.calculate_final_score() for player, grid in state.player_grids.items()}
+            double_finisher_score(scores, simulator.finishing_player.name)
+        else:
+            scores = estimate_scores(state)
+
+        for record in reversed(records):
+            state.undo_move(record)
+
+        own_score = scores.pop(self.name)
+        best_opponent_score = min(scores.values()) if scores else 0
+        return (best_opponent_score - own_score) / REWARD_SCALE
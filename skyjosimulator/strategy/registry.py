@@ -0,0 +1,90 @@
+import importlib
+import os
+from collections.abc import Mapping
+
+PLUGIN_GROUP = 'skyjosimulator.strategies'
+PLUGIN_VARIABLE = 'SKYJO_STRATEGY_PLUGINS'
+
+
+def resolve(target):
+    """
+    :param target: class or 'module:attribute' string
+    :return: the class, the module is imported if necessary
+    """
+    if not isinstance(target, str):
+        return target
+    module_name, _, attribute = target.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def find_plugins():
+    """
+    :return: dict of the 'module:Class' strings of the strategy plugins by key, from the entry points of the group
+             skyjosimulator.strategies and the comma separated 'key=module:Class' entries of SKYJO_STRATEGY_PLUGINS
+    """
+    from importlib.metadata import entry_points
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, 'select'):
+        group_entry_points = all_entry_points.select(group=PLUGIN_GROUP)
+    else:
+        group_entry_points = all_entry_points.get(PLUGIN_GROUP, [])
+
+    plugins = {entry_point.name: entry_point.value for entry_point in group_entry_points}
+    for entry in os.environ.get(PLUGIN_VARIABLE, '').split(','):
+        key, separator, target = entry.partition('=')
+        if separator:
+            plugins[key.strip()] = target.strip()
+    return plugins
+
+
+class StrategyRegistry(Mapping):
+    def __init__(self, strategies):
+        """
+        Strategy classes by key, which are only imported when they are looked up.
+
+        A strategy is registered either as class or as 'module:Class' string, so the modules of strategies that are
+        not played are never imported. Plugins (see find_plugins) are only searched for when an unknown key is looked
+        up or all keys are listed, and never replace a built-in strategy.
+
+        :param strategies: dict of the built-in strategies by key
+        """
+        self._targets = dict(strategies)
+        self._plugins_loaded = False
+
+    def register(self, key, target):
+        """
+        :param target: strategy class or 'module:Class' string
+        """
+        self._targets[key] = target
+
+    def load_plugins(self):
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+
+        for key, target in find_plugins().items():
+            self._targets.setdefault(key, target)
+
+    def __getitem__(self, key):
+        if key not in self._targets:
+            self.load_plugins()
+
+        target = self._targets[key]
+        if isinstance(target, str):
+            target = resolve(target)
+            self._targets[key] = target
+        return target
+
+    def __contains__(self, key):
+        if key not in self._targets:
+            self.load_plugins()
+        return key in self._targets
+
+    def __iter__(self):
+        self.load_plugins()
+        return iter(list(self._targets))
+
+    def __len__(self):
+        self.load_plugins()
+        return len(self._targets)
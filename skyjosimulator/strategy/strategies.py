@@ -59,6 +59,16 @@ def zero_if_none(value):
 
 
 class Strategy:
+    # True if the decisions only depend on the drawn card, the discard top, the own grid and the seen card counts,
+    # so they can be cached by CachedStrategy
+    deterministic = False
+    # True if the strategy asks a user for its decisions
+    interactive = False
+    # names of the keyword arguments of the constructor that tune the decisions, see simulation.sweep
+    parameters = ()
+    # estimated time of a decision relative to LocalOptimumStrategy, used to schedule the most expensive games first
+    relative_cost = 1
+
     def __init__(self, name):
         self.name = name
 
@@ -68,27 +78,64 @@ class Strategy:
         """
         raise NotImplementedError()
 
-    def decide_draw_location(self, player_grids, discard_stack):
+    def decide_draw_location(self, observation):
         """
         This method decides wether to draw from the draw-stack or the discard-stack.
 
-        :param player_grids:
-        :param discard_stack:
+        :param observation: read-only Observation of everything the player can see
         :return:
         """
         raise NotImplementedError()
 
-    def get_target_location(self, player_grids, discard_stack, new_card):
+    def get_target_location(self, observation, new_card):
         """
         This method decides which position of the player grid should be affected by the current move.
 
-        :param player_grids:
-        :param discard_stack:
+        :param observation: read-only Observation of everything the player can see (the new card is not seen yet)
         :param new_card:
         :return:
         """
         raise NotImplementedError()
 
+    def get_positions_of_initial_card_flips(self, count):
+        """
+        Batch version of get_position_of_initial_card_flips for count games.
+
+        The batch methods are called by InterleavedGames with the decisions of many games at once. By default they
+        call the single game method for every game, strategies override them to vectorize their decisions or to
+        evaluate a model on all observations in one call.
+        """
+        return [self.get_position_of_initial_card_flips() for _ in range(count)]
+
+    def decide_draw_locations(self, observations):
+        """
+        Batch version of decide_draw_location.
+
+        The draw decisions of all games are made before their target decisions, so a strategy that keeps state from
+        the draw to the target decision of a turn has to keep it per observation.
+
+        :param observations: Observation of every game, each game has its own observation
+        :return: list of the draw locations in the order of the observations
+        """
+        return [self.decide_draw_location(observation) for observation in observations]
+
+    def get_target_locations(self, observations, new_cards):
+        """
+        Batch version of get_target_location.
+
+        :param observations: Observation of every game
+        :param new_cards: drawn card of every game
+        :return: list of the SkyjoGameMoves in the order of the observations
+        """
+        return [self.get_target_location(observation, new_card)
+                for observation, new_card in zip(observations, new_cards)]
+
+    def close(self):
+        """
+        Releases the resources of the strategy, like the process of an external bot.
+        """
+        pass
+
 
 class RandomStrategy(Strategy):
     def __init__(self, player_name):
@@ -98,65 +145,77 @@ class RandomStrategy(Strategy):
         card_positions = calculate_possible_card_positions(4, 3)
         return random.choices(card_positions, k=2)
 
-    def decide_draw_location(self, player_grids, discard_stack):
+    def decide_draw_location(self, observation):
         return random.choice([DRAW_LOCATION.DRAW_STACK, DRAW_LOCATION.DISCARD_STACK])
 
-    def get_target_location(self, player_grids, discard_stack, new_card):
-        own_grid = player_grids[self.name]
-        column_count = len(own_grid.columns)
+    def get_target_location(self, observation, new_card):
+        column_count = observation.own_grid.get_column_count()
         position = random.choice(calculate_possible_card_positions(column_count, 3))
         replace_card = random.choice([True, False])
         return SkyjoGameMove(position[0], position[1], replace_card)
 
 
 class ManualStrategy(Strategy):
+    interactive = True
 
     def get_position_of_initial_card_flips(self):
         print("Which cards do you wish to start with?")
         # TODO: Read and parse user input!
 
-    def decide_draw_location(self, player_grids, discard_stack):
+    def decide_draw_location(self, observation):
         print("Where do you want to draw a card? (draw stack or discard stack)")
         # TODO: Read and parse user input!
 
-    def get_target_location(self, player_grids, discard_stack, new_card):
+    def get_target_location(self, observation, new_card):
         print("Which card do you want to replace with the card drawn card?")
         # TODO: Read and parse user input!
 
 
 class LocalOptimumStrategy(Strategy):
+    deterministic = True
+    parameters = ('discard_margin', 'replace_threshold')
+
+    def __init__(self, name, discard_margin=0.0, replace_threshold=0.0):
+        """
+        :param discard_margin: the discard top is taken if it is lower than the expected card value plus this
+        :param replace_threshold: a card is replaced if the drawn card is lower by more than this, otherwise the
+                                  drawn card is discarded and a hidden card revealed
+        """
+        super(LocalOptimumStrategy, self).__init__(name)
+        self.discard_margin = discard_margin
+        self.replace_threshold = replace_threshold
 
     def get_position_of_initial_card_flips(self):
         return [(1, 1), (2, 1)]
 
-    def decide_draw_location(self, player_grids, discard_stack):
-        expected_card_value = calculate_expected_card_value(player_grids, discard_stack)
+    def decide_draw_location(self, observation):
+        expected_card_value = observation.calculate_expected_card_value()
 
-        if discard_stack[-1] < expected_card_value:
+        if observation.get_discard_top() < expected_card_value + self.discard_margin:
             return DRAW_LOCATION.DISCARD_STACK
         else:
             return DRAW_LOCATION.DRAW_STACK
 
-    def get_target_location(self, player_grids, discard_stack, new_card):
-        own_grid = player_grids[self.name]
-        expected_card_value = calculate_expected_card_value(player_grids, discard_stack + [new_card])
+    def get_target_location(self, observation, new_card):
+        own_grid = observation.own_grid
+        expected_card_value = observation.calculate_expected_card_value(extra_card=new_card)
 
         hidden_location = None
 
-        first_card = own_grid.columns[0].cards[0]
+        first_card_value = own_grid.get_value(0, 0)
 
         best_move = (0, 0)
-        if first_card.is_revealed:
-            best_score = first_card.value - new_card
+        if first_card_value is not None:
+            best_score = first_card_value - new_card
         else:
             best_score = expected_card_value - new_card
 
-        for column_index in range(len(own_grid.columns)):
+        for column_index in range(own_grid.get_column_count()):
             for row_index in range(3):
-                card = own_grid.columns[column_index].cards[row_index]
+                card_value = own_grid.get_value(column_index, row_index)
                 location = (column_index, row_index)
-                if card.is_revealed:
-                    score = card.value - new_card
+                if card_value is not None:
+                    score = card_value - new_card
                 else:
                     hidden_location = (column_index, row_index)
                     score = expected_card_value - new_card
@@ -165,44 +224,77 @@ class LocalOptimumStrategy(Strategy):
                     best_score = score
                     best_move = location
 
-        if best_score > 0:
+        if best_score > self.replace_threshold:
             return SkyjoGameMove(best_move[0], best_move[1], replace_card=True)
         return SkyjoGameMove(hidden_location[0], hidden_location[1], replace_card=False)
 
 
-class ColumnFirstStrategy(Strategy):
-    def __init__(self):
-        self.columns_in_progress = [None, None, None, None]
+class ColumnFirstStrategy(LocalOptimumStrategy):
+    parameters = LocalOptimumStrategy.parameters + ('discard_threshold', 'max_seen_count')
 
-    def get_position_of_initial_card_flips(self):
-        return [(1, 1), (2, 1)]
+    def __init__(self, name, discard_margin=0.0, replace_threshold=0.0, discard_threshold=0, max_seen_count=5):
+        """
+        Collects cards of the same value in a column, so the column is removed.
+
+        A drawn card that matches a visible card of a column is placed in that column, if replacing one of its other
+        cards gains more than replace_threshold. Columns the card completes come first, since their removal also
+        takes the two matching cards off the score. Otherwise the card is placed like by LocalOptimumStrategy.
 
-    def decide_draw_location(self, player_grids, discard_stack):
-        own_grid = player_grids[self.name]
-        discard_stack_card = discard_stack[-1]
-        revealed_cards_statistics = create_card_statistic(discard_stack, player_grids)
-        expected_card_value = calculate_expected_card_value(player_grids, discard_stack)
+        :param discard_threshold: the discard top is always taken if it is at most this
+        :param max_seen_count: the discard top is taken if it is already in the own grid and at most this many cards
+                               of its value have been seen
+        """
+        super(ColumnFirstStrategy, self).__init__(name, discard_margin, replace_threshold)
+        self.discard_threshold = discard_threshold
+        self.max_seen_count = max_seen_count
+
+    def decide_draw_location(self, observation):
+        own_grid = observation.own_grid
+        discard_stack_card = observation.get_discard_top()
+        expected_card_value = observation.calculate_expected_card_value()
 
-        if discard_stack_card <= 0:
+        if discard_stack_card <= self.discard_threshold:
             return DRAW_LOCATION.DISCARD_STACK
 
         values = []
 
-        for column in own_grid.columns:
-            for card in column.cards:
-                if card.get_value() is not None:
-                    values.append(card.value)
+        for column in own_grid.to_list():
+            for value in column:
+                if value is not None:
+                    values.append(value)
 
-        if discard_stack_card in values and revealed_cards_statistics[discard_stack_card] <= 5:
+        if discard_stack_card in values and observation.get_seen_count(discard_stack_card) <= self.max_seen_count:
             return DRAW_LOCATION.DISCARD_STACK
 
-        if discard_stack_card < expected_card_value:
+        if discard_stack_card < expected_card_value + self.discard_margin:
             return DRAW_LOCATION.DISCARD_STACK
 
         return DRAW_LOCATION.DRAW_STACK
 
-    def get_target_location(self, player_grids, discard_stack, new_card):
-        # TODO: find possible columns
-        # TODO: if found: find best position (local optimum)
-        # TODO: else: calculate local optimum
-        return SkyjoGameMove(0, 0, True)
+    def get_target_location(self, observation, new_card):
+        own_grid = observation.own_grid
+        expected_card_value = observation.calculate_expected_card_value(extra_card=new_card)
+
+        best_rank = None
+        best_move = None
+        for column_index, column in enumerate(own_grid.to_list()):
+            match_count = column.count(new_card)
+            if match_count == 0:
+                continue
+
+            for row_index, card_value in enumerate(column):
+                if card_value == new_card:
+                    continue
+
+                score = (expected_card_value if card_value is None else card_value) - new_card
+                if match_count == 2:
+                    # the completed column is removed with the two matching cards
+                    score += 3 * new_card
+                rank = (match_count, score)
+                if score > self.replace_threshold and (best_rank is None or rank > best_rank):
+                    best_rank = rank
+                    best_move = (column_index, row_index)
+
+        if best_move is not None:
+            return SkyjoGameMove(best_move[0], best_move[1], replace_card=True)
+        return super(ColumnFirstStrategy, self).get_target_location(observation, new_card)
@@ -0,0 +1,113 @@
+import math
+import random
+import statistics
+from unittest import TestCase
+
+from skyjosimulator.simulation.aggregation import OnlineStatistic, ScoreAggregate, ScoreHistogram
+
+
+class OnlineStatisticTests(TestCase):
+    def test_add(self):
+        values = [random.randint(-20, 150) for _ in range(100)]
+        statistic = OnlineStatistic()
+
+        for value in values:
+            statistic.add(value)
+
+        self.assertAlmostEqual(statistic.mean, statistics.mean(values))
+        self.assertAlmostEqual(statistic.variance(), statistics.variance(values))
+
+    def test_merge(self):
+        values = [random.randint(-20, 150) for _ in range(100)]
+        statistic1 = OnlineStatistic()
+        statistic2 = OnlineStatistic()
+
+        for value in values[:30]:
+            statistic1.add(value)
+        for value in values[30:]:
+            statistic2.add(value)
+        statistic1.merge(statistic2)
+        statistic1.merge(OnlineStatistic())
+
+        self.assertEqual(statistic1.count, 100)
+        self.assertAlmostEqual(statistic1.mean, statistics.mean(values))
+        self.assertAlmostEqual(statistic1.standard_deviation(), statistics.stdev(values))
+
+
+class ScoreHistogramTests(TestCase):
+    def test_add(self):
+        histogram = ScoreHistogram()
+
+        histogram.add(-30)
+        histogram.add(-100)
+        histogram.add(4)
+        histogram.add(5)
+        histogram.add(1000)
+
+        self.assertEqual(histogram.bins[0], 2)
+        self.assertEqual(histogram.bins[6], 1)
+        self.assertEqual(histogram.bins[7], 1)
+        self.assertEqual(histogram.bins[-1], 1)
+        self.assertEqual(ScoreHistogram.get_bin_range(7), (5, 10))
+
+
+class ScoreAggregateTests(TestCase):
+    def test_add_game(self):
+        aggregate = ScoreAggregate(['player1', 'player2', 'player3'])
+
+        aggregate.add_game({'player1': 10, 'player2': 20, 'player3': 30})
+        aggregate.add_game({'player1': 5, 'player2': 5, 'player3': 30}, doubled_player='player3')
+
+        self.assertEqual(aggregate.game_count, 2)
+        self.assertEqual(aggregate.score_sums, {'player1': 15, 'player2': 25, 'player3': 60})
+        self.assertEqual(aggregate.win_counts, {'player1': 1, 'player2': 0, 'player3': 0})
+        self.assertEqual(aggregate.tie_counts, {'player1': 1, 'player2': 1, 'player3': 0})
+        self.assertEqual(aggregate.doubled_counts, {'player1': 0, 'player2': 0, 'player3': 1})
+        self.assertEqual(aggregate.average_scores(), {'player1': 7.5, 'player2': 12.5, 'player3': 30})
+        self.assertAlmostEqual(aggregate.score_statistics['player2'].variance(), 112.5)
+
+    def test_merge(self):
+        aggregate1 = ScoreAggregate(['player1', 'player2'])
+        aggregate2 = ScoreAggregate(['player1', 'player2'])
+
+        aggregate1.add_game({'player1': 10, 'player2': 20})
+        aggregate2.add_game({'player1': 30, 'player2': -2}, doubled_player='player1')
+
+        aggregate1.merge(aggregate2)
+
+        self.assertEqual(aggregate1.game_count, 2)
+        self.assertEqual(aggregate1.score_sums, {'player1': 40, 'player2': 18})
+        self.assertEqual(aggregate1.win_counts, {'player1': 1, 'player2': 1})
+        self.assertEqual(aggregate1.doubled_counts, {'player1': 1, 'player2': 0})
+        self.assertEqual(sum(aggregate1.histograms['player1'].bins), 2)
+        self.assertAlmostEqual(aggregate1.score_statistics['player1'].variance(), 200)
+
+    def test_pair_differences(self):
+        aggregate = ScoreAggregate(['player1', 'player2', 'player3'])
+
+        aggregate.add_game({'player1': 10, 'player2': 20, 'player3': 30})
+        aggregate.add_game({'player1': 5, 'player2': 5, 'player3': 30})
+        aggregate.add_game({'player1': 25, 'player2': 3, 'player3': 30})
+
+        self.assertAlmostEqual(aggregate.get_score_difference('player1', 'player2').mean, 4)
+        self.assertAlmostEqual(aggregate.get_score_difference('player2', 'player1').mean, -4)
+        self.assertAlmostEqual(aggregate.get_score_difference('player2', 'player1').variance(), 268)
+        self.assertAlmostEqual(aggregate.get_win_difference('player1', 'player2').mean, 0)
+        self.assertAlmostEqual(aggregate.get_win_difference('player3', 'player1').mean, -1 / 3)
+
+    def test_dict_conversion(self):
+        aggregate = ScoreAggregate(['player1', 'player2'])
+        aggregate.add_game({'player1': 10, 'player2': 20}, doubled_player='player2')
+        aggregate.add_game({'player1': 3, 'player2': 3})
+
+        restored = ScoreAggregate.from_dict(aggregate.to_dict())
+
+        self.assertEqual(restored.to_dict(), aggregate.to_dict())
+        self.assertEqual(restored.summarize(), aggregate.summarize())
+
+    def test_empty_aggregate(self):
+        aggregate = ScoreAggregate(['player1', 'player2'])
+
+        self.assertTrue(math.isnan(aggregate.average_scores()['player1']))
+        self.assertTrue(all(math.isnan(aggregate.summarize()['player2'][name])
+                            for name in ('mean', 'win_rate', 'tie_rate', 'doubled_rate')))
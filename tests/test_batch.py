@@ -0,0 +1,123 @@
+from unittest import TestCase
+
+import numpy as np
+
+from skyjosimulator.game.batch import BatchSkyjoGame, DECK_SIZE, count_card_values
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.batch import aggregate_batch_simulation, calculate_ks_statistic, create_score_aggregate, \
+    cross_check, run_batch_simulation
+from skyjosimulator.strategy.batch import BatchLocalOptimumStrategy, BatchRandomStrategy
+
+
+def create_game(game_count=200, seed=3):
+    game = BatchSkyjoGame([BatchLocalOptimumStrategy(), BatchRandomStrategy(), BatchLocalOptimumStrategy()],
+                          game_count, np.random.default_rng(seed))
+    game.prepare_game()
+    return game
+
+
+def count_cards_in_play(game):
+    in_grids = (~game.removed).sum(axis=(1, 2))
+    return game.draw_size + game.discard_size + in_grids
+
+
+class BatchSkyjoGameTests(TestCase):
+    def test_prepare_game(self):
+        game = create_game()
+
+        self.assertTrue(np.all(game.draw_size == DECK_SIZE - 36))
+        self.assertTrue(np.all(game.values[:, 0] == game.draw_stack[:, -12:]))
+        self.assertTrue(np.all(game.values[:, 2] == game.draw_stack[:, -36:-24]))
+
+    def test_start_game(self):
+        game = create_game()
+        scores = game.start()
+
+        self.assertEqual(scores.shape, (200, 3))
+        self.assertFalse(game.active.any())
+        self.assertTrue(np.all(game.finishing_player >= 0))
+        self.assertTrue(np.all(game.revealed[np.arange(200), game.finishing_player]))
+
+    def test_seen_card_counts_are_maintained(self):
+        game = create_game()
+        games = np.arange(game.game_count)
+        game.flip_starting_cards(games)
+        game.initialize_discard_stack(games)
+        game.set_starting_player(games)
+
+        for _ in range(40):
+            game.execute_turn()
+
+        visible = (game.revealed & ~game.removed).reshape(game.game_count, -1)
+        expected_counts = count_card_values(game.values.reshape(game.game_count, -1), visible)
+        expected_counts += count_card_values(game.discard_stack,
+                                             np.arange(DECK_SIZE) < game.discard_size[:, None])
+
+        self.assertTrue(np.array_equal(game.seen_card_counts, expected_counts))
+
+    def test_removed_cards_leave_the_game(self):
+        game = create_game()
+        game.start()
+
+        removed_columns = game.removed.sum(axis=(1, 2))
+        self.assertTrue(removed_columns.any())
+        self.assertTrue(np.all(count_cards_in_play(game) == DECK_SIZE - removed_columns))
+
+    def test_remove_columns_with_identical_cards(self):
+        game = create_game(game_count=2)
+        game.values[:, 0, :6] = [4, 4, 4, 7, 7, 7]
+        game.revealed[0, 0, :6] = True
+        game.revealed[1, 0, :3] = True
+
+        game.remove_columns_with_identical_cards(np.arange(2), 0)
+
+        self.assertEqual(game.removed[0, 0].tolist(), [True] * 6 + [False] * 6)
+        self.assertEqual(game.removed[1, 0].tolist(), [True] * 3 + [False] * 9)
+
+    def test_finisher_score_is_doubled(self):
+        game = create_game(game_count=2)
+        game.values[:, :, :] = 1
+        game.values[:, 1, :] = 0
+        game.revealed[:, :, :] = True
+        game.finishing_player[:] = [0, 1]
+
+        self.assertEqual(game.evaluate_scores().tolist(), [[24, 0, 12], [12, 0, 12]])
+
+
+class BatchSimulationTests(TestCase):
+    def test_create_score_aggregate(self):
+        scores = np.array([[1, 5], [3, 3], [18, 2]])
+        aggregate = create_score_aggregate(['player1', 'player2'], scores, np.array([-1, -1, 0]))
+
+        expected_aggregate = ScoreAggregate(['player1', 'player2'])
+        expected_aggregate.add_game({'player1': 1, 'player2': 5})
+        expected_aggregate.add_game({'player1': 3, 'player2': 3})
+        expected_aggregate.add_game({'player1': 18, 'player2': 2}, doubled_player='player1')
+
+        self.assertEqual(aggregate.game_count, 3)
+        self.assertEqual(aggregate.score_sums, expected_aggregate.score_sums)
+        self.assertEqual(aggregate.win_counts, expected_aggregate.win_counts)
+        self.assertEqual(aggregate.tie_counts, expected_aggregate.tie_counts)
+        self.assertEqual(aggregate.doubled_counts, expected_aggregate.doubled_counts)
+        for player in ['player1', 'player2']:
+            self.assertEqual(aggregate.histograms[player].bins, expected_aggregate.histograms[player].bins)
+            self.assertAlmostEqual(aggregate.score_statistics[player].variance(),
+                                   expected_aggregate.score_statistics[player].variance())
+
+    def test_aggregate_batch_simulation(self):
+        aggregate = aggregate_batch_simulation(['local', 'local'], 250, seed=4, batch_size=100)
+        scores = run_batch_simulation(['local', 'local'], 250, seed=4, batch_size=100)
+
+        self.assertEqual(aggregate.game_count, 250)
+        self.assertEqual(aggregate.score_sums['player2'], scores[:, 1].sum())
+        self.assertGreater(aggregate.doubled_counts['player1'], 0)
+
+    def test_ks_statistic(self):
+        self.assertEqual(calculate_ks_statistic(np.array([1, 2, 3]), np.array([1, 2, 3])), 0.0)
+        self.assertEqual(calculate_ks_statistic(np.array([1, 1]), np.array([5, 5])), 1.0)
+
+    def test_cross_check(self):
+        report = cross_check(['local', 'random'], 300, seed=11)
+
+        self.assertEqual(set(report), {'player1', 'player2'})
+        self.assertTrue(all(comparison['consistent'] for comparison in report.values()))
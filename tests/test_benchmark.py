@@ -0,0 +1,62 @@
+import io
+from unittest import TestCase
+from unittest.mock import patch
+
+from skyjosimulator.benchmark import BENCHMARKS, compare_with_baseline, run_benchmarks, suite
+from skyjosimulator.benchmark.__main__ import main as benchmark_main
+
+
+class BenchmarkTests(TestCase):
+    def test_run_benchmarks(self):
+        report = run_benchmarks(['micro.calculate_scores', 'macro.games.local-random'], min_time=0.01, repeat=1)
+
+        self.assertEqual(set(report['results']), {'micro.calculate_scores', 'macro.games.local-random'})
+        self.assertGreater(report['results']['macro.games.local-random']['calls_per_second'], 0)
+        self.assertIn('python', report['environment'])
+
+    def test_empty_selection_runs_nothing(self):
+        self.assertEqual(run_benchmarks([], min_time=0.01, repeat=1)['results'], {})
+
+    def test_filter_without_match_is_rejected(self):
+        with self.assertRaises(SystemExit), patch('sys.stderr', io.StringIO()):
+            benchmark_main(['-k', 'missing'])
+
+    def test_all_benchmarks_can_be_set_up(self):
+        for name, benchmark in BENCHMARKS.items():
+            benchmark()()
+
+    def test_apply_move_keeps_the_state(self):
+        games = []
+        create_midgame = suite.create_midgame
+
+        def create_recorded_midgame(*args):
+            games.append(create_midgame(*args))
+            return games[-1]
+
+        with patch.object(suite, 'create_midgame', side_effect=create_recorded_midgame):
+            run = suite.benchmark_apply_move()
+        state = games[0].state
+        expected = (list(state.draw_stack), list(state.discard_stack), state.player_grids['player1'].to_list(),
+                    list(state.card_statistic.counts))
+
+        for _ in range(100):
+            run()
+
+        self.assertEqual((state.draw_stack, state.discard_stack, state.player_grids['player1'].to_list(),
+                          list(state.card_statistic.counts)), expected)
+
+    def test_compare_with_baseline(self):
+        baseline = {'results': {
+            'fast': {'seconds_per_call': 1.0},
+            'slow': {'seconds_per_call': 1.0},
+        }}
+        report = {'results': {
+            'fast': {'seconds_per_call': 1.05},
+            'slow': {'seconds_per_call': 1.5},
+            'new': {'seconds_per_call': 3.0},
+        }}
+
+        regressions = compare_with_baseline(report, baseline, threshold=0.1)
+
+        self.assertEqual([name for name, _, _, _ in regressions], ['slow'])
+        self.assertAlmostEqual(regressions[0][3], 0.5)
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from skyjosimulator.benchmark.suite import create_midgame
+from skyjosimulator.simulation.runner import run_simulation
+from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.cache import CachedStrategy, CacheStatistics, DecisionCache, encode_observation
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+    ('player3', 'local'),
+]
+
+
+class DecisionCacheTests(TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = DecisionCache(max_size=2)
+        cache.put(b'a', 1)
+        cache.put(b'b', 2)
+        cache.get(b'a')
+        cache.put(b'c', 3)
+
+        self.assertIsNone(cache.get(b'b'))
+        self.assertEqual(cache.get(b'a'), 1)
+        self.assertEqual(cache.get(b'c'), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_encoding_depends_on_drawn_card_but_not_on_player(self):
+        game = create_midgame(('local', 'local'))
+        observation = game.create_observation()
+
+        self.assertNotEqual(encode_observation(observation), encode_observation(observation, 5))
+        self.assertEqual(encode_observation(observation, -2), encode_observation(observation, -2))
+
+    def test_cached_strategy_makes_the_same_decisions(self):
+        game = create_midgame(('local', 'local'))
+        observation = game.create_observation()
+        strategy = game.current_player
+        cached_strategy = CachedStrategy(strategy, DecisionCache())
+
+        for _ in range(2):
+            self.assertEqual(cached_strategy.decide_draw_location(observation),
+                             strategy.decide_draw_location(observation))
+            move = cached_strategy.get_target_location(observation, 3)
+            expected_move = strategy.get_target_location(observation, 3)
+            self.assertEqual((move.column, move.row, move.replace_card),
+                             (expected_move.column, expected_move.row, expected_move.replace_card))
+
+        self.assertEqual(cached_strategy.cache.hits, 2)
+
+    def test_only_deterministic_strategies_are_cached(self):
+        cache = DecisionCache()
+
+        self.assertIsInstance(create_strategy('player1', 'local', cache), CachedStrategy)
+        self.assertNotIsInstance(create_strategy('player1', 'random', cache), CachedStrategy)
+        with self.assertRaises(ValueError):
+            CachedStrategy(create_strategy('player1', 'random'), cache)
+
+    def test_cache_does_not_change_results(self):
+        cache_statistics = CacheStatistics()
+        cached = run_simulation(PLAYER_CONFIGS, 20, master_seed=3, workers=2, cache_size=1000,
+                                cache_statistics=cache_statistics)
+        uncached = run_simulation(PLAYER_CONFIGS, 20, master_seed=3, workers=1)
+
+        self.assertEqual(cached.score_sums, uncached.score_sums)
+        self.assertEqual(list(cache_statistics.counts), ['local'])
+        self.assertGreater(sum(cache_statistics.counts['local']), 0)
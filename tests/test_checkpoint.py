@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from skyjosimulator.simulation import checkpoint
+from skyjosimulator.simulation.checkpoint import run_sharded_simulation
+from skyjosimulator.simulation.runner import run_simulation
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+
+
+class ShardedSimulationTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_result_equals_unsharded_simulation(self):
+        sharded = run_sharded_simulation(PLAYER_CONFIGS, 45, master_seed=3, shard_size=10, workers=1)
+        unsharded = run_simulation(PLAYER_CONFIGS, 45, master_seed=3, workers=1)
+
+        self.assertEqual(sharded.game_count, 45)
+        self.assertEqual(sharded.score_sums, unsharded.score_sums)
+        self.assertEqual(sharded.win_counts, unsharded.win_counts)
+
+    def test_checkpoint_is_written(self):
+        run_sharded_simulation(PLAYER_CONFIGS, 25, shard_size=10, checkpoint_path=self.checkpoint_path, workers=1)
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            data = json.load(checkpoint_file)
+
+        self.assertEqual(sorted(data['shards']), ['0', '1', '2'])
+        self.assertEqual(data['shards']['2']['game_count'], 5)
+
+    def test_resume_skips_finished_shards(self):
+        run_sharded_simulation(PLAYER_CONFIGS, 25, shard_size=10, checkpoint_path=self.checkpoint_path, workers=1)
+
+        with patch.object(checkpoint, 'play_games', wraps=checkpoint.play_games) as play_games:
+            resumed = run_sharded_simulation(PLAYER_CONFIGS, 40, shard_size=10,
+                                             checkpoint_path=self.checkpoint_path, workers=1)
+
+        # the incomplete shard 2 is played again, shards 0 and 1 are reused
+        self.assertEqual([call.args[1] for call in play_games.call_args_list], [20, 30])
+
+        uninterrupted = run_sharded_simulation(PLAYER_CONFIGS, 40, shard_size=10, workers=1)
+        self.assertEqual(resumed.score_sums, uninterrupted.score_sums)
+        self.assertEqual(resumed.win_counts, uninterrupted.win_counts)
+
+    def test_interrupted_run_keeps_finished_shards(self):
+        calls = []
+        play_games = checkpoint.play_games
+
+        def interrupted_play_games(*args):
+            if len(calls) == 2:
+                raise KeyboardInterrupt()
+            calls.append(args)
+            return play_games(*args)
+
+        with patch.object(checkpoint, 'play_games', side_effect=interrupted_play_games):
+            with self.assertRaises(KeyboardInterrupt):
+                run_sharded_simulation(PLAYER_CONFIGS, 40, shard_size=10, checkpoint_path=self.checkpoint_path,
+                                       workers=1, checkpoint_interval=3600)
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            self.assertEqual(sorted(json.load(checkpoint_file)['shards']), ['0', '1'])
+
+    def test_checkpoint_of_different_simulation_is_rejected(self):
+        run_sharded_simulation(PLAYER_CONFIGS, 10, shard_size=10, checkpoint_path=self.checkpoint_path, workers=1)
+
+        with self.assertRaises(ValueError):
+            run_sharded_simulation(PLAYER_CONFIGS, 10, master_seed=1, shard_size=10,
+                                   checkpoint_path=self.checkpoint_path, workers=1)
+
+    def test_checkpoint_of_larger_simulation_is_rejected(self):
+        run_sharded_simulation(PLAYER_CONFIGS, 30, shard_size=10, checkpoint_path=self.checkpoint_path, workers=1)
+
+        for game_count in (20, 25):
+            with self.assertRaises(ValueError):
+                run_sharded_simulation(PLAYER_CONFIGS, game_count, shard_size=10,
+                                       checkpoint_path=self.checkpoint_path, workers=1)
+
+    def test_checkpoint_of_other_rules_is_rejected(self):
+        run_sharded_simulation(PLAYER_CONFIGS, 10, shard_size=10, checkpoint_path=self.checkpoint_path, workers=1)
+
+        with patch.object(checkpoint, 'RULES_VERSION', checkpoint.RULES_VERSION + 1):
+            with self.assertRaises(ValueError):
+                run_sharded_simulation(PLAYER_CONFIGS, 10, shard_size=10, checkpoint_path=self.checkpoint_path,
+                                       workers=1)
@@ -0,0 +1,99 @@
+import io
+import os
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from skyjosimulator.cli import main
+from skyjosimulator.strategy.registry import PLUGIN_VARIABLE, StrategyRegistry
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy, RandomStrategy
+
+HEAVY_MODULES = ('numpy', 'multiprocessing', 'concurrent.futures', 'subprocess', 'importlib.metadata',
+                 'skyjosimulator.strategy.mcts')
+
+
+def run_command(*argv):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        main(list(argv))
+    return output.getvalue()
+
+
+class StrategyRegistryTests(TestCase):
+    def test_strategies_are_imported_on_lookup(self):
+        registry = StrategyRegistry({
+            'local': LocalOptimumStrategy,
+            'random': 'skyjosimulator.strategy.strategies:RandomStrategy',
+        })
+
+        self.assertIs(registry['local'], LocalOptimumStrategy)
+        self.assertIsInstance(registry._targets['random'], str)
+        self.assertIs(registry['random'], RandomStrategy)
+        self.assertIs(registry._targets['random'], RandomStrategy)
+
+    def test_plugins_from_environment(self):
+        plugins = 'plugin=skyjosimulator.strategy.strategies:RandomStrategy, local=tests.missing:Strategy'
+        with patch.dict(os.environ, {PLUGIN_VARIABLE: plugins}):
+            registry = StrategyRegistry({'local': LocalOptimumStrategy})
+
+            self.assertIn('plugin', registry)
+            self.assertIs(registry['plugin'], RandomStrategy)
+            # a plugin never replaces a built-in strategy
+            self.assertIs(registry['local'], LocalOptimumStrategy)
+            self.assertEqual(sorted(registry), ['local', 'plugin'])
+
+    def test_unknown_strategy(self):
+        registry = StrategyRegistry({'local': LocalOptimumStrategy})
+
+        self.assertNotIn('unknown', registry)
+        with self.assertRaises(KeyError):
+            registry['unknown']
+
+
+class CommandLineTests(TestCase):
+    def test_simulate(self):
+        output = run_command('simulate', 'local', 'random', '-n', '5', '-w', '1')
+
+        self.assertIn("'player1'", output)
+        self.assertIn('win_rate', output)
+
+    def test_simulate_is_the_default_command(self):
+        self.assertEqual(run_command('local', 'random', '-n', '5', '-w', '1'),
+                         run_command('simulate', 'local', 'random', '-n', '5', '-w', '1'))
+
+    def test_sweep(self):
+        output = run_command('sweep', 'local', 'random', '-p', 'discard_margin=0,1', '-n', '5', '-w', '1')
+
+        self.assertIn('discard_margin=0', output)
+        self.assertIn('discard_margin=1', output)
+
+    def test_strategies(self):
+        output = run_command('strategies')
+
+        self.assertIn('local', output)
+        self.assertIn('discard_margin', output)
+
+    def test_invalid_strategy(self):
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            main(['simulate', 'unknown', 'random'])
+
+    def test_seed_that_cannot_be_recorded(self):
+        path = os.path.join(os.path.dirname(__file__), 'missing', 'games.log')
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            main(['simulate', 'local', 'random', '-n', '2', '-s', str(2 ** 31), '--record', path])
+
+    def test_invalid_game_count(self):
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            main(['simulate', 'local', 'random', '-n', '0'])
+
+    def test_first_game_imports_no_heavy_modules(self):
+        code = ('import sys\n'
+                'from skyjosimulator.cli import main\n'
+                'main(["local", "random", "-n", "1", "-w", "1"])\n'
+                'print(",".join(module for module in {!r} if module in sys.modules))'.format(HEAVY_MODULES))
+        output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+
+        self.assertEqual(output.splitlines()[-1], '')
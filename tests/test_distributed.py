@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client
+from unittest import TestCase
+
+from skyjosimulator.simulation.checkpoint import run_sharded_simulation
+from skyjosimulator.simulation.distributed import Coordinator, parse_address, run_worker, start_workers
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+AUTHKEY = b'test'
+
+
+class DistributedSimulationTests(TestCase):
+    def create_coordinator(self, game_count=45, **kwargs):
+        return Coordinator(PLAYER_CONFIGS, game_count, master_seed=3, shard_size=10, address=('localhost', 0),
+                           authkey=AUTHKEY, poll_interval=0.05, **kwargs)
+
+    def start_coordinator(self, coordinator):
+        results = []
+        thread = threading.Thread(target=lambda: results.append(coordinator.run()), daemon=True)
+        thread.start()
+        return thread, results
+
+    def assert_equals_sharded_simulation(self, result, game_count=45):
+        expected = run_sharded_simulation(PLAYER_CONFIGS, game_count, master_seed=3, shard_size=10, workers=1)
+        self.assertEqual(result.to_dict(), expected.to_dict())
+
+    def test_local_worker_processes(self):
+        coordinator = self.create_coordinator()
+        processes = start_workers(coordinator.address, 2, authkey=AUTHKEY, connect_timeout=5)
+
+        result = coordinator.run()
+        for process in processes:
+            process.join(5)
+
+        self.assert_equals_sharded_simulation(result)
+        self.assertTrue(all(process.exitcode == 0 for process in processes))
+
+    def test_shard_of_disconnected_worker_is_reassigned(self):
+        coordinator = self.create_coordinator()
+        thread, results = self.start_coordinator(coordinator)
+
+        with Client(coordinator.address, authkey=AUTHKEY) as connection:
+            connection.send(('request',))
+            self.assertEqual(connection.recv()[0], 'shard')
+
+        self.assertEqual(run_worker(coordinator.address, AUTHKEY), 5)
+        thread.join(5)
+
+        self.assertEqual(coordinator.reassigned_count, 1)
+        self.assert_equals_sharded_simulation(results[0])
+
+    def test_expired_lease_is_reassigned(self):
+        coordinator = self.create_coordinator(lease_timeout=0.1)
+        thread, results = self.start_coordinator(coordinator)
+
+        # the worker keeps its connection, but never returns the shard
+        with Client(coordinator.address, authkey=AUTHKEY) as connection:
+            connection.send(('request',))
+            connection.recv()
+
+            run_worker(coordinator.address, AUTHKEY)
+            thread.join(5)
+
+        self.assertGreaterEqual(coordinator.reassigned_count, 1)
+        self.assert_equals_sharded_simulation(results[0])
+
+    def test_late_result_of_expired_lease_is_accepted(self):
+        coordinator = self.create_coordinator(game_count=10, lease_timeout=0.1)
+        thread, results = self.start_coordinator(coordinator)
+
+        with Client(coordinator.address, authkey=AUTHKEY) as connection:
+            connection.send(('request',))
+            shard_index = connection.recv()[1]
+            time.sleep(0.3)
+            expected = run_sharded_simulation(PLAYER_CONFIGS, 10, master_seed=3, shard_size=10, workers=1)
+            connection.send(('result', shard_index, expected.to_dict()))
+            self.assertEqual(connection.recv(), ('done',))
+
+        thread.join(5)
+        self.assert_equals_sharded_simulation(results[0], game_count=10)
+
+    def test_checkpoint_of_shorter_run_is_continued(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, 'checkpoint.json')
+            run_sharded_simulation(PLAYER_CONFIGS, 20, master_seed=3, shard_size=10, checkpoint_path=checkpoint_path,
+                                   workers=1)
+
+            with self.assertRaises(ValueError):
+                self.create_coordinator(game_count=10, checkpoint_path=checkpoint_path)
+
+            coordinator = self.create_coordinator(game_count=30, checkpoint_path=checkpoint_path)
+            thread, results = self.start_coordinator(coordinator)
+            self.assertEqual(run_worker(coordinator.address, AUTHKEY), 1)
+            thread.join(5)
+
+        self.assert_equals_sharded_simulation(results[0], game_count=30)
+
+    def test_partial_shard_of_checkpoint_is_completed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, 'checkpoint.json')
+            run_sharded_simulation(PLAYER_CONFIGS, 15, master_seed=3, shard_size=10, checkpoint_path=checkpoint_path,
+                                   workers=1)
+
+            coordinator = self.create_coordinator(game_count=20, checkpoint_path=checkpoint_path)
+            self.assertFalse(coordinator.is_finished())
+            thread, results = self.start_coordinator(coordinator)
+            self.assertEqual(run_worker(coordinator.address, AUTHKEY), 1)
+            thread.join(5)
+
+        self.assertEqual(results[0].game_count, 20)
+        self.assert_equals_sharded_simulation(results[0], game_count=20)
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('example.org:6017'), ('example.org', 6017))
+        self.assertEqual(parse_address(':6017'), ('localhost', 6017))
@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from skyjosimulator.simulation.duplicate import create_rotations, play_duplicate_deals, run_duplicate_simulation
+
+
+class DuplicateTests(TestCase):
+    def test_create_rotations(self):
+        rotations = create_rotations([('player1', 'local'), ('player2', 'random'), ('player3', 'column')])
+
+        self.assertEqual(len(rotations), 3)
+        for seat in range(3):
+            self.assertEqual(sorted(rotation[seat][0] for rotation in rotations), ['player1', 'player2', 'player3'])
+
+    def test_every_deal_is_played_in_every_rotation(self):
+        result = play_duplicate_deals([('player1', 'local'), ('player2', 'random'), ('player3', 'local')], 0, 10, 1)
+
+        self.assertEqual(result.deal_count, 10)
+        self.assertEqual(result.games.game_count, 30)
+        self.assertEqual(sum(result.deals.score_sums.values()), sum(result.games.score_sums.values()))
+
+    def test_equal_strategies_have_equal_deal_scores(self):
+        result = play_duplicate_deals([('player1', 'local'), ('player2', 'local')], 0, 20, 2)
+
+        self.assertEqual(result.get_difference('player1', 'player2'), (0.0, 0.0))
+        self.assertIsNone(result.get_variance_reduction('player1', 'player2'))
+        self.assertGreater(result.games.get_score_difference('player1', 'player2').variance(), 0)
+
+    def test_deal_differences_vary_less_than_game_differences(self):
+        result = play_duplicate_deals([('player1', 'local'), ('player2', 'column')], 0, 200, 3)
+
+        deal_variance = result.deals.get_score_difference('player1', 'player2').variance()
+        self.assertLess(deal_variance / 2, result.games.get_score_difference('player1', 'player2').variance())
+        # the baseline are unpaired games, whose scores of the two players come from different deals
+        unpaired_variance = (result.games.score_statistics['player1'].variance()
+                             + result.games.score_statistics['player2'].variance())
+        self.assertAlmostEqual(result.get_variance_reduction('player1', 'player2'),
+                               unpaired_variance * 2 / deal_variance)
+        self.assertIn('player1 - player2', result.create_report())
+
+    def test_chunks_merge_to_the_same_result(self):
+        player_configs = [('player1', 'local'), ('player2', 'random')]
+        result = play_duplicate_deals(player_configs, 0, 4, 5)
+        result.merge(play_duplicate_deals(player_configs, 4, 6, 5))
+
+        expected = run_duplicate_simulation(player_configs, 10, master_seed=5, workers=1)
+        self.assertEqual(result.deals.score_sums, expected.deals.score_sums)
+        self.assertEqual(result.games.score_sums, expected.games.score_sums)
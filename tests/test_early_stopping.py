@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from skyjosimulator.simulation.early_stopping import compare_until_separated, get_critical_value
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+
+
+class EarlyStoppingTests(TestCase):
+    def test_lopsided_matchup_stops_after_first_batch(self):
+        result = compare_until_separated(PLAYER_CONFIGS, 'player1', 'player2', batch_size=40, max_games=4000,
+                                         workers=1)
+
+        self.assertEqual(result.stop_reason, 'significant')
+        self.assertEqual(result.game_count, 40)
+        self.assertTrue(result.is_significant())
+        self.assertLess(result.confidence_interval[1], 0)
+
+    def test_equal_players_stop_at_budget(self):
+        result = compare_until_separated([('player1', 'local'), ('player2', 'local')], 'player1', 'player2',
+                                         metric='win_rate', alpha=0.0001, batch_size=50, max_games=100,
+                                         workers=1)
+
+        self.assertEqual(result.stop_reason, 'budget')
+        self.assertEqual(result.game_count, 100)
+
+    def test_stop_at_precision(self):
+        result = compare_until_separated(PLAYER_CONFIGS, 'player2', 'player1', precision=8, batch_size=40,
+                                         max_games=4000, workers=1)
+
+        self.assertEqual(result.stop_reason, 'precision')
+        self.assertLessEqual(result.half_width, 8)
+        self.assertGreater(result.difference, 0)
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            compare_until_separated(PLAYER_CONFIGS, 'player1', 'player2', metric='rank', workers=1)
+
+    def test_critical_value_grows_with_number_of_looks(self):
+        self.assertAlmostEqual(get_critical_value(0.05, 1), 1.959964, places=5)
+        self.assertGreater(get_critical_value(0.05, 10), get_critical_value(0.05, 1))
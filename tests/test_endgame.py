@@ -0,0 +1,171 @@
+from fractions import Fraction
+from itertools import permutations
+from unittest import TestCase
+
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.benchmark.suite import create_game
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.simulation.runner import play_games
+from skyjosimulator.strategy import STRATEGIES
+from skyjosimulator.strategy.endgame import CARD_VALUES, EndgameSolver, EndgameStrategy, create_position_key
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy
+
+COLUMNS = [[5, 5, None], [None, 3, 12], [-1, None, 0]]
+# a small pool of unseen cards, so every order of the hidden cards can be enumerated
+POOL = [5, 5, -2, 12, 3, 0]
+
+
+def count_cards(cards):
+    return tuple(cards.count(value) for value in CARD_VALUES)
+
+
+def calculate_expected_score(columns, card, pool, target):
+    """
+    Expected final score of a target by enumerating every order of the unseen cards.
+
+    Like in the game, a column is only removed if its cards are equal and visible after the move, the cards revealed
+    at the end do not remove columns.
+    """
+    column_index, row_index, replace_card = target
+    hidden = [(column, row) for column in range(len(columns)) for row in range(3) if columns[column][row] is None]
+    scores = []
+    for cards in permutations(pool, len(hidden)):
+        final_columns = [list(column) for column in columns]
+        for (column, row), value in zip(hidden, cards):
+            final_columns[column][row] = value
+        if replace_card:
+            final_columns[column_index][row_index] = card
+        target_column = final_columns[column_index]
+        visible = [value is not None or row == row_index for row, value in enumerate(columns[column_index])]
+        if all(visible) and target_column[0] == target_column[1] == target_column[2]:
+            del final_columns[column_index]
+        scores.append(sum(sum(column) for column in final_columns))
+    return Fraction(sum(scores), len(scores))
+
+
+def get_targets(columns):
+    targets = []
+    for column_index, column in enumerate(columns):
+        for row_index, value in enumerate(column):
+            targets.append((column_index, row_index, True))
+            if value is None:
+                targets.append((column_index, row_index, False))
+    return targets
+
+
+class EndgameSolverTests(TestCase):
+    def test_best_target_is_exact(self):
+        for card in (5, 3, -2, 12):
+            expected = min(calculate_expected_score(COLUMNS, card, POOL, target) for target in get_targets(COLUMNS))
+
+            score, target = EndgameSolver.get_best_target(COLUMNS, card, count_cards(POOL))
+
+            self.assertAlmostEqual(score, float(expected))
+            self.assertAlmostEqual(float(calculate_expected_score(COLUMNS, card, POOL, target)), score)
+
+    def test_discard_stack_card_is_placed(self):
+        for card in (5, 3, -2, 12):
+            expected = min(calculate_expected_score(COLUMNS, card, POOL, target)
+                           for target in get_targets(COLUMNS) if target[2])
+
+            score, target = EndgameSolver.get_best_target(COLUMNS, card, count_cards(POOL), allow_reveal=False)
+
+            self.assertAlmostEqual(score, float(expected))
+            self.assertTrue(target[2])
+
+    def test_draw_stack_score_is_exact(self):
+        expected = 0
+        for index, card in enumerate(POOL):
+            remaining = POOL[:index] + POOL[index + 1:]
+            expected += min(calculate_expected_score(COLUMNS, card, remaining, target)
+                            for target in get_targets(COLUMNS))
+        expected /= len(POOL)
+
+        self.assertAlmostEqual(EndgameSolver().get_draw_stack_score(COLUMNS, count_cards(POOL)), float(expected))
+
+    def test_draw_stack_score_is_memoized(self):
+        solver = EndgameSolver()
+        score = solver.get_draw_stack_score(COLUMNS, count_cards(POOL))
+        # the same grid with other column and row orders
+        permuted = [[12, None, 3], [5, None, 5], [0, -1, None]]
+
+        self.assertEqual(create_position_key(permuted, count_cards(POOL)),
+                         create_position_key(COLUMNS, count_cards(POOL)))
+        self.assertEqual(solver.get_draw_stack_score(permuted, count_cards(POOL)), score)
+        self.assertEqual((solver.memo.hits, solver.memo.misses), (1, 1))
+
+
+class EndgameStrategyTests(TestCase):
+    def test_registered(self):
+        self.assertIs(STRATEGIES['endgame'], EndgameStrategy)
+
+    def test_plays_games(self):
+        result = play_games([('player1', 'endgame'), ('player2', 'local'), ('player3', 'endgame')], 0, 20, 4)
+
+        self.assertEqual(result.game_count, 20)
+
+    def test_reveal_is_only_chosen_for_draw_stack_cards(self):
+        game = create_game(('endgame', 'local'))
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+        # revealing the hidden card can complete the column of 5s, placing a 12 is expensive everywhere
+        grid = game.state.player_grids[game.current_player.name]
+        for column_index, column in enumerate([[5, 5, None], [0, 1, 0], [1, 0, 1], [0, 0, 1]]):
+            for row_index, value in enumerate(column):
+                grid.set_card(column_index, row_index, 12 if value is None else value, value is not None)
+        game.state.discard_stack[-1] = 12
+        observation = game.create_observation()
+        solver = EndgameSolver()
+
+        _, draw_stack_move = solver.get_target(observation, 12, DRAW_LOCATION.DRAW_STACK)
+        discard_stack_score, discard_stack_move = solver.get_target(observation, 12, DRAW_LOCATION.DISCARD_STACK)
+
+        self.assertFalse(draw_stack_move.replace_card)
+        self.assertTrue(discard_stack_move.replace_card)
+        self.assertEqual(solver.get_draw_scores(observation)[DRAW_LOCATION.DISCARD_STACK], discard_stack_score)
+
+    def test_cards_of_removed_columns_are_not_unseen(self):
+        game = create_game(('endgame', 'local'))
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+        grid = game.state.player_grids[game.current_player.name]
+        for row_index in range(3):
+            grid.set_card(0, row_index, 5, True)
+        game.state.recalculate_card_statistic()
+        game.state.remove_columns_with_identical_cards(game.current_player.name)
+        observation = game.create_observation()
+
+        unseen = observation.get_unseen_counts()
+        hidden_count = sum(column.count(None) for grid in game.state.player_grids.values() for column in grid.to_list())
+
+        self.assertEqual(grid.get_column_count(), 3)
+        self.assertEqual(sum(unseen), hidden_count + len(game.state.draw_stack))
+        solver = EndgameSolver()
+        self.assertEqual(solver.get_draw_scores(observation)[DRAW_LOCATION.DRAW_STACK],
+                         solver.get_draw_stack_score(observation.own_grid.to_list(), unseen))
+
+    def test_draw_location_follows_the_scores(self):
+        strategy = EndgameStrategy('player1')
+        decisions = []
+        decide_draw_location = strategy.decide_draw_location
+
+        def record_decision(observation):
+            draw_location = decide_draw_location(observation)
+            if observation.last_round:
+                decisions.append((strategy.solver.get_draw_scores(observation), draw_location))
+            return draw_location
+
+        strategy.decide_draw_location = record_decision
+        game = SkyjoGame([strategy, LocalOptimumStrategy('player2')])
+        for seed in range(20):
+            game.reset(seed)
+            game.start()
+
+        self.assertGreater(len(decisions), 0)
+        for scores, draw_location in decisions:
+            discard = scores[DRAW_LOCATION.DISCARD_STACK] <= scores[DRAW_LOCATION.DRAW_STACK]
+            self.assertEqual(draw_location, DRAW_LOCATION.DISCARD_STACK if discard else DRAW_LOCATION.DRAW_STACK)
+        # every target decision consumed the draw location of its observation
+        self.assertEqual(strategy.draw_locations, {})
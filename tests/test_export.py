@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+from concurrent.futures import Future
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from skyjosimulator.simulation import export
+from skyjosimulator.simulation.export import DRAW_DECISION, HIDDEN_CARD, MANIFEST_NAME, REMOVED_CARD, \
+    TARGET_DECISION, collect_samples, export_samples, get_feature_names
+from skyjosimulator.simulation.runner import play_games
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+    ('player3', 'column'),
+]
+
+
+class LazyExecutor:
+    """
+    Runs a submitted job when its result is requested and keeps track of the most unwritten jobs.
+    """
+
+    def __init__(self, max_workers):
+        self.pending_count = 0
+        self.max_pending_count = 0
+
+    def submit(self, function, *args):
+        executor = self
+        self.pending_count += 1
+        self.max_pending_count = max(self.max_pending_count, self.pending_count)
+
+        class LazyFuture(Future):
+            def result(self, timeout=None):
+                executor.pending_count -= 1
+                return function(*args)
+
+        return LazyFuture()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load_shards(self, manifest):
+        shards = [np.load(os.path.join(self.directory.name, shard['file'])) for shard in manifest['shards']]
+        return {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0].files}
+
+    def test_samples_of_the_decisions(self):
+        samples = collect_samples(PLAYER_CONFIGS, 0, 5, 2)
+        decisions = samples['decisions']
+        observations = samples['observations']
+
+        self.assertEqual(observations.shape[1], len(get_feature_names(len(PLAYER_CONFIGS))))
+        self.assertEqual((decisions == DRAW_DECISION).sum(), (decisions == TARGET_DECISION).sum())
+        self.assertTrue((samples['actions'][decisions == DRAW_DECISION, 1:] == -1).all())
+        self.assertTrue((samples['actions'][decisions == TARGET_DECISION, 0] == -1).all())
+        # the own grid of the first decision shows the two flipped cards of LocalOptimumStrategy
+        own_grid = observations[samples['seats'] == 0][0, :12]
+        self.assertEqual(((own_grid != HIDDEN_CARD) & (own_grid != REMOVED_CARD)).sum(), 2)
+
+    def test_scores_are_the_final_scores(self):
+        samples = collect_samples(PLAYER_CONFIGS, 0, 5, 2)
+        aggregate = play_games(PLAYER_CONFIGS, 0, 5, 2)
+
+        self.assertEqual(list(np.unique(samples['games'])), list(range(5)))
+        for seat, player in enumerate(aggregate.player_names):
+            seat_samples = samples['seats'] == seat
+            # the scores of a sample start with the score of the deciding player
+            game_scores = dict(zip(samples['games'][seat_samples], samples['scores'][seat_samples, 0]))
+            self.assertEqual(sum(game_scores.values()), aggregate.score_sums[player])
+
+    def test_shards_have_a_fixed_size(self):
+        manifest = export_samples(PLAYER_CONFIGS, 12, self.directory.name, master_seed=2, shard_size=500,
+                                  games_per_job=5, workers=1)
+        expected = collect_samples(PLAYER_CONFIGS, 0, 12, 2)
+
+        sample_counts = [shard['sample_count'] for shard in manifest['shards']]
+        self.assertEqual(sample_counts[:-1], [500] * (len(sample_counts) - 1))
+        self.assertEqual(manifest['sample_count'], len(expected['decisions']))
+        with open(os.path.join(self.directory.name, MANIFEST_NAME)) as manifest_file:
+            self.assertEqual(json.load(manifest_file)['shards'], manifest['shards'])
+
+        samples = self.load_shards(manifest)
+        for name, values in expected.items():
+            np.testing.assert_array_equal(samples[name], values)
+
+    def test_unwritten_jobs_are_bounded(self):
+        executor = LazyExecutor(2)
+        with patch.object(export, 'ProcessPoolExecutor', return_value=executor):
+            manifest = export_samples(PLAYER_CONFIGS, 20, self.directory.name, shard_size=300, games_per_job=1,
+                                      workers=2)
+
+        self.assertEqual(executor.max_pending_count, 2 * export.JOBS_IN_FLIGHT_PER_WORKER)
+        self.assertEqual(self.load_shards(manifest)['games'][-1], 19)
@@ -0,0 +1,49 @@
+import sys
+from unittest import TestCase
+
+from skyjosimulator.game.interleaved import InterleavedGames
+from skyjosimulator.simulation.runner import play_games, play_interleaved_games
+from skyjosimulator.strategy.external import ExternalBot, ExternalBotError, ExternalStrategy
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy
+
+EXAMPLE_BOT = [sys.executable, '-m', 'skyjosimulator.strategy.example_bot']
+EXTERNAL_KEY = 'external:{} -m skyjosimulator.strategy.example_bot'.format(sys.executable)
+
+
+class ExternalStrategyTests(TestCase):
+    def test_example_bot_plays_like_local_optimum(self):
+        expected = play_games([('player1', 'local'), ('player2', 'local')], 0, 40, 5)
+        result = play_interleaved_games([('player1', 'local'), ('player2', EXTERNAL_KEY)], 0, 40, 5, concurrency=8)
+
+        self.assertEqual(result.game_count, 40)
+        self.assertEqual(result.score_sums, expected.score_sums)
+
+    def test_single_decisions_in_sequential_games(self):
+        expected = play_games([('player1', 'local'), ('player2', 'local')], 0, 5, 5)
+        result = play_games([('player1', EXTERNAL_KEY), ('player2', 'local')], 0, 5, 5)
+
+        self.assertEqual(result.score_sums, expected.score_sums)
+
+    def test_decisions_of_concurrent_games_are_batched(self):
+        strategy = ExternalStrategy('player2', EXAMPLE_BOT)
+        try:
+            games = InterleavedGames([LocalOptimumStrategy('player1'), strategy], concurrency=10)
+            self.assertEqual(games.play(range(10)), 10)
+        finally:
+            strategy.close()
+
+        # in every step about half of the games wait for a decision of the bot
+        self.assertGreater(strategy.bot.item_count, 3 * strategy.bot.request_count)
+
+    def test_exited_bot_raises_error(self):
+        bot = ExternalBot([sys.executable, '-c', 'pass'])
+        with self.assertRaises(ExternalBotError):
+            bot.request('flip', ['4 3'])
+        bot.close()
+
+    def test_invalid_answer_raises_error(self):
+        bot = ExternalBot([sys.executable, '-c', 'import sys\nfor line in sys.stdin: print("x", flush=True)'])
+        strategy = ExternalStrategy('player1', bot)
+        with self.assertRaises(ExternalBotError):
+            strategy.get_position_of_initial_card_flips()
+        strategy.close()
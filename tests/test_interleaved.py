@@ -0,0 +1,78 @@
+import random
+from unittest import TestCase
+
+from skyjosimulator.game.interleaved import InterleavedGames
+from skyjosimulator.simulation.aggregation import ScoreAggregate
+from skyjosimulator.simulation.runner import derive_game_seed, play_games, play_interleaved_games
+from skyjosimulator.strategy.cache import CachedStrategy, DecisionCache
+from skyjosimulator.strategy.mcts import MonteCarloTreeSearchStrategy
+from skyjosimulator.strategy.strategies import LocalOptimumStrategy, RandomStrategy
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'local'),
+    ('player3', 'local'),
+]
+
+
+class RecordingStrategy(LocalOptimumStrategy):
+    def __init__(self, name):
+        super(RecordingStrategy, self).__init__(name)
+        self.batch_sizes = []
+
+    def decide_draw_locations(self, observations):
+        self.batch_sizes.append(len(observations))
+        return super(RecordingStrategy, self).decide_draw_locations(observations)
+
+
+class InterleavedGamesTests(TestCase):
+    def test_deterministic_strategies_play_like_sequential_games(self):
+        aggregate = ScoreAggregate(['player1', 'player2', 'player3'])
+        games = InterleavedGames([LocalOptimumStrategy(name) for name, _ in PLAYER_CONFIGS], 7, aggregate)
+
+        played_games = games.play(derive_game_seed(2, game_index) for game_index in range(30))
+
+        self.assertEqual(played_games, 30)
+        self.assertEqual(aggregate.score_sums, play_games(PLAYER_CONFIGS, 0, 30, 2).score_sums)
+
+    def test_more_games_than_seeds(self):
+        games = InterleavedGames([LocalOptimumStrategy('player1'), LocalOptimumStrategy('player2')], 10)
+        self.assertEqual(games.play(range(3)), 3)
+        self.assertEqual(games.play([]), 0)
+
+    def test_decisions_of_all_waiting_games_are_batched(self):
+        strategy = RecordingStrategy('player2')
+        games = InterleavedGames([LocalOptimumStrategy('player1'), strategy], 10)
+
+        games.play(range(10))
+
+        self.assertLessEqual(max(strategy.batch_sizes), 10)
+        self.assertGreater(sum(strategy.batch_sizes), 3 * len(strategy.batch_sizes))
+
+    def test_single_game_strategies_fall_back_to_single_decisions(self):
+        aggregate = ScoreAggregate(['player1', 'player2', 'player3'])
+        strategies = [RandomStrategy('player1'),
+                      CachedStrategy(LocalOptimumStrategy('player2'), DecisionCache()),
+                      MonteCarloTreeSearchStrategy('player3', rollouts=2)]
+        games = InterleavedGames(strategies, 4, aggregate)
+
+        self.assertEqual(games.play(range(4)), 4)
+        self.assertEqual(aggregate.game_count, 4)
+        # the searches of the draw decisions are kept per game until the target decisions
+        self.assertEqual(strategies[2].searches, {})
+
+    def test_new_games_do_not_reseed_the_random_module(self):
+        games = InterleavedGames([RandomStrategy('player1'), RandomStrategy('player2')], 3)
+        random.seed(5)
+        state = random.getstate()
+
+        games.games[0].reset(1, seed_random_module=False)
+
+        self.assertEqual(random.getstate(), state)
+
+    def test_random_strategies_are_reproducible(self):
+        player_configs = [('player1', 'random'), ('player2', 'local'), ('player3', 'random')]
+        first = play_interleaved_games(player_configs, 0, 20, 3, concurrency=5)
+        second = play_interleaved_games(player_configs, 0, 20, 3, concurrency=5)
+
+        self.assertEqual(first.to_dict(), second.to_dict())
@@ -1,8 +1,13 @@
+import random
 from unittest import TestCase
 from unittest.mock import patch
 
-from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.game import CardGridFactory, CompactCardGridFactory
+from skyjosimulator.game.logic import SkyjoGame, SkyjoGameMove
+from skyjosimulator.game.model import MoveRecord
 from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.strategies import calculate_expected_card_value
 
 STATIC_DRAW_STACK = [7, 8, 0, 8, 11, 12, 6, -2, 0, 1, -1, 10, -1, 8, 9, 10, 1, 9, 7, 6, 7, 11, 2, 2, 12, 9, 5, 4, 0, -1,
                      12, 8, 8, 1, 1, 0, 6, 2, 3, -2, 7, -2, -1, 9, 3, 11, 1, 7, 6, 0, 4, 7, 1, -1, 12, -1, 7, 10, -1, 6,
@@ -44,3 +49,129 @@ class SkyjoGameTests(TestCase):
         ])
         game.prepare_game()
         print(game.start())
+
+    def test_card_statistic_matches_seen_cards(self):
+        test = self
+
+        class CheckedSkyjoGame(SkyjoGame):
+            def execute_current_players_move(self, record=None):
+                super(CheckedSkyjoGame, self).execute_current_players_move(record)
+                test.assertAlmostEqual(self.state.card_statistic.calculate_expected_card_value(),
+                                       calculate_expected_card_value(self.state.player_grids,
+                                                                     self.state.discard_stack))
+
+            def reshuffle_cards(self, record=None):
+                super(CheckedSkyjoGame, self).reshuffle_cards(record)
+                test.assertEqual(self.state.card_statistic.seen_count,
+                                 1 + sum(value is not None for grid in self.state.player_grids.values()
+                                         for column in grid.to_list() for value in column))
+
+        for _ in range(20):
+            game = CheckedSkyjoGame([
+                create_strategy('player1', 'local'),
+                create_strategy('player2', 'random'),
+            ])
+            game.prepare_game()
+            game.start()
+
+            self.assertEqual(game.state.card_statistic.seen_count,
+                             len(game.state.discard_stack) + sum(grid.get_column_count() * 3
+                                                                 for grid in game.state.player_grids.values()))
+
+    def test_reset_reuses_storage(self):
+        game = SkyjoGame([create_strategy('player1', 'local'), create_strategy('player2', 'random')])
+        game.reset(seed=1)
+        grid = game.state.player_grids['player1']
+        draw_stack = game.state.draw_stack
+        game.start()
+
+        game.reset(seed=2)
+
+        self.assertIs(game.state.player_grids['player1'], grid)
+        self.assertIs(game.state.draw_stack, draw_stack)
+        self.assertEqual(len(draw_stack), 131)
+        self.assertEqual(game.state.discard_stack, [])
+        self.assertEqual(grid.get_column_count(), 4)
+        self.assertEqual(grid.calculate_current_score(), 0)
+        self.assertEqual(game.state.card_statistic.seen_count, 0)
+        self.assertFalse(game.last_round)
+
+    def test_reset_plays_the_same_game_as_a_new_game(self):
+        def create_strategies():
+            return [create_strategy('player1', 'local'), create_strategy('player2', 'random')]
+
+        pooled_game = SkyjoGame(create_strategies())
+
+        for seed in range(10):
+            pooled_game.reset(seed=seed)
+            pooled_result = pooled_game.start()
+
+            random.seed(seed)
+            new_game = SkyjoGame(create_strategies())
+            new_game.prepare_game()
+
+            self.assertEqual(pooled_result, new_game.start())
+
+
+def take_snapshot(state):
+    grids = {player: (grid.to_list(), grid.calculate_current_score(), grid.calculate_final_score())
+             for player, grid in state.player_grids.items()}
+    statistic = state.card_statistic
+    return (list(state.draw_stack), list(state.discard_stack), grids, list(statistic.counts),
+            list(statistic.removed_counts), statistic.seen_count, statistic.seen_value_sum)
+
+
+class UndoMoveTests(TestCase):
+    def play_and_undo(self, grid_factory, seed, draw_stack_size=None):
+        random.seed(seed)
+        game = SkyjoGame([create_strategy('player1', 'random'), create_strategy('player2', 'local')],
+                         grid_factory=grid_factory)
+        game.prepare_game()
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+        if draw_stack_size is not None:
+            # the unseen cards are not counted, so dropping some of them forces reshuffles
+            del game.state.draw_stack[:-draw_stack_size]
+
+        snapshots = []
+        records = []
+        while game.remaining_turns != 0:
+            snapshots.append(take_snapshot(game.state))
+            record = MoveRecord()
+            game.play_turn(record)
+            records.append(record)
+            game.end_turn()
+
+        for record, snapshot in zip(reversed(records), reversed(snapshots)):
+            game.state.undo_move(record)
+            self.assertEqual(take_snapshot(game.state), snapshot)
+
+        return records
+
+    def test_undo_restores_every_turn(self):
+        for grid_factory in (CompactCardGridFactory, CardGridFactory):
+            records = []
+            for seed in range(20):
+                records += self.play_and_undo(grid_factory, seed)
+                records += self.play_and_undo(grid_factory, seed, draw_stack_size=5)
+
+            self.assertTrue(any(record.removed_columns is not None for record in records))
+            self.assertTrue(any(record.reshuffled_cards is not None for record in records))
+
+    def test_clone_is_independent(self):
+        random.seed(1)
+        game = SkyjoGame([create_strategy('player1', 'local'), create_strategy('player2', 'local')])
+        game.prepare_game()
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        snapshot = take_snapshot(game.state)
+
+        clone = game.state.clone()
+        self.assertEqual(take_snapshot(clone), snapshot)
+
+        clone.apply_move('player1', DRAW_LOCATION.DRAW_STACK, SkyjoGameMove(0, 0, True))
+        clone.reveal_all_cards()
+
+        self.assertEqual(take_snapshot(game.state), snapshot)
+        self.assertNotEqual(take_snapshot(clone), snapshot)
@@ -0,0 +1,111 @@
+import random
+from unittest import TestCase
+
+from skyjosimulator import DRAW_LOCATION
+from skyjosimulator.benchmark.suite import create_game, create_midgame
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.strategy import create_strategy
+from skyjosimulator.strategy.mcts import Determinization, MonteCarloTreeSearchStrategy, get_unseen_cards
+
+
+def get_hidden_cards(state):
+    hidden_cards = []
+    for grid in state.player_grids.values():
+        revealed_grid = grid.clone()
+        revealed_grid.reveal_all_cards()
+        for column, revealed_column in zip(grid.to_list(), revealed_grid.to_list()):
+            hidden_cards += [value for visible, value in zip(column, revealed_column) if visible is None]
+    return hidden_cards
+
+
+def create_game_with_removed_column():
+    """
+    Plays turns until a player has removed a column.
+    """
+    for seed in range(100):
+        game = create_game(('column', 'column'), seed)
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+        while game.remaining_turns != 0:
+            game.play_turn()
+            if any(grid.get_column_count() < 4 for grid in game.state.player_grids.values()):
+                game.end_turn()
+                return game
+            game.end_turn()
+    raise AssertionError('no column was removed')
+
+
+class DeterminizationTests(TestCase):
+    def test_determinization_is_consistent_with_observation(self):
+        for game in (create_midgame(), create_game_with_removed_column()):
+            observation = game.create_observation()
+            random.seed(1)
+
+            state = Determinization(observation).sample()
+
+            hidden_count = sum(observation.get_grid(player).get_hidden_card_count() for player in game.player_names)
+            self.assertEqual(len(get_unseen_cards(observation)), hidden_count + len(game.state.draw_stack))
+            self.assertEqual(sorted(get_unseen_cards(observation)),
+                             sorted(game.state.draw_stack + get_hidden_cards(game.state)))
+            self.assertEqual(len(state.draw_stack), len(game.state.draw_stack))
+            self.assertEqual(state.discard_stack[-1], game.state.discard_stack[-1])
+            self.assertEqual(sorted(state.discard_stack), sorted(game.state.discard_stack))
+            self.assertEqual(state.card_statistic.counts, game.state.card_statistic.counts)
+            self.assertEqual(state.card_statistic.removed_counts, game.state.card_statistic.removed_counts)
+            for player in game.player_names:
+                self.assertEqual(state.player_grids[player].to_list(), game.state.player_grids[player].to_list())
+
+    def test_known_draw_card_is_on_top_of_draw_stack(self):
+        observation = create_midgame().create_observation()
+
+        state = Determinization(observation, known_draw_card=12).sample()
+
+        self.assertEqual(state.draw_stack[-1], 12)
+
+
+class MonteCarloTreeSearchStrategyTests(TestCase):
+    def test_rollout_budget(self):
+        game = create_midgame()
+        observation = game.create_observation()
+        strategy = MonteCarloTreeSearchStrategy(game.current_player.name, rollouts=20)
+
+        draw_location = strategy.decide_draw_location(observation)
+
+        self.assertIn(draw_location, (DRAW_LOCATION.DRAW_STACK, DRAW_LOCATION.DISCARD_STACK))
+        self.assertEqual(strategy.searches[observation][0].visits, 20)
+
+    def test_target_search_reuses_draw_statistics(self):
+        game = create_midgame()
+        observation = game.create_observation()
+        strategy = MonteCarloTreeSearchStrategy(game.current_player.name, rollouts=30)
+        strategy.decide_draw_location(observation)
+        # both draw locations are tried, so the discard top has been searched already
+        root = strategy.searches[observation][0]
+        strategy.searches[observation] = (root, DRAW_LOCATION.DISCARD_STACK)
+        reused_node = root.children[(DRAW_LOCATION.DISCARD_STACK, observation.get_discard_top())]
+        reused_visits = reused_node.visits
+
+        move = strategy.get_target_location(observation, observation.get_discard_top())
+
+        self.assertGreater(reused_visits, 0)
+        self.assertEqual(reused_node.visits, 30)
+        self.assertTrue(move.replace_card)
+
+    def test_time_budget(self):
+        game = create_midgame()
+        strategy = MonteCarloTreeSearchStrategy(game.current_player.name, time_budget_ms=20)
+        observation = game.create_observation()
+
+        strategy.decide_draw_location(observation)
+
+        self.assertGreater(strategy.searches[observation][0].visits, 0)
+
+    def test_plays_complete_game(self):
+        random.seed(2)
+        game = SkyjoGame([MonteCarloTreeSearchStrategy('player1', rollouts=4), create_strategy('player2', 'local')])
+        game.prepare_game()
+        scores = game.start()
+
+        self.assertEqual(set(scores), {'player1', 'player2'})
+        self.assertEqual(game.player_strategies[0].searches, {})
@@ -1,7 +1,8 @@
 from unittest import TestCase
 
 from skyjosimulator import DRAW_LOCATION
-from skyjosimulator.game.model import Card, CardColumn, CardGrid, SkyjoGameState
+from skyjosimulator.game.model import MIN_CARD_VALUE, Card, CardColumn, CardGrid, CardStatistic, CompactCardGrid, \
+    SkyjoGameState
 from skyjosimulator.game.logic import SkyjoGameMove
 
 
@@ -131,6 +132,55 @@ class SkyjoGameStateTests(TestCase):
         self.assertEqual(revealed_cards[0], [True, True, True])
         self.assertEqual(revealed_cards[1], [True, True, True])
 
+    def test_card_statistic(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2, 4, 4, 4, 0, 1, 3])
+        game = SkyjoGameState([3, 4, 6, 12], {'player1': grid})
+
+        game.initialize_discard_stack()
+        game.flip_cards('player1', [(2, 0), (2, 1)])
+        game.apply_move('player1', DRAW_LOCATION.DRAW_STACK, SkyjoGameMove(2, 2, False))
+
+        self.assertEqual(game.card_statistic.get_count(4), 3)
+        self.assertEqual(game.card_statistic.get_count(6), 1)
+        self.assertEqual(game.card_statistic.get_count(12), 1)
+
+        game.remove_columns_with_identical_cards('player1')
+
+        self.assertEqual(game.card_statistic.get_count(4), 0)
+        self.assertEqual(game.card_statistic.removed_counts[4 - MIN_CARD_VALUE], 3)
+
+        game.apply_move('player1', DRAW_LOCATION.DISCARD_STACK, SkyjoGameMove(0, 0, True))
+
+        self.assertEqual(game.card_statistic.get_count(1), 1)
+        self.assertEqual(game.card_statistic.get_count(3), 0)
+        self.assertEqual(game.card_statistic.seen_count, 3)
+
+        game.reveal_all_cards()
+
+        self.assertEqual(game.card_statistic.seen_count, 11)
+
+
+class CardStatisticTests(TestCase):
+    def test_calculate_expected_card_value(self):
+        statistic = CardStatistic()
+        expected_card_value = statistic.calculate_expected_card_value()
+
+        self.assertAlmostEqual(expected_card_value, 755 / 155)
+
+        statistic.add_cards([12, 12, -2])
+
+        self.assertAlmostEqual(statistic.calculate_expected_card_value(), 733 / 152)
+        self.assertAlmostEqual(statistic.calculate_expected_card_value(extra_card=-1), 734 / 151)
+
+    def test_remove_card(self):
+        statistic = CardStatistic()
+        statistic.add_cards([5, 5, 0])
+        statistic.remove_card(5, 2)
+
+        self.assertEqual(statistic.get_count(5), 0)
+        self.assertEqual(statistic.seen_count, 1)
+        self.assertEqual(statistic.seen_value_sum, 0)
+
 
 class CardGridTests(TestCase):
     def test_get_revealed_values(self):
@@ -198,6 +248,78 @@ class CardGridTests(TestCase):
         self.assertFalse(card_grid.all_cards_revealed())
 
 
+class CompactCardGridTests(TestCase):
+    def test_get_revealed_values(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2])
+
+        grid.reveal_card(0, 2)
+        grid.reveal_card(1, 0)
+
+        self.assertEqual(grid.to_list(), [[None, None, -2], [7, None, None]])
+        self.assertEqual(grid.get_value(1, 0), 7)
+        self.assertIsNone(grid.get_value(1, 1))
+
+    def test_replace_card(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2])
+
+        value_to_discard = grid.replace_card((1, 1), 12)
+
+        self.assertEqual(value_to_discard, 2)
+        self.assertEqual(grid.get_value(1, 1), 12)
+        self.assertEqual(grid.calculate_current_score(), 12)
+
+    def test_get_current_score(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2], revealed_mask=0b100101)
+
+        self.assertEqual(grid.calculate_current_score(), 1)
+
+        grid.reveal_card(0, 1)
+        grid.reveal_card(0, 1)
+
+        self.assertEqual(grid.calculate_current_score(), 6)
+
+    def test_remove_columns_with_identical_cards(self):
+        grid = CompactCardGrid([5, 5, 5, 7, 4, 2, 3, 3, 3, 0, 0, 0], revealed_mask=0b000000111111)
+
+        grid.remove_columns_with_identical_cards()
+
+        self.assertEqual(grid.get_column_count(), 3)
+        self.assertEqual(grid.to_list(), [[7, 4, 2], [None, None, None], [None, None, None]])
+        self.assertEqual(grid.calculate_current_score(), 13)
+
+        grid.reveal_all_cards()
+        grid.remove_columns_with_identical_cards()
+
+        self.assertEqual(grid.get_column_count(), 1)
+        self.assertEqual(grid.calculate_current_score(), 13)
+        self.assertTrue(grid.all_cards_revealed())
+
+    def test_column_indices_after_removal(self):
+        grid = CompactCardGrid([1, 1, 1, 7, 4, 2], revealed_mask=0b000111)
+        grid.remove_columns_with_identical_cards()
+
+        grid.reveal_card(0, 1)
+
+        self.assertEqual(grid.to_list(), [[None, 4, None]])
+
+    def test_read_only_column_view(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2])
+        grid.reveal_card(1, 2)
+
+        column = grid.columns[1]
+
+        self.assertEqual([card.value for card in column.cards], [7, 2, 2])
+        self.assertEqual(column.to_list(), [None, None, 2])
+        self.assertFalse(column.is_removeable())
+        with self.assertRaises(AttributeError):
+            column.cards[0].value = 3
+
+    def test_all_cards_revealed_with_one_card_still_hidden(self):
+        grid = CompactCardGrid([1, 5, -2, 7, 2, 2], revealed_mask=0b111110)
+
+        self.assertFalse(grid.all_cards_revealed())
+
+
 class CardColumnTests(TestCase):
     def test_all_cards_revealed(self):
         card1 = Card(1)
@@ -254,6 +376,11 @@ class CardColumnTests(TestCase):
 
         self.assertFalse(column.is_removeable())
 
+    def test_is_removeable_on_column_with_zeros(self):
+        column = CardColumn([Card(value, is_revealed=True) for value in [0, 5, 5]])
+
+        self.assertFalse(column.is_removeable())
+
     def test_is_removeable_on_column_with_hidden_cards(self):
         card1 = Card(1)
         card2 = Card(1)
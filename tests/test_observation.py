@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from skyjosimulator.game import CardGridFactory
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.game.model import CompactCardGrid, SkyjoGameState
+from skyjosimulator.game.observation import Observation
+from skyjosimulator.strategy import create_strategy
+
+
+def create_state():
+    grids = {
+        'player1': CompactCardGrid([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]),
+        'player2': CompactCardGrid([0, 0, 0, -1, -1, -1, 2, 2, 2, 3, 3, 3]),
+    }
+    state = SkyjoGameState([5, 6, 7], grids)
+    state.initialize_discard_stack()
+    state.flip_cards('player1', [(0, 0), (1, 1)])
+    state.flip_cards('player2', [(0, 0), (0, 1), (0, 2)])
+    return state
+
+
+class ObservationTests(TestCase):
+    def test_visible_state(self):
+        state = create_state()
+        observation = Observation(state, 'player1', ['player1', 'player2'])
+
+        self.assertEqual(observation.own_grid.get_value(0, 0), 1)
+        self.assertIsNone(observation.own_grid.get_value(0, 1))
+        self.assertEqual(observation.own_grid.get_revealed_score(), 6)
+        self.assertEqual(observation.own_grid.get_hidden_card_count(), 10)
+        self.assertEqual(observation.get_discard_top(), 7)
+        self.assertEqual(observation.get_seen_count(0), 3)
+        self.assertEqual(observation.get_seen_card_count(), 6)
+        self.assertEqual(sum(observation.get_seen_counts()), 6)
+
+        opponents = observation.get_opponents()
+        self.assertEqual([opponent.name for opponent in opponents], ['player2'])
+        self.assertEqual(opponents[0].hidden_card_count, 9)
+        self.assertEqual(opponents[0].revealed_score, 0)
+        self.assertFalse(opponents[0].has_finished)
+
+    def test_observation_is_backed_by_state(self):
+        state = create_state()
+        observation = Observation(state, 'player1', ['player1', 'player2'])
+
+        state.flip_cards('player1', [(0, 1)])
+        state.discard_stack.append(12)
+
+        self.assertEqual(observation.own_grid.get_value(0, 1), 2)
+        self.assertEqual(observation.get_discard_top(), 12)
+
+    def test_grid_view_can_not_change_grid(self):
+        observation = Observation(create_state(), 'player1', ['player1', 'player2'])
+
+        self.assertFalse(hasattr(observation.own_grid, 'replace_card'))
+        self.assertFalse(hasattr(observation.own_grid, 'reveal_card'))
+        with self.assertRaises(AttributeError):
+            observation.own_grid.values = None
+
+    def test_game_observations_follow_new_grids(self):
+        game = SkyjoGame([create_strategy('player1', 'local'), create_strategy('player2', 'local')],
+                         grid_factory=CardGridFactory)
+        game.reset(seed=1)
+        game.reset(seed=2)
+        game.flip_starting_cards()
+        game.state.initialize_discard_stack()
+        game.set_next_player_as_current()
+
+        observation = game.create_observation()
+        grid = game.state.player_grids[observation.player]
+
+        self.assertEqual(observation.own_grid.to_list(), grid.to_list())
+        self.assertEqual(observation.get_discard_top(), game.state.discard_stack[-1])
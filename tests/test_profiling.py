@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.game.profiling import GAME, PHASES, GameProfiler
+from skyjosimulator.game.trajectory import TrajectoryLog, TrajectoryRecorder
+from skyjosimulator.simulation.runner import run_simulation
+from skyjosimulator.strategy import create_strategy
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+
+
+class GameProfilerTests(TestCase):
+    def test_record_and_merge(self):
+        profiler1 = GameProfiler()
+        profiler1.record('player1', 'apply_move', 0.5)
+        profiler1.record('player1', 'apply_move', 0.25)
+        profiler2 = GameProfiler()
+        profiler2.record('player1', 'apply_move', 1.0)
+        profiler2.record(GAME, 'scoring', 2.0)
+
+        profiler1.merge(profiler2)
+
+        self.assertEqual(profiler1.get_calls('player1', 'apply_move'), 3)
+        self.assertAlmostEqual(profiler1.get_seconds('player1', 'apply_move'), 1.75)
+        self.assertAlmostEqual(profiler1.get_total_seconds(), 3.75)
+        self.assertEqual(GameProfiler.from_dict(profiler1.to_dict()).timings, profiler1.timings)
+        self.assertIn('scoring', profiler1.create_report())
+
+    def test_profiled_game_plays_like_unprofiled_game(self):
+        scores = []
+        profiler = GameProfiler()
+        for game_profiler in (None, profiler):
+            random.seed(3)
+            game = SkyjoGame([create_strategy(name, key) for name, key in PLAYER_CONFIGS], profiler=game_profiler)
+            game.prepare_game()
+            scores.append(game.start())
+
+        self.assertEqual(scores[0], scores[1])
+        self.assertEqual(profiler.get_calls(GAME, 'scoring'), 1)
+        for phase in PHASES[:4]:
+            self.assertGreater(profiler.get_calls('player1', phase), 0)
+        self.assertEqual(profiler.get_calls('player1', 'draw_decision'),
+                         profiler.get_calls('player1', 'apply_move'))
+
+    def test_recorded_game_is_profiled(self):
+        profiler = GameProfiler()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.log')
+            with TrajectoryRecorder(path) as recorder:
+                game = SkyjoGame([create_strategy(name, key) for name, key in PLAYER_CONFIGS], profiler=profiler,
+                                 recorder=recorder)
+                game.reset(seed=3)
+                game.start()
+
+            self.assertEqual(TrajectoryLog(path).game_count, 1)
+        self.assertEqual(profiler.get_calls(GAME, 'scoring'), 1)
+        self.assertGreater(profiler.get_calls('player1', 'draw_decision'), 0)
+
+    def test_profiler_is_merged_across_workers(self):
+        profiler = GameProfiler()
+        run_simulation(PLAYER_CONFIGS, 20, master_seed=1, workers=2, profiler=profiler)
+
+        self.assertEqual(profiler.get_calls(GAME, 'scoring'), 20)
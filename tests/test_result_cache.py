@@ -0,0 +1,123 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from skyjosimulator.simulation import checkpoint, result_cache
+from skyjosimulator.simulation.checkpoint import run_sharded_simulation
+from skyjosimulator.simulation.result_cache import ResultCache
+from skyjosimulator.simulation.runner import describe_players, play_games
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+
+
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cached(self, game_count, player_configs=PLAYER_CONFIGS, master_seed=3):
+        return run_sharded_simulation(player_configs, game_count, master_seed=master_seed, shard_size=10, workers=1,
+                                      result_cache=self.cache)
+
+    def test_only_missing_shards_are_played(self):
+        self.run_cached(20)
+
+        with patch.object(checkpoint, 'play_games', wraps=play_games) as played_games:
+            result = self.run_cached(35)
+
+        self.assertEqual([call.args[1:3] for call in played_games.call_args_list], [(20, 10), (30, 5)])
+        self.assertEqual(self.cache.hit_count, 2)
+        self.assertEqual(result.score_sums, play_games(PLAYER_CONFIGS, 0, 35, 3).score_sums)
+
+    def test_key_covers_players_seed_and_parameters(self):
+        players = describe_players(PLAYER_CONFIGS)
+        aggregate = play_games(PLAYER_CONFIGS, 0, 10, 3)
+        self.cache.put(players, 3, 0, 10, aggregate)
+
+        self.assertIsNotNone(self.cache.get(players, 3, 0, 10))
+        self.assertIsNone(self.cache.get(players, 4, 0, 10))
+        self.assertIsNone(self.cache.get(players, 3, 10, 10))
+        self.assertIsNone(self.cache.get(describe_players(list(reversed(PLAYER_CONFIGS))), 3, 0, 10))
+
+        with patch('skyjosimulator.strategy.strategies.LocalOptimumStrategy.__init__.__defaults__', (1.0, 0.0)):
+            self.assertIsNone(self.cache.get(describe_players(PLAYER_CONFIGS), 3, 0, 10))
+
+    def test_results_of_other_rules_are_not_returned(self):
+        self.run_cached(10)
+
+        with patch.object(result_cache, 'RULES_VERSION', result_cache.RULES_VERSION + 1):
+            self.assertIsNone(self.cache.get(describe_players(PLAYER_CONFIGS), 3, 0, 10))
+
+    def test_entry_with_other_header_is_not_returned(self):
+        players = describe_players(PLAYER_CONFIGS)
+        self.cache.put(players, 3, 0, 10, play_games(PLAYER_CONFIGS, 0, 10, 3))
+        # an entry stored under the key of other games, like after a hash collision
+        os.replace(self.cache.get_path(self.cache.create_header(players, 3, 0, 10)),
+                   self.cache.get_path(self.cache.create_header(players, 5, 0, 10)))
+
+        self.assertIsNone(self.cache.get(players, 5, 0, 10))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        players = describe_players(PLAYER_CONFIGS)
+        aggregate = play_games(PLAYER_CONFIGS, 0, 10, 3)
+        for master_seed, last_use in [(0, 30), (1, 10), (2, 20)]:
+            self.cache.put(players, master_seed, 0, 10, aggregate)
+            os.utime(self.cache.get_path(self.cache.create_header(players, master_seed, 0, 10)), (last_use, last_use))
+        self.cache.max_size = 3.5 * self.cache.size / 3
+
+        self.cache.put(players, 3, 0, 10, aggregate)
+
+        self.assertLessEqual(self.cache.size, self.cache.max_size * result_cache.EVICTION_TARGET)
+        self.assertEqual([self.cache.get(players, master_seed, 0, 10) is not None for master_seed in range(4)],
+                         [True, False, False, True])
+
+    def test_files_removed_by_other_processes_are_skipped(self):
+        players = describe_players(PLAYER_CONFIGS)
+        self.cache.put(players, 3, 0, 10, play_games(PLAYER_CONFIGS, 0, 10, 3))
+        path = self.cache.get_path(self.cache.create_header(players, 3, 0, 10))
+        remove = os.remove
+
+        def remove_concurrently(path):
+            # the other process removes the file first
+            remove(path)
+            remove(path)
+
+        # another process evicts the entry right after it has been read or listed
+        with patch.object(result_cache.os, 'utime', side_effect=FileNotFoundError):
+            self.assertIsNotNone(self.cache.get(players, 3, 0, 10))
+        with patch.object(result_cache.os, 'stat', side_effect=FileNotFoundError):
+            self.assertEqual(self.cache.list_entries(), [])
+        with patch.object(result_cache.os, 'remove', side_effect=remove_concurrently):
+            self.cache.max_size = 0
+            self.cache.evict()
+
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_orphaned_temporary_files_are_evicted(self):
+        players = describe_players(PLAYER_CONFIGS)
+        self.cache.put(players, 3, 0, 10, play_games(PLAYER_CONFIGS, 0, 10, 3))
+        path = self.cache.get_path(self.cache.create_header(players, 3, 0, 10))
+        orphaned_path = path + '.1.tmp'
+        recent_path = path + '.2.tmp'
+        for temporary_path in (orphaned_path, recent_path):
+            with open(temporary_path, 'w') as temporary_file:
+                temporary_file.write('{')
+        os.utime(orphaned_path, (0, 0))
+
+        self.cache.evict()
+
+        self.assertFalse(os.path.exists(orphaned_path))
+        # a recent temporary file may belong to a running writer
+        self.assertTrue(os.path.exists(recent_path))
+        self.assertTrue(os.path.exists(path))
+
+    def test_external_strategies_are_not_cached(self):
+        self.assertIsNone(describe_players([('player1', 'local'), ('player2', 'external:bot')]))
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from skyjosimulator.simulation.runner import run_simulation, split_into_chunks
+
+PLAYER_CONFIGS = [
+    ('player1', 'local'),
+    ('player2', 'random'),
+]
+
+
+class RunnerTests(TestCase):
+    def test_split_into_chunks(self):
+        chunks = split_into_chunks(100, 1000, 4, min_chunk_size=10)
+
+        self.assertEqual(chunks[0], (100, 62))
+        self.assertEqual(sum(size for _, size in chunks), 1000)
+        self.assertTrue(all(chunks[i][0] + chunks[i][1] == chunks[i + 1][0] for i in range(len(chunks) - 1)))
+        self.assertTrue(all(size >= 10 for _, size in chunks))
+
+    def test_result_is_independent_of_worker_count(self):
+        single = run_simulation(PLAYER_CONFIGS, 40, master_seed=7, workers=1)
+        parallel = run_simulation(PLAYER_CONFIGS, 40, master_seed=7, workers=2)
+
+        self.assertEqual(single.game_count, 40)
+        self.assertEqual(single.score_sums, parallel.score_sums)
+        self.assertEqual(single.win_counts, parallel.win_counts)
+
+    def test_different_seeds_give_different_results(self):
+        result1 = run_simulation(PLAYER_CONFIGS, 20, master_seed=1, workers=1)
+        result2 = run_simulation(PLAYER_CONFIGS, 20, master_seed=2, workers=1)
+
+        self.assertNotEqual(result1.score_sums, result2.score_sums)
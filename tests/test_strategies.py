@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from skyjosimulator.benchmark.suite import create_game
+from skyjosimulator.strategy.strategies import ColumnFirstStrategy, LocalOptimumStrategy
+
+# own grid of the current player, None for hidden cards
+COLUMNS = [[4, 4, 10], [11, None, None], [None, 2, None], [None, None, None]]
+
+
+def create_observation(columns):
+    game = create_game(('column', 'column'))
+    game.flip_starting_cards()
+    game.state.initialize_discard_stack()
+    game.set_next_player_as_current()
+
+    grid = game.state.player_grids[game.current_player.name]
+    for column_index, column in enumerate(columns):
+        for row_index, value in enumerate(column):
+            grid.set_card(column_index, row_index, 12 if value is None else value, value is not None)
+    return game.create_observation()
+
+
+def get_target(strategy, observation, new_card):
+    move = strategy.get_target_location(observation, new_card)
+    return move.column, move.row, move.replace_card
+
+
+class ColumnFirstStrategyTests(TestCase):
+    def setUp(self):
+        self.observation = create_observation(COLUMNS)
+        self.strategy = ColumnFirstStrategy(self.observation.player)
+        self.local_strategy = LocalOptimumStrategy(self.observation.player)
+
+    def test_completes_column(self):
+        self.assertEqual(get_target(self.local_strategy, self.observation, 4), (1, 0, True))
+        self.assertEqual(get_target(self.strategy, self.observation, 4), (0, 2, True))
+
+    def test_builds_pair(self):
+        self.assertEqual(get_target(self.local_strategy, self.observation, 2), (1, 0, True))
+        self.assertEqual(get_target(self.strategy, self.observation, 2), (2, 0, True))
+
+    def test_falls_back_to_local_optimum(self):
+        for new_card in (7, 12):
+            self.assertEqual(get_target(self.strategy, self.observation, new_card),
+                             get_target(self.local_strategy, self.observation, new_card))
@@ -0,0 +1,61 @@
+import random
+from unittest import TestCase
+
+from skyjosimulator.game.logic import SkyjoGame
+from skyjosimulator.simulation.runner import play_games
+from skyjosimulator.simulation.sweep import create_candidates, play_candidate, run_sweep
+from skyjosimulator.strategy import create_strategy
+
+
+class SweepTests(TestCase):
+    def test_create_candidates(self):
+        candidates = create_candidates({'discard_margin': [-1, 0], 'replace_threshold': [0.0, 0.5, 1.0]})
+
+        self.assertEqual(len(candidates), 6)
+        self.assertEqual(candidates[0], {'discard_margin': -1, 'replace_threshold': 0.0})
+        self.assertEqual(candidates[-1], {'discard_margin': 0, 'replace_threshold': 1.0})
+
+    def test_default_parameters_play_like_the_strategy(self):
+        scores, _ = play_candidate('local', {'discard_margin': 0.0}, ['random'], 0, 20, 4)
+        expected = play_games([('player1', 'local'), ('player2', 'random')], 0, 20, 4)
+
+        self.assertEqual(sum(scores), expected.score_sums['player1'])
+
+    def test_candidates_play_the_same_games(self):
+        result = run_sweep('local', {'replace_threshold': [0.0, 0.0, 1.0]}, ['local'], games_per_candidate=300,
+                           master_seed=1, workers=1)
+
+        self.assertEqual(list(result.scores[0]), list(result.scores[1]))
+        difference, half_width, variance_reduction = result.compare(2, 0)
+        self.assertGreater(variance_reduction, 1.5)
+        self.assertLess(half_width, 2 * result.get_half_width(0))
+
+    def test_ranking_and_report(self):
+        result = run_sweep('column', {'discard_threshold': [-2, 0], 'max_seen_count': [5]}, ['random'],
+                           games_per_candidate=30, workers=1)
+
+        ranking = result.rank()
+        self.assertEqual(sorted(ranking), [0, 1])
+        self.assertLessEqual(result.get_mean_score(ranking[0]), result.get_mean_score(ranking[1]))
+        self.assertIn('discard_threshold=-2, max_seen_count=5', result.create_report())
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            run_sweep('local', {'threshold': [1]}, ['random'], workers=1)
+
+
+class DeckRandomTests(TestCase):
+    def test_reshuffle_does_not_depend_on_random_decisions(self):
+        game = SkyjoGame([create_strategy('player1', 'local'), create_strategy('player2', 'local')])
+        reshuffled_stacks = []
+
+        for random_decisions in (0, 10):
+            game.reset(seed=7)
+            for _ in range(random_decisions):
+                random.random()
+            game.state.discard_stack[:] = game.state.draw_stack[:20]
+            del game.state.draw_stack[:]
+            game.reshuffle_cards()
+            reshuffled_stacks.append(list(game.state.draw_stack))
+
+        self.assertEqual(reshuffled_stacks[0], reshuffled_stacks[1])
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from skyjosimulator.simulation.tournament import create_jobs, create_tables, get_tournament_strategies, run_tournament
+
+
+class TournamentTests(TestCase):
+    def test_create_tables(self):
+        tables = create_tables(['random', 'local'], 3)
+
+        self.assertEqual(len(tables), 6)
+        self.assertIn(('local', 'random', 'local'), tables)
+        self.assertNotIn(('local', 'local', 'local'), tables)
+        self.assertEqual(create_tables(['random', 'local'], 2), [('local', 'random'), ('random', 'local')])
+
+    def test_interactive_strategies_are_left_out(self):
+        self.assertNotIn('manual', get_tournament_strategies())
+        self.assertIn('local', get_tournament_strategies())
+
+    def test_expensive_strategies_are_left_out(self):
+        self.assertNotIn('mcts', get_tournament_strategies())
+
+    def test_most_expensive_jobs_come_first(self):
+        jobs = create_jobs(['local', 'mcts'], (2, 3), games_per_table=30, max_job_size=20)
+
+        self.assertEqual(sorted(jobs[0][0]), ['local', 'mcts', 'mcts'])
+        self.assertEqual(jobs[0][2], 20)
+        self.assertEqual(sum(game_count for table, _, game_count in jobs if table == ('local', 'mcts')), 30)
+
+    def test_result_is_independent_of_worker_count(self):
+        single = run_tournament(['local', 'random'], table_sizes=(2, 3), games_per_table=6, workers=1)
+        parallel = run_tournament(['local', 'random'], table_sizes=(2, 3), games_per_table=6, workers=2)
+
+        self.assertEqual(single.cells, parallel.cells)
+        self.assertEqual(single.totals, parallel.totals)
+        # both heads-up seatings are counted for every strategy
+        self.assertEqual(single.totals[(2, 'local')][0], 12)
+        self.assertLess(single.get_mean_score(2, 'local', 'random'), single.get_mean_score(2, 'random', 'local'))
+        self.assertIn('3 players', single.create_report())
@@ -0,0 +1,107 @@
+import os
+import struct
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from skyjosimulator.game import trajectory
+from skyjosimulator.game.trajectory import GAME, MAX_SEED, MOVE, REMOVAL, RESHUFFLE, SCORE, GameReplay, \
+    TrajectoryError, TrajectoryLog, TrajectoryRecorder
+from skyjosimulator.simulation.runner import create_player_configs, play_games
+
+# many random players run through the deck, so the games contain column removals and reshuffles
+PLAYER_CONFIGS = create_player_configs(['local', 'column'] + ['random'] * 6)
+
+
+class TrajectoryTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, game_count, first_game=0):
+        with TrajectoryRecorder(self.path, buffer_size=100) as recorder:
+            return play_games(PLAYER_CONFIGS, first_game, game_count, 5, recorder=recorder)
+
+    def test_recording_does_not_change_the_games(self):
+        self.assertEqual(self.record(10).score_sums, play_games(PLAYER_CONFIGS, 0, 10, 5).score_sums)
+
+    def test_records_are_memory_mapped(self):
+        self.record(10)
+        log = TrajectoryLog(self.path)
+        kinds = log.records['kind']
+
+        self.assertIsInstance(log.records, np.memmap)
+        self.assertTrue(np.shares_memory(kinds, log.records))
+        self.assertEqual(log.game_count, 10)
+        self.assertEqual((kinds == SCORE).sum(), 10 * len(PLAYER_CONFIGS))
+        self.assertGreater((kinds == REMOVAL).sum(), 0)
+        self.assertGreater((kinds == RESHUFFLE).sum(), 0)
+        self.assertEqual(list(log.get_game_indices()[log.game_starts]), list(range(10)))
+
+    def test_replay_reproduces_the_games(self):
+        aggregate = self.record(10)
+        log = TrajectoryLog(self.path)
+
+        score_sums = dict.fromkeys(aggregate.player_names, 0)
+        for game_index in range(log.game_count):
+            for player, score in GameReplay(log.get_game(game_index)).play().items():
+                score_sums[player] += score
+
+        self.assertEqual(score_sums, aggregate.score_sums)
+
+    def test_replay_steps(self):
+        self.record(1)
+        records = TrajectoryLog(self.path).get_game(0)
+        replay = GameReplay(records)
+
+        steps = list(replay.steps())
+
+        self.assertIsNone(steps[0][0])
+        self.assertEqual([int(move['value']) for move, _ in steps[1:]], list(range((records['kind'] == MOVE).sum())))
+        self.assertIsNotNone(replay.scores)
+
+    def test_log_is_continued(self):
+        self.record(3)
+        self.record(2, first_game=3)
+        log = TrajectoryLog(self.path)
+
+        self.assertEqual(log.game_count, 5)
+        self.assertEqual(list(log.seeds), list(range(5 * 2 ** 32, 5 * 2 ** 32 + 5)))
+
+    def test_partial_record_is_ignored(self):
+        self.record(2)
+        with open(self.path, 'ab') as log_file:
+            log_file.write(struct.pack('<BB', GAME, 8))
+
+        self.assertEqual(TrajectoryLog(self.path).game_count, 2)
+
+    def test_log_of_other_rules_is_not_continued(self):
+        self.record(1)
+        rules_version = trajectory.RULES_VERSION
+        trajectory.RULES_VERSION += 1
+        try:
+            with self.assertRaises(TrajectoryError):
+                TrajectoryRecorder(self.path)
+        finally:
+            trajectory.RULES_VERSION = rules_version
+
+    def test_replay_detects_differing_game(self):
+        self.record(1)
+        records = np.array(TrajectoryLog(self.path).get_game(0))
+        records['card'][records['kind'] == MOVE] += 1
+
+        with self.assertRaises(TrajectoryError):
+            GameReplay(records).play()
+
+    def test_seed_outside_of_record_range_is_rejected(self):
+        with TrajectoryRecorder(self.path) as recorder:
+            recorder.record_game(MAX_SEED, 2)
+            with self.assertRaises(TrajectoryError):
+                recorder.record_game(MAX_SEED + 1, 2)
+
+        log = TrajectoryLog(self.path)
+        self.assertEqual(list(log.seeds), [MAX_SEED])